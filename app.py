@@ -1,38 +1,473 @@
-from flask import Flask, jsonify, render_template, request
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Callable
+
+from flask import (
+    Flask,
+    Response,
+    g,
+    jsonify,
+    make_response,
+    render_template,
+    request,
+    stream_with_context,
+    url_for,
+)
 from werkzeug.middleware.proxy_fix import ProxyFix
-from graph_service import GraphService
+import metrics
+from fragments import dumps
+from graph_service import GameFilter, GraphService
+from rankings import SORT_KEYS
+from reload import GraphReloader
+from team_index import SHORT_QUERY_RESULTS
 from config import Config
 import os
 
+SEARCH_LIMIT = 10
+REACH_PAGE_SIZE = 100
+REACH_PAGE_MAX = 1000
+# Part of the /api/path ETag; bump it when chains change shape or content
+# for the same graph, so clients drop what they cached
+RESPONSE_VERSION = "1"
+RANKINGS_PAGE_SIZE = 50
+WINDOW_ERROR = (
+    'window must be an object with integer "from", "to" and "week" ("week" needs "to").'
+)
+# Versioned asset URLs never change content, so caches may keep them for good
+IMMUTABLE = "public, max-age=31536000, immutable"
+# Cacheable, but check the ETag before each reuse
+REVALIDATE = "no-cache"
+
+
+def parse_window(
+    data: object, exclude_seasons: list[int] | None = None
+) -> GameFilter | None:
+    """Build a GameFilter from a request's "window" object; ValueError if invalid.
+
+    ``{"from": 2023, "to": 2025}`` keeps games from 2023 through 2025, and
+    ``{"to": 2024, "week": 8}`` the games played by week 8 of 2024.
+    """
+    if data is None and not exclude_seasons:
+        return None
+    data = {} if data is None else data
+    if (
+        not isinstance(data, dict)
+        or not set(data) <= {"from", "to", "week"}
+        or not all(
+            isinstance(v, int) and not isinstance(v, bool) for v in data.values()
+        )
+        or ("week" in data and "to" not in data)
+    ):
+        raise ValueError(WINDOW_ERROR)
+    return GameFilter(
+        first_season=data.get("from"),
+        last_season=data.get("to"),
+        last_week=data.get("week"),
+        exclude_seasons=frozenset(exclude_seasons or ()),
+    )
+
+
+def window_from_args(args) -> GameFilter | None:
+    """Build a GameFilter from window_from, window_to and window_week query args."""
+    data = {}
+    for key in ("from", "to", "week"):
+        value = args.get(f"window_{key}")
+        if value is not None:
+            try:
+                data[key] = int(value)
+            except ValueError:
+                raise ValueError(WINDOW_ERROR) from None
+    return parse_window(data or None)
+
+
+def conditional(
+    body: bytes,
+    etag: str,
+    cache_control: str,
+    mimetype: str,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """``body`` with validators, or an empty 304 if the client already has it."""
+    if request.if_none_match.contains(etag):
+        rsp = Response(status=304)
+    else:
+        rsp = Response(body, mimetype=mimetype)
+    rsp.set_etag(etag)
+    rsp.headers["Cache-Control"] = cache_control
+    rsp.headers.update(headers or {})
+    return rsp
+
 
 def create_app() -> Flask:
     app = Flask(__name__)
     app.wsgi_app = ProxyFix(app.wsgi_app)  # type: ignore[assignment]
 
-    graph_service = GraphService(Config.GRAPH_PATH, Config.TEAMS_PATH)
+    def load_service() -> GraphService:
+        service = GraphService(
+            Config.GRAPH_PATH, Config.TEAMS_PATH, Config.SNAPSHOT_PATH
+        )
+        # Read, or computed when the file is stale, here rather than in the
+        # first /api/rankings request
+        service.rankings
+        return service
+
+    reloader = GraphReloader(
+        load_service,
+        Config.GRAPH_PATH,
+        Config.TEAMS_PATH,
+        Config.SNAPSHOT_PATH,
+        interval=Config.RELOAD_INTERVAL,
+        warm_pairs=Config.RELOAD_WARM_PAIRS,
+        drain=Config.RELOAD_DRAIN,
+    )
+    app.extensions["graph_reloader"] = reloader
+
+    @app.before_request
+    def start_reloader():
+        # Started from a request so it runs in the worker, not a preloading master
+        reloader.start()
+
+    # Encoded bodies for the live graph version only, rebuilt after a reload
+    assets: dict[str, tuple[str, Any]] = {}
+    assets_lock = threading.Lock()
+
+    def asset(name: str, version: str, build: Callable[[], Any]) -> Any:
+        with assets_lock:
+            cached = assets.get(name)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        body = build()
+        with assets_lock:
+            assets[name] = (version, body)
+        return body
+
+    def graph_etag(graph_service: GraphService) -> str:
+        return graph_service.snapshot.fingerprint.hex()[:20]
+
+    def path_etag(graph_service: GraphService) -> str:
+        # Chains also depend on how names resolve and on this code
+        return f"{RESPONSE_VERSION}-{graph_service.version}"
 
     @app.route("/")
     def home():
-        return render_template("index.html", team_names=graph_service.team_names)
+        graph_service = reloader.service
+        version = graph_etag(graph_service)
+
+        def render():
+            page = render_template(
+                "index.html", teams_url=url_for("api_teams", v=version)
+            ).encode()
+            # The page links the versioned team list, so it changes with the graph
+            return page, hashlib.sha1(page).hexdigest()[:20]
+
+        body, etag = asset("index", version, render)
+        return conditional(body, etag, REVALIDATE, "text/html")
+
+    @app.get("/api/teams")
+    def api_teams():
+        graph_service = reloader.service
+        version = graph_etag(graph_service)
+        raw = asset(
+            "teams",
+            version,
+            lambda: json.dumps(
+                {"version": version, "teams": graph_service.team_list()},
+                separators=(",", ":"),
+            ).encode(),
+        )
+        # Only the URL the current page links to is safe to keep forever
+        cache_control = IMMUTABLE if request.args.get("v") == version else REVALIDATE
+        headers = {"Vary": "Accept-Encoding"}
+        if request.accept_encodings["gzip"]:
+            body = asset("teams.gz", version, lambda: gzip.compress(raw, mtime=0))
+            headers["Content-Encoding"] = "gzip"
+            # Each encoding is its own representation with its own tag
+            return conditional(
+                body, version + "-gz", cache_control, "application/json", headers
+            )
+        return conditional(raw, version, cache_control, "application/json", headers)
+
+    @app.get("/api/teams/search")
+    def api_teams_search():
+        # One graph per request, even if a reload swaps it meanwhile
+        graph_service = reloader.service
+        try:
+            limit = int(request.args.get("limit", SEARCH_LIMIT))
+        except ValueError:
+            return jsonify({"error": "limit must be an integer."}), 400
+        limit = min(max(limit, 1), SHORT_QUERY_RESULTS)
+        query = request.args.get("q", "")
+        return jsonify(
+            {"query": query, "results": graph_service.search_teams(query, limit)}
+        )
 
     @app.post("/api/path")
     def api_path():
+        graph_service = reloader.service
         payload = request.get_json(silent=True) or {}
         team_a = payload.get("from")
         team_b = payload.get("to")
+        try:
+            window = parse_window(payload.get("window"))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        return path_response(graph_service.find_path(team_a, team_b, window))
+
+    @app.get("/api/path")
+    def api_path_get():
+        # Cacheable variant: ?from=&to=, plus optional window_from, window_to
+        # and window_week
+        graph_service = reloader.service
+        try:
+            window = window_from_args(request.args)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400, {"Cache-Control": "no-store"}
+        # A valid query's chain depends only on the graph, the aliases that
+        # resolve its names and this code, which the ETag covers; a match
+        # skips the search entirely
+        etag = path_etag(graph_service)
+        cache_control = f"public, max-age={Config.PATH_MAX_AGE}"
+        if request.if_none_match.contains(etag):
+            return conditional(b"", etag, cache_control, "application/json")
 
-        result = graph_service.find_path(team_a, team_b)
+        result = graph_service.find_path(
+            request.args.get("from"), request.args.get("to"), window
+        )
+        rsp = make_response(path_response(result))
+        if rsp.status_code == 200 and result.llm_text is None:
+            rsp.set_etag(etag)
+            rsp.headers["Cache-Control"] = cache_control
+        else:
+            # Explanations and errors may change without a new graph
+            rsp.headers["Cache-Control"] = "no-store"
+        return rsp
+
+    def path_response(result):
         if result.error:
+            if result.retry_after is not None:
+                # Degraded LLM fallback: busy or timed out, worth retrying
+                headers = {"Retry-After": str(result.retry_after)}
+                return jsonify({"error": result.error}), 503, headers
             return jsonify({"error": result.error}), 400
 
+        body = result.body
+        if body is None:
+            body = dumps(
+                {
+                    "path": result.path_names,
+                    "edges": result.edges,
+                    "llm_text": result.llm_text,
+                }
+            )
+        return Response(body, mimetype="application/json")
+
+    @app.post("/api/paths/batch")
+    def api_paths_batch():
+        graph_service = reloader.service
+        payload = request.get_json(silent=True) or {}
+        pairs = payload.get("pairs")
+        if not isinstance(pairs, list):
+            return jsonify({"error": "Expected a list of pairs."}), 400
+        if len(pairs) > Config.BATCH_MAX_PAIRS:
+            return jsonify(
+                {"error": f"At most {Config.BATCH_MAX_PAIRS} pairs per batch."}
+            ), 400
+
+        # Accept {"from": ..., "to": ...} objects or [from, to] lists; anything
+        # else, or a name that is not a string, becomes an unknown-team error
+        # on its own line
+        names = []
+        for pair in pairs:
+            if isinstance(pair, dict):
+                start, end = pair.get("from"), pair.get("to")
+            elif isinstance(pair, list) and len(pair) == 2:
+                start, end = pair
+            else:
+                start = end = None
+            names.append(
+                (
+                    start if isinstance(start, str) else None,
+                    end if isinstance(end, str) else None,
+                )
+            )
+        explain = bool(payload.get("explain", False))
+
+        def generate():
+            # One JSON object per line, in completion order; "index" refers
+            # back to the request's pairs list
+            for index, result in graph_service.find_paths(
+                names, explain, Config.BATCH_MAX_EXPLAIN
+            ):
+                start, end = names[index]
+                line = {"index": index, "from": start, "to": end}
+                if result.error:
+                    line["error"] = result.error
+                elif result.body is not None:
+                    # Splice the prebuilt chain into this line's object
+                    yield dumps(line)[:-1] + b"," + result.body[1:] + b"\n"
+                    continue
+                else:
+                    line.update(
+                        path=result.path_names,
+                        edges=result.edges,
+                        llm_text=result.llm_text,
+                    )
+                yield dumps(line) + b"\n"
+
+        return Response(
+            stream_with_context(generate()), mimetype="application/x-ndjson"
+        )
+
+    @app.post("/api/paths/alternatives")
+    def api_paths_alternatives():
+        graph_service = reloader.service
+        payload = request.get_json(silent=True) or {}
+        start, end = payload.get("from"), payload.get("to")
+        k = payload.get("k", 3)
+        seasons = payload.get("exclude_seasons", [])
+        teams = payload.get("exclude_teams", [])
+        if not isinstance(start, str) or not isinstance(end, str):
+            return jsonify({"error": "Expected team names in from and to."}), 400
+        # bool is an int subclass, but true is not a k or a season
+        if (
+            isinstance(k, bool)
+            or not isinstance(k, int)
+            or not isinstance(seasons, list)
+            or not all(
+                isinstance(season, int) and not isinstance(season, bool)
+                for season in seasons
+            )
+            or not isinstance(teams, list)
+            or not all(isinstance(team, str) for team in teams)
+        ):
+            return jsonify(
+                {"error": "Expected integer k and exclude_seasons, and a team list."}
+            ), 400
+        k = min(max(k, 1), Config.ALT_PATHS_MAX_K)
+        try:
+            window = parse_window(payload.get("window"), seasons)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        result = graph_service.alternative_paths(
+            start,
+            end,
+            k,
+            window=window,
+            exclude_teams=teams,
+            budget=Config.ALT_PATHS_BUDGET,
+        )
+        if result.error:
+            return jsonify({"error": result.error}), 400
+        return jsonify({"paths": result.paths, "complete": result.complete})
+
+    @app.get("/api/reach")
+    def api_reach():
+        graph_service = reloader.service
+        try:
+            offset = max(int(request.args.get("offset", 0)), 0)
+            limit = int(request.args.get("limit", REACH_PAGE_SIZE))
+        except ValueError:
+            return jsonify({"error": "offset and limit must be integers."}), 400
+        limit = min(max(limit, 1), REACH_PAGE_MAX)
+
+        tree = graph_service.reach_tree(request.args.get("team", ""))
+        if tree.error:
+            return jsonify({"error": tree.error}), 400
         return jsonify(
             {
-                "path": result.path_names,
-                "edges": result.edges,
-                "llm_text": result.llm_text,
+                "team": tree.team,
+                "reachable": len(tree.nodes),
+                "by_season_depth": tree.by_season_depth,
+                "offset": offset,
+                "limit": limit,
+                "nodes": tree.nodes[offset : offset + limit],
             }
         )
 
+    @app.get("/api/rankings")
+    def api_rankings():
+        graph_service = reloader.service
+        key = request.args.get("sort", "dominance")
+        order = request.args.get("order")
+        if key not in SORT_KEYS or order not in (None, "asc", "desc"):
+            return jsonify(
+                {
+                    "error": f"sort must be one of {', '.join(SORT_KEYS)}, "
+                    'and order "asc" or "desc".'
+                }
+            ), 400
+        try:
+            offset = max(int(request.args.get("offset", 0)), 0)
+            limit = int(request.args.get("limit", RANKINGS_PAGE_SIZE))
+        except ValueError:
+            return jsonify({"error": "offset and limit must be integers."}), 400
+        limit = min(max(limit, 1), REACH_PAGE_MAX)
+        descending = SORT_KEYS[key] if order is None else order == "desc"
+
+        return jsonify(
+            {
+                "sort": key,
+                "order": "desc" if descending else "asc",
+                "total": graph_service.get_num_teams(),
+                "offset": offset,
+                "limit": limit,
+                "teams": graph_service.ranking_page(key, descending, offset, limit),
+            }
+        )
+
+    @app.get("/api/stats")
+    def api_stats():
+        graph_service = reloader.service
+        return jsonify(
+            {
+                "path_cache": graph_service.path_cache.stats(),
+                "reach_cache": graph_service.reach_cache.stats(),
+            }
+        )
+
+    @app.get("/api/status")
+    def api_status():
+        return jsonify({"graph": reloader.status()})
+
+    @app.get("/metrics")
+    def metrics_endpoint():
+        return Response(metrics.REGISTRY.render(), mimetype="text/plain; version=0.0.4")
+
+    # Declared once the routes exist: one series per endpoint
+    endpoints = (*sorted(app.view_functions), "other")
+    http_requests = metrics.REGISTRY.counter(
+        "qed_http_requests_total",
+        "HTTP requests by endpoint and status class.",
+        {"endpoint": endpoints, "status": ("1xx", "2xx", "3xx", "4xx", "5xx")},
+    )
+    http_seconds = metrics.REGISTRY.histogram(
+        "qed_http_request_seconds",
+        "Time to build each HTTP response, by endpoint.",
+        {"endpoint": endpoints},
+    )
+
+    @app.before_request
+    def start_timer():
+        g.request_start = time.perf_counter()
+
+    @app.after_request
+    def record_request(response):
+        # Streamed responses are timed until the stream starts, not to its end
+        start = g.pop("request_start", None)
+        if start is not None:
+            endpoint = request.endpoint if request.endpoint in endpoints else "other"
+            http_seconds.observe(time.perf_counter() - start, endpoint)
+            status = f"{min(max(response.status_code // 100, 1), 5)}xx"
+            http_requests.inc(endpoint, status)
+        return response
+
     return app
 
 
@@ -41,4 +476,6 @@ app = create_app()
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 5000))
+    if Config.LLM_WARMUP:
+        app.extensions["graph_reloader"].service.warm_up()
     app.run(host="0.0.0.0", port=port)
@@ -0,0 +1,41 @@
+"""Write files so readers see either the old contents or the new, never part."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+
+@contextmanager
+def atomic_open(path: Path) -> Iterator[BinaryIO]:
+    """Open a binary temp file next to ``path`` that replaces it on success.
+
+    The temp file has a unique name, so concurrent writers of the same path
+    never share one; the last to finish wins. It is removed if the block
+    raises, leaving ``path`` untouched.
+    """
+    path = Path(path)
+    f = tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=path.name + ".", suffix=".tmp", delete=False
+    )
+    try:
+        with f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(f.name, path)
+    except BaseException:
+        try:
+            os.unlink(f.name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """Replace ``path`` with ``data`` atomically."""
+    with atomic_open(path) as f:
+        f.write(data)
@@ -0,0 +1,132 @@
+"""Import-time and worker boot-time report.
+
+First runs ``python -X importtime -c "import app"`` in a fresh interpreter
+with an LLM configured, and lists what ``app`` imports directly by
+cumulative import time. Then starts gunicorn with one worker and reports,
+per run, how long until the worker answers /api/status, the worker's own
+``qed_worker_boot_seconds`` (app load after fork, then the background LLM
+client warm-up) and when that warm-up finished.
+
+Usage: python -m bench.bench_boot [--repeat 3] [--top 12]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+from bench.load_llm_fallback import free_port
+
+ROOT = Path(__file__).resolve().parent.parent
+ENV = dict(os.environ, GEMINI_API_KEY="bench-key", RELOAD_INTERVAL="0")
+
+
+def import_times() -> tuple[float, list[tuple[float, str]]]:
+    """Total ms for ``import app`` and (cumulative ms, module) of its imports."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        cwd=ROOT,
+        env=ENV,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total, direct, children = 0.0, [], []
+    # A module's line follows the lines of everything it imported
+    for line in out.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)", line)
+        if match is None:
+            continue
+        ms, depth, name = int(match[1]) / 1e3, (len(match[2]) - 1) // 2, match[3]
+        if depth == 1:
+            children.append((ms, name))
+        elif depth == 0:
+            if name == "app":
+                total, direct = ms, children
+            children = []
+    return total, sorted(direct, reverse=True)
+
+
+def scrape(base: str) -> dict[str, float]:
+    text = urllib.request.urlopen(base + "/metrics", timeout=1).read().decode()
+    return {
+        f"{m[1]}_{m[2]}": float(m[3])
+        for m in re.finditer(
+            r'^qed_worker_boot_seconds_(sum|count)\{stage="(\w+)"\} (\S+)$',
+            text,
+            re.MULTILINE,
+        )
+    }
+
+
+def boot_once() -> dict[str, float]:
+    """Start gunicorn with one worker and time it until the LLM is warm."""
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    env = dict(ENV, WEB_CONCURRENCY="1", METRICS_DIR=tempfile.mkdtemp())
+    cmd = [sys.executable, "-m", "gunicorn", "app:app", "--bind", f"127.0.0.1:{port}"]
+    start = time.perf_counter()
+    server = subprocess.Popen(cmd, cwd=ROOT, env=env, stderr=subprocess.DEVNULL)
+    try:
+        while True:
+            try:
+                urllib.request.urlopen(base + "/api/status", timeout=1).read()
+                break
+            except OSError:
+                if time.perf_counter() - start > 60:
+                    raise RuntimeError("gunicorn did not start") from None
+                time.sleep(0.005)
+        ready = time.perf_counter() - start
+        while scrape(base).get("count_llm", 0) < 1:
+            if time.perf_counter() - start > 60:
+                raise RuntimeError("the LLM client was never warmed")
+            time.sleep(0.01)
+        warm = time.perf_counter() - start
+        stages = scrape(base)
+    finally:
+        server.terminate()
+        server.wait()
+    return {
+        "ready": ready,
+        "app": stages["sum_app"],
+        "llm": stages["sum_llm"],
+        "warm": warm,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=12)
+    args = parser.parse_args()
+
+    total, direct = import_times()
+    print(f"import app: {total:.0f} ms (-X importtime, cumulative)")
+    for ms, name in direct[: args.top]:
+        print(f"  {name:<28} {ms:7.1f} ms")
+
+    print(
+        f"\n{'run':>4} {'ready':>10} {'app load':>10} {'llm warm-up':>12} {'llm warm':>10}"
+    )
+    for run in range(1, args.repeat + 1):
+        r = boot_once()
+        print(
+            f"{run:>4} {r['ready'] * 1e3:7.0f} ms {r['app'] * 1e3:7.0f} ms "
+            f"{r['llm'] * 1e3:9.0f} ms {r['warm'] * 1e3:7.0f} ms"
+        )
+    print(
+        "\nready: spawn to first /api/status answer; app load: worker fork to "
+        "serving; llm warm-up: background genai import and client; llm warm: "
+        "spawn to warm-up done"
+    )
+
+
+if __name__ == "__main__":
+    main()
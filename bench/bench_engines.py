@@ -0,0 +1,47 @@
+"""Compare per-query latency of the path engines on the real graph.
+
+Usage: python -m bench.bench_engines [--pairs N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+
+from config import Config
+from path_engine import ENGINES, make_engine
+from snapshot import GraphSnapshot, load_fresh_snapshot
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pairs", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    snapshot = load_fresh_snapshot(
+        Config.SNAPSHOT_PATH, Config.GRAPH_PATH, Config.TEAMS_PATH
+    ) or GraphSnapshot.from_sources(Config.GRAPH_PATH, Config.TEAMS_PATH)
+    rng = random.Random(args.seed)
+    n = snapshot.num_nodes
+    pairs = [(rng.randrange(n), rng.randrange(n)) for _ in range(args.pairs)]
+
+    for name in ENGINES:
+        engine = make_engine(name, snapshot)
+        samples = []
+        for src, dst in pairs:
+            start = time.perf_counter()
+            engine.shortest_path(src, dst)
+            samples.append(time.perf_counter() - start)
+        samples.sort()
+        print(
+            f"{name:<10} mean {statistics.fmean(samples) * 1e3:6.2f} ms   "
+            f"p50 {samples[len(samples) // 2] * 1e3:6.2f} ms   "
+            f"p99 {samples[int(len(samples) * 0.99)] * 1e3:6.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
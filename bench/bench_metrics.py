@@ -0,0 +1,96 @@
+"""Overhead of the request and path query metrics.
+
+Times ``find_path`` over the same connected pairs with metrics recording
+and with ``METRICS_ENABLED`` off (the stage timers still read the clock,
+but nothing is recorded): once answered from the path cache, where the
+relative overhead is largest, and once searching. Then the same for POST
+/api/path through Flask's test client, which adds the request middleware.
+Also reports the cost of a single counter increment and histogram
+observation.
+
+Usage: python -m bench.bench_metrics [--pairs 2000] [--rounds 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from bench.load_llm_fallback import pick_pairs
+from config import Config
+
+
+def per_call_us(fn, pairs, rounds: int) -> float:
+    """Median over ``rounds`` of the mean microseconds per call."""
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for pair in pairs:
+            fn(*pair)
+        samples.append((time.perf_counter() - start) / len(pairs) * 1e6)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pairs", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument(
+        "--dir", action="store_true", help="record into METRICS_DIR files"
+    )
+    args = parser.parse_args()
+
+    os.environ.update(GEMINI_API_KEY="", RELOAD_INTERVAL="0")
+    if args.dir:
+        os.environ["METRICS_DIR"] = tempfile.mkdtemp(prefix="qed-metrics-")
+    Config.GEMINI_API_KEY, Config.RELOAD_INTERVAL = "", 0
+    Config.METRICS_DIR = os.environ.get("METRICS_DIR", "")
+
+    import metrics
+    from app import create_app
+
+    app = create_app()
+    service = app.extensions["graph_reloader"].service
+    client = app.test_client()
+    pairs = pick_pairs(args.pairs)[0]
+    service.path_cache.maxsize = len(pairs)
+
+    def search(src: str, dst: str) -> None:
+        service.path_cache.clear()
+        service.find_path(src, dst)
+
+    def post(src: str, dst: str) -> None:
+        client.post("/api/path", json={"from": src, "to": dst})
+
+    print(f"{'':<22} {'recording':>10} {'disabled':>10} {'overhead':>10}")
+    for name, fn in (
+        ("find_path, cached", service.find_path),
+        ("find_path, search", search),
+        ("POST /api/path, cached", post),
+    ):
+        timings = {}
+        # Alternate so drift on the machine hits both sides alike
+        for enabled in (True, False) * args.rounds:
+            metrics.REGISTRY.enabled = enabled
+            timings.setdefault(enabled, []).append(per_call_us(fn, pairs, 1))
+        on, off = statistics.median(timings[True]), statistics.median(timings[False])
+        print(
+            f"{name:<22} {on:8.1f} us {off:8.1f} us "
+            f"{on - off:6.2f} us ({(on - off) / off:+.1%})"
+        )
+
+    metrics.REGISTRY.enabled = True
+    counter = metrics.PATH_QUERIES
+    histogram = metrics.PATH_STAGE_SECONDS
+    calls = [()] * 100_000
+    inc = per_call_us(lambda: counter.inc("found"), calls, 3)
+    observe = per_call_us(lambda: histogram.observe(0.001, "search"), calls, 3)
+    print(f"{'Counter.inc':<22} {inc * 1e3:8.0f} ns")
+    print(f"{'Histogram.observe':<22} {observe * 1e3:8.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Reachability pre-check and bidirectional search against plain Dijkstra.
+
+Runs every ordered pair of distinct teams on the real graph, split into
+pairs with no chain and pairs with one. Pairs with no chain are timed
+through each engine's search (which settles everything the source can
+reach before giving up) and through ``ReachabilityIndex.reachable``.
+Pairs with a chain are timed through each engine. Heap pops per query
+stand in for settled nodes (the networkx engine's are not counted).
+
+All pairs take several minutes; ``--sample`` times a random subset.
+
+Usage: python -m bench.bench_reachability [--sample N] [--engines csr bidir]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+from typing import Callable
+
+import path_engine
+from config import Config
+from path_engine import make_engine
+from reachability import ReachabilityIndex
+from snapshot import GraphSnapshot, load_fresh_snapshot
+
+_pops = 0
+_heappop = path_engine.heappop
+
+
+def _counting_heappop(heap):
+    global _pops
+    _pops += 1
+    return _heappop(heap)
+
+
+def measure(query: Callable[[int, int], object], pairs) -> tuple[list[float], float]:
+    """Sorted per-query seconds and mean heap pops for ``pairs``."""
+    global _pops
+    _pops = 0
+    samples = []
+    for src, dst in pairs:
+        start = time.perf_counter()
+        query(src, dst)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples, _pops / max(len(pairs), 1)
+
+
+def report(label: str, samples: list[float], pops: float) -> None:
+    print(
+        f"  {label:<10} mean {statistics.fmean(samples) * 1e3:8.4f} ms   "
+        f"p50 {samples[len(samples) // 2] * 1e3:8.4f} ms   "
+        f"p99 {samples[int(len(samples) * 0.99)] * 1e3:8.4f} ms   "
+        f"pops {pops:6.1f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sample", type=int, default=0, help="pairs per group (0 runs all pairs)"
+    )
+    parser.add_argument("--engines", nargs="+", default=["csr", "bidir"])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    snapshot = load_fresh_snapshot(
+        Config.SNAPSHOT_PATH, Config.GRAPH_PATH, Config.TEAMS_PATH
+    ) or GraphSnapshot.from_sources(Config.GRAPH_PATH, Config.TEAMS_PATH)
+    start = time.perf_counter()
+    index = ReachabilityIndex(snapshot)
+    print(
+        f"index: {index.num_components} components (largest "
+        f"{index.largest_component} teams) built in "
+        f"{(time.perf_counter() - start) * 1e3:.1f} ms"
+    )
+
+    n = snapshot.num_nodes
+    pairs = [(u, v) for u in range(n) for v in range(n) if u != v]
+    groups = {"no chain": [], "chain": []}
+    for u, v in pairs:
+        groups["chain" if index.reachable(u, v) else "no chain"].append((u, v))
+    rng = random.Random(args.seed)
+    for name, group in groups.items():
+        if args.sample and len(group) > args.sample:
+            groups[name] = rng.sample(group, args.sample)
+
+    engines = {name: make_engine(name, snapshot) for name in args.engines}
+    # Count pops through the module global the engines call
+    path_engine.heappop = _counting_heappop
+    try:
+        for group, group_pairs in groups.items():
+            print(f"{group}: {len(group_pairs)} pairs")
+            if group == "no chain":
+                report("index", *measure(index.reachable, group_pairs))
+            for name, engine in engines.items():
+                report(name, *measure(engine.shortest_path, group_pairs))
+    finally:
+        path_engine.heappop = _heappop
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Cost of turning a found chain into its /api/path response body, by length.
+
+Chains are found up front, so only the response is timed, three ways:
+
+- ``jsonify``: per-hop edge dicts encoded by Flask's ``jsonify``, as
+  /api/path did before edge fragments
+- ``dicts+dumps``: the same dicts through ``fragments.dumps`` (orjson when
+  installed)
+- ``fragments``: the prebuilt edge fragments joined into the body
+
+Usage: python -m bench.bench_serialization [--pairs 300] [--rounds 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+
+from flask import Flask, jsonify
+
+import fragments
+from config import Config
+from fragments import dumps, path_body
+from graph_service import GraphService
+from path_engine import CSREngine, path_from_parents
+
+
+def per_call_us(fn, rounds: int) -> float:
+    """Best of ``rounds`` timings of ``fn``, in microseconds."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pairs", type=int, default=300, help="chains per length")
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    service = GraphService(Config.GRAPH_PATH, Config.TEAMS_PATH, Config.SNAPSHOT_PATH)
+    snapshot = service.snapshot
+    start = time.perf_counter()
+    edge_fragments = service.edge_fragments
+    print(
+        f"fragments for {len(edge_fragments)} edges built in "
+        f"{(time.perf_counter() - start) * 1e3:.1f} ms "
+        f"({'orjson' if fragments.orjson else 'json'})"
+    )
+
+    # Every chain from every source, grouped by hops
+    engine, by_hops = CSREngine(snapshot), {}
+    for src in range(snapshot.num_nodes):
+        parent = engine.shortest_path_tree(src)
+        for dst in range(snapshot.num_nodes):
+            if dst != src and parent[dst] != -1:
+                path = path_from_parents(parent, src, dst)
+                by_hops.setdefault(len(path) - 1, []).append(path)
+    rng = random.Random(args.seed)
+
+    app = Flask(__name__)
+    names = [service._id_to_name[node_id] for node_id in service._node_ids]
+    find_edge = snapshot.find_edge
+
+    def with_jsonify(path):
+        jsonify(
+            {
+                "path": [names[i] for i in path],
+                "edges": service._path_edges(path),
+                "llm_text": None,
+            }
+        ).get_data()
+
+    def with_dumps(path):
+        dumps(
+            {
+                "path": [names[i] for i in path],
+                "edges": service._path_edges(path),
+                "llm_text": None,
+            }
+        )
+
+    def with_fragments(path):
+        edge_ids = [find_edge(u, v) for u, v in zip(path, path[1:])]
+        path_body([names[i] for i in path], edge_fragments.edges_json(edge_ids))
+
+    methods = {
+        "jsonify": with_jsonify,
+        "dicts+dumps": with_dumps,
+        "fragments": with_fragments,
+    }
+    header = "".join(f"{name:>14}" for name in methods)
+    print(f"{'hops':>4} {'chains':>7}{header}   (median us per response)")
+    with app.app_context():
+        for hops in sorted(by_hops):
+            paths = by_hops[hops]
+            if len(paths) > args.pairs:
+                paths = rng.sample(paths, args.pairs)
+            row = []
+            for fn in methods.values():
+                us = [per_call_us(lambda p=path: fn(p), args.rounds) for path in paths]
+                row.append(statistics.median(us))
+            cells = "".join(f"{us:14.1f}" for us in row)
+            print(f"{hops:>4} {len(by_hops[hops]):>7}{cells}")
+
+
+if __name__ == "__main__":
+    main()
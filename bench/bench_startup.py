@@ -0,0 +1,53 @@
+"""Compare GraphService startup time for the GEXF and snapshot loaders.
+
+Usage: python -m bench.bench_startup [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from config import Config
+from graph_service import GraphService
+from snapshot import build_snapshot
+
+
+def time_loader(repeat: int, **kwargs) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        GraphService(Config.GRAPH_PATH, Config.TEAMS_PATH, **kwargs)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def report(name: str, samples: list[float]) -> None:
+    print(
+        f"{name:<10} median {statistics.median(samples) * 1000:8.1f} ms   "
+        f"min {min(samples) * 1000:8.1f} ms   max {max(samples) * 1000:8.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot_path = Path(tmp) / "graph.snap"
+        build_snapshot(Config.GRAPH_PATH, Config.TEAMS_PATH, snapshot_path)
+
+        gexf = time_loader(args.repeat)
+        snap = time_loader(args.repeat, snapshot_path=snapshot_path)
+
+    report("gexf", gexf)
+    report("snapshot", snap)
+    print(f"speedup    {statistics.median(gexf) / statistics.median(snap):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Per-worker memory with and without gunicorn's preload_app.
+
+Starts gunicorn with 1, 4 and 16 workers, once forking workers that each
+load the app (the default) and once with GUNICORN_PRELOAD=1. After some
+traffic it reads /proc/<pid>/smaps_rollup for every worker and reports the
+mean RSS, PSS (shared pages split between the processes sharing them) and
+USS (pages private to the worker), plus the PSS of the whole server. RSS
+counts shared pages in full, so PSS and USS are the numbers that show the
+sharing. Linux only.
+
+Usage: python -m bench.bench_workers [--workers 1 4 16] [--requests 40]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from bench.load_llm_fallback import free_port, pick_pairs
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def memory_kb(pid: int) -> dict[str, int]:
+    """Rss, Pss and Uss of ``pid`` in KiB."""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "rss": fields["Rss"],
+        "pss": fields["Pss"],
+        "uss": fields["Private_Clean"] + fields["Private_Dirty"],
+    }
+
+
+def children(pid: int) -> list[int]:
+    found = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces; ppid follows the ")"
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == pid:
+            found.append(int(entry))
+    return found
+
+
+def exercise(base: str, pairs: list[tuple[str, str]], count: int) -> None:
+    """Send path, search and reach requests spread over the workers."""
+
+    def one(i: int) -> None:
+        src, dst = pairs[i % len(pairs)]
+        body = json.dumps({"from": src, "to": dst}).encode()
+        headers = {"Content-Type": "application/json"}
+        urls = [
+            urllib.request.Request(base + "/api/path", body, headers),
+            base + "/api/teams/search?q=" + urllib.request.quote(src[:4]),
+            base + "/api/reach?team=" + urllib.request.quote(src),
+        ]
+        for url in urls:
+            urllib.request.urlopen(url, timeout=30).read()
+
+    with ThreadPoolExecutor(16) as pool:
+        list(pool.map(one, range(count)))
+
+
+def run(workers: int, preload: bool, pairs, requests: int) -> dict[str, float]:
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    env = dict(
+        os.environ,
+        GUNICORN_PRELOAD="1" if preload else "0",
+        WEB_CONCURRENCY=str(workers),
+        RELOAD_INTERVAL="0",
+        GEMINI_API_KEY="",
+    )
+    cmd = [sys.executable, "-m", "gunicorn", "app:app", "--bind", f"127.0.0.1:{port}"]
+    server = subprocess.Popen(cmd, cwd=ROOT, env=env, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.time() + 60
+        while len(children(server.pid)) < workers or not _up(base):
+            if time.time() > deadline:
+                raise RuntimeError("gunicorn did not start")
+            time.sleep(0.2)
+        exercise(base, pairs, requests * workers)
+        time.sleep(0.5)
+        worker_mem = [memory_kb(pid) for pid in children(server.pid)]
+        master = memory_kb(server.pid)
+    finally:
+        server.terminate()
+        server.wait()
+
+    mean = {k: statistics.mean(m[k] for m in worker_mem) / 1024 for k in master}
+    mean["total_pss"] = (master["pss"] + sum(m["pss"] for m in worker_mem)) / 1024
+    return mean
+
+
+def _up(base: str) -> bool:
+    try:
+        urllib.request.urlopen(base + "/api/status", timeout=1).read()
+        return True
+    except OSError:
+        return False
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument(
+        "--requests", type=int, default=40, help="request rounds per worker"
+    )
+    args = parser.parse_args()
+
+    pairs = pick_pairs(50)[0]
+    print(
+        f"{'mode':<8} {'workers':>7} {'RSS/worker':>11} {'PSS/worker':>11} "
+        f"{'USS/worker':>11} {'total PSS':>10}"
+    )
+    for preload in (False, True):
+        for workers in args.workers:
+            m = run(workers, preload, pairs, args.requests)
+            print(
+                f"{'preload' if preload else 'fork':<8} {workers:>7} "
+                f"{m['rss']:>8.1f} MB {m['pss']:>8.1f} MB {m['uss']:>8.1f} MB "
+                f"{m['total_pss']:>7.1f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
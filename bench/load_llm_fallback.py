@@ -0,0 +1,156 @@
+"""Load test: path query latency while slow LLM fallbacks are in flight.
+
+Starts a stub Gemini server with a fixed delay and one gunicorn worker,
+then measures /api/path latency for connected pairs, first alone and then
+while background clients keep hammering disconnected pairs. It runs twice:
+once with the fallback effectively unbounded (the old behaviour) and once
+with the default LLM_MAX_CONCURRENCY / LLM_TIMEOUT caps.
+
+Usage: python -m bench.load_llm_fallback [--llm-delay 3] [--llm-clients 16]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from pathlib import Path
+
+from bench.stub_llm import StubLLMServer
+from config import Config
+from path_engine import CSREngine
+from snapshot import GraphSnapshot, load_fresh_snapshot
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def pick_pairs(count: int, seed: int = 0) -> tuple[list, list]:
+    """Return (connected, disconnected) team name pairs."""
+    snapshot = load_fresh_snapshot(
+        Config.SNAPSHOT_PATH, Config.GRAPH_PATH, Config.TEAMS_PATH
+    ) or GraphSnapshot.from_sources(Config.GRAPH_PATH, Config.TEAMS_PATH)
+    engine, labels = CSREngine(snapshot), list(snapshot.labels)
+    rng = random.Random(seed)
+    connected, disconnected = [], []
+    while len(connected) < count or len(disconnected) < count:
+        src, dst = rng.randrange(len(labels)), rng.randrange(len(labels))
+        if src == dst:
+            continue
+        bucket = connected if engine.shortest_path(src, dst) else disconnected
+        if len(bucket) < count:
+            bucket.append((labels[src], labels[dst]))
+    return connected, disconnected
+
+
+def post_path(base: str, pair: tuple[str, str]) -> tuple[int, float]:
+    body = json.dumps({"from": pair[0], "to": pair[1]}).encode()
+    req = urllib.request.Request(
+        base + "/api/path", body, {"Content-Type": "application/json"}
+    )
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=120) as rsp:
+            rsp.read()
+            status = rsp.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    return status, time.perf_counter() - start
+
+
+def percentiles(samples: list[float]) -> str:
+    samples = sorted(samples)
+    pick = lambda q: samples[min(len(samples) - 1, int(len(samples) * q))] * 1e3  # noqa: E731
+    return (
+        f"p50 {pick(0.5):7.1f} ms  p95 {pick(0.95):7.1f} ms  p99 {pick(0.99):7.1f} ms"
+    )
+
+
+def run_scenario(name: str, env: dict, args, connected, disconnected) -> None:
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    cmd = [
+        sys.executable, "-m", "gunicorn", "app:app",
+        "--bind", f"127.0.0.1:{port}", "--workers", "1",
+        "--threads", str(args.threads),
+    ]  # fmt: skip
+    server = subprocess.Popen(cmd, cwd=ROOT, env=env, stderr=subprocess.DEVNULL)
+    try:
+        for _ in range(100):
+            try:
+                urllib.request.urlopen(base + "/api/stats", timeout=1).read()
+                break
+            except OSError:
+                time.sleep(0.1)
+
+        baseline = [post_path(base, pair)[1] for pair in connected]
+
+        stop = threading.Event()
+        llm_statuses: Counter = Counter()
+
+        def hammer(i: int) -> None:
+            while not stop.is_set():
+                status, _ = post_path(base, disconnected[i % len(disconnected)])
+                llm_statuses[status] += 1
+                i += args.llm_clients
+
+        hammers = [
+            threading.Thread(target=hammer, args=(i,), daemon=True)
+            for i in range(args.llm_clients)
+        ]
+        for t in hammers:
+            t.start()
+        time.sleep(0.5)
+        loaded = [post_path(base, pair)[1] for pair in connected]
+        stop.set()
+        for t in hammers:
+            t.join(timeout=args.llm_delay + 65)
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(f"== {name}")
+    print(f"  path queries, idle      {percentiles(baseline)}")
+    print(f"  path queries, LLM load  {percentiles(loaded)}")
+    print(f"  LLM responses by status {dict(llm_statuses)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--llm-delay", type=float, default=3.0)
+    parser.add_argument("--llm-clients", type=int, default=16)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--queries", type=int, default=100)
+    args = parser.parse_args()
+
+    connected, disconnected = pick_pairs(args.queries)
+    stub = StubLLMServer(delay=args.llm_delay).start()
+    env = dict(
+        os.environ,
+        GEMINI_API_KEY="stub",
+        GEMINI_BASE_URL=stub.url,
+        LLM_CACHE_PATH="",
+        PATH_CACHE_SIZE="0",
+    )
+    unbounded = dict(env, LLM_MAX_CONCURRENCY="1024", LLM_TIMEOUT="120")
+    run_scenario("unbounded fallback", unbounded, args, connected, disconnected)
+    run_scenario("bounded fallback (defaults)", env, args, connected, disconnected)
+    print(f"stub LLM served {stub.requests} requests")
+
+
+if __name__ == "__main__":
+    main()
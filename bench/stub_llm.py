@@ -0,0 +1,78 @@
+"""Local stand-in for the Gemini ``generateContent`` REST endpoint.
+
+Point the app at it with ``GEMINI_BASE_URL=http://127.0.0.1:<port>/`` to
+exercise the LLM fallback end to end without network access or API cost.
+
+Usage: python -m bench.stub_llm [--port 8765] [--delay 2.0]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STUB_TEXT = "The stub mascot wins on sheer determination."
+
+
+class StubLLMServer(ThreadingHTTPServer):
+    """Answers every POST with a canned explanation after ``delay`` seconds."""
+
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, delay: float = 0.0):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.delay = delay
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/"
+
+    def start(self) -> StubLLMServer:
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with self.server._lock:
+            self.server.requests += 1
+        time.sleep(self.server.delay)
+        body = json.dumps(
+            {
+                "candidates": [
+                    {
+                        "content": {"role": "model", "parts": [{"text": STUB_TEXT}]},
+                        "finishReason": "STOP",
+                    }
+                ]
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=2.0)
+    args = parser.parse_args()
+
+    server = StubLLMServer(args.port, args.delay)
+    print(f"Stub LLM listening on {server.url} (delay {args.delay}s)")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+"""Benchmark suite for GraphService and /api/path, with stored baselines.
+
+Measures on the real graph:
+
+- startup: ``GraphService`` built from the snapshot and from GEXF, and a
+  cold ``import app`` (which loads the graph) in a fresh interpreter
+- latency: ``find_path`` percentiles over random connected pairs, the
+  worst-case pairs (longest chains) and pairs with no chain, with the path
+  cache off and no LLM configured
+- memory: Python heap allocated by a loaded service (tracemalloc) and the
+  peak RSS of a fresh interpreter after ``import app``
+- http: /api/path throughput and latency under gunicorn, a tenth of the
+  requests falling back to the local stub LLM (bench/stub_llm.py)
+
+Timings are also divided by a fixed pure-Python calibration loop run on the
+same machine, and ``--check`` compares those ratios with the baseline for
+the mode in bench/baseline.json, so a baseline recorded on one machine
+still applies on a faster or slower one. A metric more than
+``--tolerance`` worse than its baseline fails the check, except timings
+that stay under ``MIN_CHECKED_MS``: a few microseconds of noise is
+already a large fraction of those. The HTTP metrics and p99 tail
+latencies are reported but never checked: they depend on how many cores
+the machine has, which the calibration loop does not capture.
+
+Usage:
+    python -m bench.suite [--quick] [--skip-http] [--output results.json]
+    python -m bench.suite --quick --check [--tolerance 0.5]
+    python -m bench.suite --quick --save     # record a new baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable
+
+from bench.load_llm_fallback import free_port, pick_pairs, post_path
+from bench.stub_llm import StubLLMServer
+from config import Config
+from graph_service import GraphService
+from path_engine import CSREngine, path_from_parents
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+# Metrics where a larger value is better; every other one should shrink
+HIGHER_IS_BETTER = {"http.requests_per_s"}
+# Metrics compared as-is rather than relative to the calibration loop
+UNSCALED = {"memory.heap_mb", "memory.rss_mb"}
+# Timings below this in both the results and the baseline are not checked
+MIN_CHECKED_MS = 0.05
+
+
+def is_checked(name: str) -> bool:
+    """Whether ``--check`` compares this metric; the rest are informational."""
+    return not (name.startswith("http.") or name.endswith(".p99_ms"))
+
+
+MODES = {
+    "quick": {"repeat": 3, "random": 300, "worst": 50, "http_seconds": 5},
+    "full": {"repeat": 10, "random": 2000, "worst": 200, "http_seconds": 15},
+}
+
+_COLD_START = """
+import json, resource, time
+start = time.perf_counter()
+import app  # noqa: F401
+seconds = time.perf_counter() - start
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"seconds": seconds, "rss_kb": rss_kb}))
+"""
+
+
+def calibrate(repeat: int = 5) -> float:
+    """Best-of time in ms for a fixed loop of dict, list and float work."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        table: dict[int, float] = {}
+        for i in range(200_000):
+            table[i % 997] = table.get(i % 997, 0.0) + i * 0.5
+        sorted(table.values())
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def percentiles(samples: list[float], prefix: str) -> dict[str, float]:
+    """p50/p95/p99 and mean of ``samples`` (seconds) in ms."""
+    samples = sorted(samples)
+
+    def pick(q: float) -> float:
+        return samples[min(len(samples) - 1, int(len(samples) * q))] * 1e3
+
+    return {
+        f"{prefix}.p50_ms": pick(0.5),
+        f"{prefix}.p95_ms": pick(0.95),
+        f"{prefix}.p99_ms": pick(0.99),
+        f"{prefix}.mean_ms": statistics.fmean(samples) * 1e3,
+    }
+
+
+def best_of(repeat: int, fn: Callable[[], object]) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return min(samples) * 1e3
+
+
+def bench_startup(repeat: int) -> dict[str, float]:
+    results = {
+        "startup.snapshot_ms": best_of(
+            repeat,
+            lambda: GraphService(
+                Config.GRAPH_PATH, Config.TEAMS_PATH, Config.SNAPSHOT_PATH
+            ),
+        ),
+        "startup.gexf_ms": best_of(
+            repeat, lambda: GraphService(Config.GRAPH_PATH, Config.TEAMS_PATH)
+        ),
+    }
+    env = dict(os.environ, GEMINI_API_KEY="", RELOAD_INTERVAL="0")
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", _COLD_START],
+            cwd=ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    results["startup.import_app_ms"] = min(r["seconds"] for r in runs) * 1e3
+    # ru_maxrss is KiB on Linux
+    results["memory.rss_mb"] = min(r["rss_kb"] for r in runs) / 1024
+    return results
+
+
+def worst_case_pairs(service: GraphService, count: int) -> list[tuple[str, str]]:
+    """The ``count`` connected pairs whose shortest chains have the most hops."""
+    snapshot = service.snapshot
+    engine, labels = CSREngine(snapshot), list(snapshot.labels)
+    longest = []
+    for src in range(snapshot.num_nodes):
+        parent = engine.shortest_path_tree(src)
+        best = None
+        for dst in range(snapshot.num_nodes):
+            if dst == src or parent[dst] == -1:
+                continue
+            hops = len(path_from_parents(parent, src, dst))
+            if best is None or hops > best[0]:
+                best = (hops, dst)
+        if best is not None:
+            longest.append((best[0], labels[src], labels[best[1]]))
+    longest.sort(reverse=True)
+    return [(src, dst) for _, src, dst in longest[:count]]
+
+
+def bench_latency(
+    service: GraphService, connected, disconnected, worst
+) -> dict[str, float]:
+    results = {}
+    groups = {"random": connected, "worst": worst, "no_chain": disconnected}
+    for name, pairs in groups.items():
+        samples = []
+        for src, dst in pairs:
+            start = time.perf_counter()
+            service.find_path(src, dst)
+            samples.append(time.perf_counter() - start)
+        results.update(percentiles(samples, f"latency.{name}"))
+    return results
+
+
+def bench_memory() -> dict[str, float]:
+    tracemalloc.start()
+    service = GraphService(Config.GRAPH_PATH, Config.TEAMS_PATH, Config.SNAPSHOT_PATH)
+    service.build_indexes()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"memory.heap_mb": current / 2**20}
+
+
+def bench_http(seconds: float, connected, disconnected) -> dict[str, float]:
+    """Drive /api/path from 16 client threads for ``seconds``."""
+    stub = StubLLMServer(delay=0.05).start()
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    env = dict(
+        os.environ,
+        GEMINI_API_KEY="stub",
+        GEMINI_BASE_URL=stub.url,
+        LLM_CACHE_PATH="",
+        # Every fallback reaches the stub, as when the baseline was recorded
+        LLM_RATE_LIMIT="0",
+        RELOAD_INTERVAL="0",
+    )
+    cmd = [sys.executable, "-m", "gunicorn", "app:app", "--bind", f"127.0.0.1:{port}"]
+    server = subprocess.Popen(cmd, cwd=ROOT, env=env, stderr=subprocess.DEVNULL)
+    # Nine connected pairs to every disconnected one
+    mix = []
+    for i, pair in enumerate(connected):
+        mix.append(pair)
+        if i % 9 == 8:
+            mix.append(disconnected[(i // 9) % len(disconnected)])
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    lock = threading.Lock()
+    try:
+        deadline = time.time() + 60
+        while True:
+            try:
+                urllib.request.urlopen(base + "/api/status", timeout=1).read()
+                break
+            except OSError:
+                if time.time() > deadline:
+                    raise RuntimeError("gunicorn did not start") from None
+                time.sleep(0.1)
+
+        stop_at = time.perf_counter() + seconds
+
+        def client(i: int) -> None:
+            while time.perf_counter() < stop_at:
+                status, elapsed = post_path(base, mix[i % len(mix)])
+                with lock:
+                    latencies.append(elapsed)
+                    statuses[status] += 1
+                i += 16
+
+        with ThreadPoolExecutor(16) as pool:
+            list(pool.map(client, range(16)))
+    finally:
+        server.terminate()
+        server.wait()
+        stub.shutdown()
+
+    if set(statuses) - {200}:
+        print(f"  http statuses: {dict(statuses)}", file=sys.stderr)
+    results = {"http.requests_per_s": len(latencies) / seconds}
+    results.update(percentiles(latencies, "http"))
+    return results
+
+
+def run(mode: str, skip_http: bool) -> dict[str, float]:
+    settings = MODES[mode]
+    Config.GEMINI_API_KEY = ""
+    Config.PATH_CACHE_SIZE = 0
+    results = {"calibration_ms": calibrate()}
+    results.update(bench_startup(settings["repeat"]))
+    service = GraphService(Config.GRAPH_PATH, Config.TEAMS_PATH, Config.SNAPSHOT_PATH)
+    connected, disconnected = pick_pairs(settings["random"])
+    worst = worst_case_pairs(service, settings["worst"])
+    results.update(bench_latency(service, connected, disconnected, worst))
+    results.update(bench_memory())
+    if not skip_http:
+        results.update(bench_http(settings["http_seconds"], connected, disconnected))
+    return results
+
+
+def compare(
+    results: dict[str, float], baseline: dict[str, float], tolerance: float
+) -> list[str]:
+    """Describe every metric more than ``tolerance`` worse than ``baseline``."""
+    failures = []
+    for name, value in results.items():
+        if name == "calibration_ms" or name not in baseline or not is_checked(name):
+            continue
+        old = baseline[name]
+        if name.endswith("_ms") and max(value, old) < MIN_CHECKED_MS:
+            continue
+        if name not in UNSCALED:
+            value /= results["calibration_ms"]
+            old /= baseline["calibration_ms"]
+        if old <= 0:
+            continue
+        change = value / old - 1
+        if name in HIGHER_IS_BETTER:
+            change = old / value - 1 if value > 0 else float("inf")
+        if change > tolerance:
+            failures.append(f"{name}: {change:+.0%} against the baseline")
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="fewer samples, for CI")
+    parser.add_argument("--skip-http", action="store_true")
+    parser.add_argument("--output", type=Path, help="also write results here")
+    parser.add_argument("--check", action="store_true", help="fail on regressions")
+    parser.add_argument("--save", action="store_true", help="record a new baseline")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.5,
+        help="allowed slowdown as a fraction of the baseline (default 0.5)",
+    )
+    args = parser.parse_args()
+
+    mode = "quick" if args.quick else "full"
+    results = run(mode, args.skip_http)
+    width = max(map(len, results))
+    for name, value in results.items():
+        note = "" if is_checked(name) else "  (not checked)"
+        print(f"{name:<{width}} {value:10.3f}{note}")
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+
+    baselines = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+    if args.save:
+        baselines[mode] = {name: round(value, 4) for name, value in results.items()}
+        BASELINE_PATH.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        print(f"saved {mode} baseline to {BASELINE_PATH}")
+    if args.check:
+        if mode not in baselines:
+            sys.exit(f"no {mode} baseline in {BASELINE_PATH}; run with --save")
+        failures = compare(results, baselines[mode], args.tolerance)
+        for failure in failures:
+            print(f"REGRESSION {failure}", file=sys.stderr)
+        if failures:
+            sys.exit(1)
+        print(f"no regressions beyond {args.tolerance:.0%} of the {mode} baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,4 +7,69 @@ class Config:
     load_dotenv()
     GRAPH_PATH = Path(__file__).parent / "data/graph.gexf"
     TEAMS_PATH = Path(__file__).parent / "data/teams.pkl"
+    SNAPSHOT_PATH = Path(__file__).parent / "data/graph.snap"
+    # Extra names per team ("Bama") for search and name resolution
+    TEAM_ALIASES_PATH = Path(__file__).parent / "data/aliases.json"
+    # Path search engine: "csr" (flat arrays), "bidir" (bidirectional
+    # search over the same arrays) or "networkx" (reference)
+    PATH_ENGINE = os.getenv("PATH_ENGINE", "csr")
+    # Shortest-path trees: "off", "lazy" (per source on first use) or
+    # "precomputed" (memory-map PATH_TABLE_PATH, built by path_table.py)
+    PATH_TABLE_MODE = os.getenv("PATH_TABLE_MODE", "off")
+    PATH_TABLE_PATH = Path(__file__).parent / "data/paths.bin"
+    # Per-team rankings for /api/rankings, written by ingest.py and rankings.py
+    RANKINGS_PATH = Path(__file__).parent / "data/rankings.json"
+    # Max (src, dst) path results kept in memory per worker; 0 disables
+    PATH_CACHE_SIZE = int(os.getenv("PATH_CACHE_SIZE", "4096"))
+    # Seconds browsers and CDNs may reuse a GET /api/path chain unchecked
+    PATH_MAX_AGE = int(os.getenv("PATH_MAX_AGE", "300"))
+    # Max per-team reach trees (/api/reach) kept in memory per worker
+    REACH_CACHE_SIZE = int(os.getenv("REACH_CACHE_SIZE", "128"))
+    # Max pairs accepted by one /api/paths/batch request
+    BATCH_MAX_PAIRS = int(os.getenv("BATCH_MAX_PAIRS", "1000"))
+    # Pairs of an "explain" batch that may wait on a new LLM explanation
+    BATCH_MAX_EXPLAIN = int(os.getenv("BATCH_MAX_EXPLAIN", "5"))
+    # Most chains one /api/paths/alternatives request may ask for
+    ALT_PATHS_MAX_K = int(os.getenv("ALT_PATHS_MAX_K", "10"))
+    # Seconds an alternatives search may run before returning what it found
+    ALT_PATHS_BUDGET = float(os.getenv("ALT_PATHS_BUDGET", "0.25"))
+    # Seconds between checks for new graph files; 0 disables hot reload
+    RELOAD_INTERVAL = float(os.getenv("RELOAD_INTERVAL", "30"))
+    # Most recently used paths recomputed on the new graph before a swap
+    RELOAD_WARM_PAIRS = int(os.getenv("RELOAD_WARM_PAIRS", "256"))
+    # Seconds the replaced graph keeps its LLM pool and cache connection for
+    # requests that started on it
+    RELOAD_DRAIN = float(os.getenv("RELOAD_DRAIN", "60"))
+    # Record request and path query metrics for /metrics
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+    # Shared directory for per-worker metric files, so /metrics on any
+    # worker reports the whole server; empty keeps metrics per process
+    METRICS_DIR = os.getenv("METRICS_DIR", "")
+    # CollegeFootballData API access for ingest.py
+    CFB_API_KEY = os.getenv("CFB_API_KEY", "")
+    CFBD_BASE_URL = os.getenv("CFBD_BASE_URL", "https://api.collegefootballdata.com")
+    # Cached API responses and the ledger of ingested games
+    INGEST_DIR = Path(__file__).parent / "data/cfbd"
     GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
+    # Optional Gemini endpoint override, e.g. a local stub for load tests
+    GEMINI_BASE_URL = os.getenv("GEMINI_BASE_URL", "")
+    # Seconds a request waits for a fallback before a degraded 503 response
+    LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "8"))
+    # Fallback generations allowed in flight per worker
+    LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+    # New fallback generations started per second per worker, with bursts
+    # of up to LLM_RATE_BURST; beyond that requests get an immediate 503.
+    # 0 disables the limit
+    LLM_RATE_LIMIT = float(os.getenv("LLM_RATE_LIMIT", "2"))
+    LLM_RATE_BURST = float(os.getenv("LLM_RATE_BURST", "4"))
+    # Import genai and build the Gemini client in the background once a
+    # worker is serving; 0 leaves it to the first fallback
+    LLM_WARMUP = os.getenv("LLM_WARMUP", "1") == "1"
+    # Hard limit on a single Gemini HTTP call, in seconds
+    LLM_REQUEST_TIMEOUT = float(os.getenv("LLM_REQUEST_TIMEOUT", "30"))
+    # SQLite cache of LLM explanations; set LLM_CACHE_PATH="" to disable
+    LLM_CACHE_PATH = os.getenv(
+        "LLM_CACHE_PATH", str(Path(__file__).parent / "data/llm_cache.sqlite3")
+    )
+    LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(30 * 24 * 3600)))
+    LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "50000"))
@@ -0,0 +1,80 @@
+"""Pre-encoded JSON for path responses.
+
+Every edge's payload (``from``, ``to``, ``label``, ``fromLogo``,
+``toLogo``) is encoded once into a single buffer, so a chain's response
+body is its edges' fragments joined together instead of per-hop dicts run
+through a generic encoder. ``dumps`` encodes everything else, with orjson
+when it is installed and the standard library otherwise.
+"""
+
+from __future__ import annotations
+
+import json
+from array import array
+from collections.abc import Iterable
+from typing import Any
+
+from snapshot import GraphSnapshot
+
+try:
+    import orjson
+except ImportError:  # optional; json gives the same output, only slower
+    orjson = None
+
+
+def dumps(obj: Any) -> bytes:
+    """Compact UTF-8 JSON for ``obj``."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class EdgeFragments:
+    """The encoded payload of every edge in a snapshot, by edge index."""
+
+    def __init__(self, snapshot: GraphSnapshot):
+        labels = list(snapshot.labels)
+        logos = [logo or "" for logo in snapshot.logos]
+        offsets, targets = snapshot.offsets, snapshot.targets
+        edge_labels = snapshot.edge_labels
+        parts = []
+        # One buffer and an offset per edge: no object per fragment to keep
+        self._offsets = array("I", [0])
+        size = 0
+        for u in range(snapshot.num_nodes):
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                part = dumps(
+                    {
+                        "from": labels[u],
+                        "to": labels[v],
+                        "label": edge_labels[e] or f"{labels[u]} def. {labels[v]}",
+                        "fromLogo": logos[u],
+                        "toLogo": logos[v],
+                    }
+                )
+                parts.append(part)
+                size += len(part)
+                self._offsets.append(size)
+        self._buf = b"".join(parts)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, e: int) -> bytes:
+        return self._buf[self._offsets[e] : self._offsets[e + 1]]
+
+    def edges_json(self, edge_ids: Iterable[int]) -> bytes:
+        """A JSON array of the given edges' payloads."""
+        return b"[" + b",".join(map(self.__getitem__, edge_ids)) + b"]"
+
+
+def path_body(path_names: list[str], edges_json: bytes) -> bytes:
+    """The /api/path response body for a chain."""
+    return (
+        b'{"path":'
+        + dumps(path_names)
+        + b',"edges":'
+        + edges_json
+        + b',"llm_text":null}'
+    )
@@ -8,14 +8,51 @@ rendering.
 
 from __future__ import annotations
 
-import pickle
-from dataclasses import dataclass
+import hashlib
+import json
+import logging
+import math
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, Sequence
 
-import networkx as nx
-
+import metrics
+from cache import LRUCache
+from llm_cache import ExplanationCache
 from llm_service import LLMService
 from config import Config
+from fragments import EdgeFragments, path_body
+from k_paths import KShortestPaths
+from path_engine import (
+    CSREngine,
+    NetworkXEngine,
+    PathEngine,
+    make_engine,
+    path_from_parents,
+)
+from path_table import PathTable, PathTableError
+from rankings import Rankings, RankingsError
+from rate_limit import TokenBucket
+from reachability import ReachabilityIndex
+from snapshot import WEEK_UNKNOWN, GraphSnapshot, load_fresh_snapshot
+from team_index import TeamIndex, load_aliases
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+logger = logging.getLogger(__name__)
+
+LLM_BUSY_MESSAGE = "Our mascot analysts are busy. Try again in a few seconds."
+LLM_TIMEOUT_MESSAGE = "The explanation is taking longer than usual. Try again shortly."
+LLM_RETRY_AFTER = 5
+NO_SEASONS_MESSAGE = "Season filters are not available for this graph."
+NO_WEEKS_MESSAGE = "Week filters are not available for this graph."
 
 
 @dataclass
@@ -24,106 +61,809 @@ class PathResult:
     edges: list[dict[str, str]]
     error: str | None = None
     llm_text: str | None = None
+    # Seconds until a retry may succeed, set when the LLM fallback is degraded
+    retry_after: int | None = None
+    # Encoded /api/path response, prebuilt for chains using the graph's labels
+    body: bytes | None = field(default=None, compare=False, repr=False)
+
+
+@dataclass
+class ReachTree:
+    """Shortest-path tree from one team to every team it transitively beats.
+
+    ``nodes`` holds one entry per reachable team with its parent, the label
+    of the game against that parent, hop count and ``seasons_back`` (0 when
+    the whole chain uses the latest season, 1 when it needs the season
+    before, ...). Parents always come before their children.
+    """
+
+    team: str
+    nodes: list[dict[str, str | int]]
+    # Reachable team counts per seasons_back value, ascending
+    by_season_depth: list[dict[str, int]]
+    error: str | None = None
+
+
+@dataclass(frozen=True)
+class GameFilter:
+    """Which games a search may use. Hashable, so results cache per filter.
+
+    ``first_season`` and ``last_season`` bound the seasons, and
+    ``last_week`` ends ``last_season`` after that week for "as of" queries.
+    Seasons in ``exclude_seasons`` are skipped.
+    """
+
+    first_season: int | None = None
+    last_season: int | None = None
+    last_week: int | None = None
+    exclude_seasons: frozenset[int] = frozenset()
+
+    def allows(self, season: int, week: int) -> bool:
+        if season in self.exclude_seasons:
+            return False
+        if self.first_season is not None and season < self.first_season:
+            return False
+        if self.last_season is not None and season > self.last_season:
+            return False
+        if season == self.last_season and self.last_week is not None:
+            return week <= self.last_week
+        return True
+
+
+@dataclass
+class AlternativePaths:
+    """The k cheapest loopless chains between two teams, best first.
+
+    Each entry in ``paths`` has ``path`` (team names), ``edges`` shaped like
+    ``PathResult.edges`` and ``seasons_back``. ``complete`` is False when
+    the latency budget ran out before k chains were found.
+    """
+
+    paths: list[dict[str, Any]]
+    complete: bool = True
+    error: str | None = None
 
 
 class GraphService:
     """Wraps graph loading and path finding."""
 
-    def __init__(self, graph_path: Path, teams_path: Path):
+    def __init__(
+        self,
+        graph_path: Path,
+        teams_path: Path,
+        snapshot_path: Path | None = None,
+    ):
         if not graph_path.exists():
             raise FileNotFoundError(f"Graph file not found at {graph_path}")
 
-        self.graph = nx.read_gexf(graph_path)
+        # Prefer the memory-mapped snapshot; fall back to parsing GEXF when
+        # it is missing or was built from different source files
+        snapshot = None
+        if snapshot_path is not None:
+            snapshot = load_fresh_snapshot(snapshot_path, graph_path, teams_path)
+        if snapshot is None:
+            snapshot = GraphSnapshot.from_sources(graph_path, teams_path)
+        self.snapshot = snapshot
+
+        node_ids = list(snapshot.node_ids)
+        self._node_ids = node_ids
+        # Dense index per node id; engines work on these integers
+        self._index = {node_id: i for i, node_id in enumerate(node_ids)}
         # Build lookup: node_id -> team name from label attribute
-        self._id_to_name = {
-            node: data.get("label", node) for node, data in self.graph.nodes(data=True)
-        }
+        self._id_to_name = dict(zip(node_ids, snapshot.labels))
         # Build reverse lookup: lowercased name -> node_id for search
         self._name_to_id = {
             name.lower().strip(): node_id for node_id, name in self._id_to_name.items()
         }
         self.team_names = sorted(set(self._id_to_name.values()))
+        # Read now so the aliases behind version are the ones lookups use
+        self._aliases = load_aliases(Config.TEAM_ALIASES_PATH)
 
-        # Load team data with logos
-        with open(teams_path, "rb") as f:
-            teams_list = pickle.load(f)
+        # Logos and mascots stay in the snapshot's string tables, which are
+        # memory-mapped and so shared by every worker; see _logo and _mascot
 
-        self._id_to_logo = {
-            str(team["id"]): team.get("logo", "") for team in teams_list
-        }
-        self._id_to_mascot = {
-            str(team["id"]): team.get("mascot", "") for team in teams_list
+        # Answers "is there any chain?" without a search, so pairs with none
+        # go straight to the fallback
+        self.reachability = ReachabilityIndex(snapshot)
+        # Path search engine, optionally behind precomputed shortest-path trees
+        self._engine = self._load_engine()
+        # Built results per (src, dst) node id pair. The cache belongs to
+        # this instance, so loading a new graph starts from an empty one.
+        self.path_cache = LRUCache(Config.PATH_CACHE_SIZE)
+        # Built trees per source node id, for paging through reach_tree
+        self.reach_cache = LRUCache(Config.REACH_CACHE_SIZE)
+        # Edge weights grow with a game's age, one value per season, so the
+        # rank of a weight among the distinct weights is its seasons back
+        self._seasons_back = {
+            w: rank for rank, w in enumerate(sorted(set(snapshot.game_weights)))
         }
+        # Per-edge weights and chosen games for each recent GameFilter
+        self._filtered_weights = LRUCache(16)
 
         # Initialize LLM service for fallback explanations
         self._llm_service = (
-            LLMService(Config.GEMINI_API_KEY) if Config.GEMINI_API_KEY else None
+            LLMService(
+                Config.GEMINI_API_KEY,
+                timeout=Config.LLM_REQUEST_TIMEOUT,
+                base_url=Config.GEMINI_BASE_URL,
+            )
+            if Config.GEMINI_API_KEY
+            else None
+        )
+        # Fallbacks run on their own bounded pool so a slow LLM cannot hold
+        # every request thread; threads are only started on first use
+        self._llm_executor = ThreadPoolExecutor(
+            max_workers=Config.LLM_MAX_CONCURRENCY, thread_name_prefix="llm-fallback"
+        )
+        self._llm_slots = threading.BoundedSemaphore(Config.LLM_MAX_CONCURRENCY)
+        # Generations in flight per (victor, loser): concurrent requests for
+        # the same pair wait on one call instead of each making their own
+        self._llm_inflight: dict[tuple[str, str], Future] = {}
+        self._llm_inflight_lock = threading.Lock()
+        # Caps the rate of new generations, so a burst of distinct pairs gets
+        # fast degraded answers instead of queueing on the API quota
+        self._llm_rate = (
+            TokenBucket(Config.LLM_RATE_LIMIT, Config.LLM_RATE_BURST)
+            if Config.LLM_RATE_LIMIT > 0
+            else None
         )
+        # Persistent store of generated explanations, shared across workers
+        self._llm_cache = (
+            ExplanationCache(
+                Config.LLM_CACHE_PATH,
+                ttl=Config.LLM_CACHE_TTL,
+                max_entries=Config.LLM_CACHE_MAX_ENTRIES,
+            )
+            if self._llm_service and Config.LLM_CACHE_PATH
+            else None
+        )
+
+    @cached_property
+    def graph(self) -> nx.DiGraph:
+        """NetworkX view of the graph, built on first use."""
+        return self.snapshot.to_networkx()
+
+    @cached_property
+    def team_index(self) -> TeamIndex:
+        """Fuzzy name index, built on the first lookup that needs it."""
+        return TeamIndex(
+            list(self.snapshot.labels),
+            list(self.snapshot.mascots),
+            self._aliases,
+        )
+
+    @cached_property
+    def version(self) -> str:
+        """Identifies what answers depend on: the graph and the team aliases."""
+        digest = hashlib.sha1(self.snapshot.fingerprint)
+        digest.update(json.dumps(self._aliases, sort_keys=True).encode())
+        return digest.hexdigest()[:20]
+
+    @cached_property
+    def k_paths(self) -> KShortestPaths:
+        """K-shortest-paths search, sharing one reverse adjacency."""
+        return KShortestPaths(self.snapshot)
+
+    @cached_property
+    def edge_fragments(self) -> EdgeFragments:
+        """Encoded payload of every edge, built on the first chain found."""
+        return EdgeFragments(self.snapshot)
+
+    @cached_property
+    def rankings(self) -> Rankings:
+        """Per-team rankings from RANKINGS_PATH, computed here if it is stale."""
+        try:
+            return Rankings.load(Config.RANKINGS_PATH, self.snapshot.fingerprint)
+        except RankingsError as e:
+            logger.warning("%s; computing rankings", e)
+            return Rankings.compute(self.snapshot)
+
+    def ranking_page(
+        self, key: str, descending: bool, offset: int, limit: int
+    ) -> list[dict[str, Any]]:
+        """Teams ``offset`` to ``offset + limit`` in the order of ranking ``key``."""
+        rankings = self.rankings
+        order = rankings.order(key, descending)
+        page = []
+        for rank, i in enumerate(order[offset : offset + limit], offset + 1):
+            page.append(
+                {
+                    "rank": rank,
+                    "team": rankings.teams[i],
+                    "logo": self._logo(self._node_ids[i]),
+                    "reach": rankings.reach[i],
+                    "avg_chain": rankings.avg_chain[i],
+                    "dominance": rankings.dominance[i],
+                }
+            )
+        return page
+
+    @cached_property
+    def latest_season(self) -> int | None:
+        """Most recent season in the graph, or None if seasons are unknown."""
+        return max(self.snapshot.game_seasons, default=0) or None
+
+    @cached_property
+    def has_weeks(self) -> bool:
+        """Whether any game knows its week; the notebook's graph has none."""
+        return any(week != WEEK_UNKNOWN for week in self.snapshot.game_weeks)
+
+    def _window_error(self, window: GameFilter) -> str | None:
+        """Why ``window`` cannot be applied to this graph, if it cannot."""
+        if self.latest_season is None:
+            return NO_SEASONS_MESSAGE
+        if window.last_week is not None and not self.has_weeks:
+            # Every game would count as unplayed, dropping the whole season
+            return NO_WEEKS_MESSAGE
+        return None
+
+    @cached_property
+    def _window_engine(self) -> CSREngine:
+        # Filtered searches take per-edge weights, which only CSR supports
+        if isinstance(self._engine, CSREngine):
+            return self._engine
+        return CSREngine(self.snapshot)
+
+    def _load_engine(self) -> PathEngine | PathTable:
+        graph = self.graph if Config.PATH_ENGINE == NetworkXEngine.name else None
+        engine = make_engine(Config.PATH_ENGINE, self.snapshot, graph)
+
+        mode = Config.PATH_TABLE_MODE
+        if mode == "off":
+            return engine
+        if mode not in ("lazy", "precomputed"):
+            raise ValueError(f"Unknown PATH_TABLE_MODE: {mode!r}")
+
+        table = PathTable(engine)
+        if mode == "precomputed":
+            try:
+                table.load(Config.PATH_TABLE_PATH, self.snapshot.fingerprint)
+            except PathTableError as e:
+                # Still correct, just filled one source at a time
+                logger.warning("%s; filling path table lazily", e)
+        return table
+
+    def build_indexes(self) -> None:
+        """Build the lazily created lookup structures now.
+
+        With gunicorn's preload_app the master calls this before forking,
+        so workers share one copy instead of each building their own.
+        """
+        self.team_index
+        self.k_paths
+        self.edge_fragments
+        self.rankings
+
+    def close(self) -> None:
+        """Stop the LLM pool and close the explanation cache connection.
+
+        Generations already running finish first, so their results still
+        reach the cache. Later fallbacks get the busy message.
+        """
+        self._llm_executor.shutdown(wait=True)
+        # Dropped first, so a late request cannot reopen the connection
+        cache, self._llm_cache = self._llm_cache, None
+        if cache is not None:
+            cache.close()
+
+    def warm_up(self) -> None:
+        """Import genai and build the LLM client on a background thread."""
+        if self._llm_service is not None:
+            threading.Thread(
+                target=self._warm_llm, name="llm-warmup", daemon=True
+            ).start()
+
+    def _warm_llm(self) -> None:
+        start = time.perf_counter()
+        try:
+            self._llm_service.warm_up()
+        except Exception:
+            # The first fallback will try again and report the error
+            logger.warning("LLM client warm-up failed", exc_info=True)
+            return
+        metrics.WORKER_BOOT_SECONDS.observe(time.perf_counter() - start, "llm")
+
+    def _logo(self, node_id: str) -> str:
+        return self.snapshot.logos[self._index[node_id]] or ""
+
+    def _mascot(self, node_id: str) -> str:
+        return self.snapshot.mascots[self._index[node_id]] or ""
+
+    def team_list(self) -> list[dict[str, str]]:
+        """Every team with its logo, sorted by name."""
+        teams = {name: node_id for node_id, name in self._id_to_name.items()}
+        return [
+            {"team": name, "logo": self._logo(teams[name])} for name in sorted(teams)
+        ]
 
     def get_num_teams(self) -> int:
         return len(self._id_to_name)
 
-    def find_path(self, start_name: str, end_name: str) -> PathResult:
-        key_a = (start_name or "").strip().lower()
-        key_b = (end_name or "").strip().lower()
+    def _resolve(self, name: str | None) -> str | None:
+        node_id = self._name_to_id.get((name or "").strip().lower())
+        if node_id is None and name:
+            # Aliases, abbreviations and near-miss spellings
+            match = self.team_index.resolve(name)
+            if match is not None:
+                node_id = self._name_to_id[match.lower().strip()]
+        return node_id
 
-        src = self._name_to_id.get(key_a)
-        dst = self._name_to_id.get(key_b)
+    def search_teams(self, query: str, limit: int = 10) -> list[dict[str, str]]:
+        """Autocomplete matches for ``query``, best first."""
+        results = []
+        for name, matched in self.team_index.search(query, limit):
+            node_id = self._name_to_id[name.lower().strip()]
+            logo = self._logo(node_id)
+            results.append({"team": name, "matched": matched, "logo": logo})
+        return results
 
+    def _check_pair(self, src: str | None, dst: str | None) -> PathResult | None:
+        """Return an error result for an unusable pair, else None."""
         if not src or not dst:
             return PathResult([], [], error="Unknown team name provided.")
         if src == dst:
             disp = self._id_to_name[src]
             return PathResult([disp], [], error="Choose two different teams.")
+        return None
 
-        try:
-            path_nodes = nx.shortest_path(self.graph, src, dst, weight="weight")
-        except nx.NetworkXNoPath:
-            msg, success = self.fallback_to_llm(src, dst)
+    def find_path(
+        self, start_name: str, end_name: str, window: GameFilter | None = None
+    ) -> PathResult:
+        """Shortest chain, using only games ``window`` allows if one is given.
+
+        Stages are only timed for queries that search or may ask the LLM;
+        invalid, cached and unexplained no-chain answers take microseconds,
+        so they are just counted.
+        """
+        timer = metrics.StageTimer(metrics.PATH_STAGE_SECONDS)
+        src = self._resolve(start_name)
+        dst = self._resolve(end_name)
+        timer.lap("resolve")
+        error = self._check_pair(src, dst)
+        if error:
+            metrics.PATH_QUERIES.inc("invalid")
+            return error
+
+        cached = self.path_cache.get(
+            (src, dst) if window is None else (src, dst, window)
+        )
+        if cached is not None:
+            metrics.PATH_QUERIES.inc("cached")
+            metrics.PATH_HOPS.observe(len(cached.edges))
+            return cached
+
+        s, d = self._index[src], self._index[dst]
+        # No chain in the full graph means none in any window either
+        connected = self.reachability.reachable(s, d)
+        games = None
+        if window is None:
+            path_idx = self._engine.shortest_path(s, d) if connected else None
+        elif self._window_error(window):
+            metrics.PATH_QUERIES.inc("invalid")
+            return PathResult([], [], error=self._window_error(window))
+        else:
+            path_idx = None
+            if connected:
+                weights, games = self._game_filter(window)
+                path_idx = self._window_engine.shortest_path(s, d, weights)
+        timer.lap("search")
+
+        if path_idx is None:
+            if window is not None:
+                timer.record(metrics.PATH_QUERIES, "no_chain")
+                # No LLM here: the teams may well be connected outside the window
+                return PathResult(
+                    [], [], error="No victory chain exists in that window."
+                )
+            result = self._build_result(src, dst, None)
+            if self._llm_service is None:
+                metrics.PATH_QUERIES.inc("no_chain")
+                return result
+            timer.lap("fallback")
+            timer.record(metrics.PATH_QUERIES, "no_chain")
+            return result
+        result = self._build_result(src, dst, path_idx, window=window, games=games)
+        timer.lap("build")
+        timer.record(metrics.PATH_QUERIES, "found")
+        metrics.PATH_HOPS.observe(len(path_idx) - 1)
+        return result
+
+    def find_paths(
+        self,
+        pairs: Iterable[tuple[str | None, str | None]],
+        explain: bool = False,
+        explain_limit: int | None = None,
+    ) -> Iterator[tuple[int, PathResult]]:
+        """Resolve many (from, to) name pairs, yielding ``(input index, result)``.
+
+        Pairs are grouped by source team so each source needs one search: a
+        full shortest-path tree when it has several reachable targets, a
+        point-to-point search otherwise. Results for invalid or cached pairs come first, then
+        one group per source, so the input order is not preserved.
+
+        Pairs without a path use a stored explanation when there is one. Only
+        with ``explain`` is the LLM asked for new ones, and for at most
+        ``explain_limit`` pairs, since each may wait up to ``LLM_TIMEOUT``.
+        """
+        groups: dict[str, list[tuple[int, str]]] = {}
+        explained = 0
+        for i, (start_name, end_name) in enumerate(pairs):
+            src, dst = self._resolve(start_name), self._resolve(end_name)
+            error = self._check_pair(src, dst)
+            if error:
+                yield i, error
+                continue
+            cached = self.path_cache.get((src, dst))
+            if cached is not None:
+                yield i, cached
+                continue
+            groups.setdefault(src, []).append((i, dst))
+
+        for src, group in groups.items():
+            s = self._index[src]
+            targets = []
+            for i, dst in group:
+                if self.reachability.reachable(s, self._index[dst]):
+                    targets.append((i, dst))
+                    continue
+                ask = explain and (explain_limit is None or explained < explain_limit)
+                if ask and self.cached_explanation(src, dst) is None:
+                    explained += 1
+                yield i, self._build_result(src, dst, None, ask)
+            if not targets:
+                continue
+            if len(targets) == 1:
+                [(i, dst)] = targets
+                path_idx = self._engine.shortest_path(s, self._index[dst])
+                yield i, self._build_result(src, dst, path_idx, explain)
+                continue
+            parent = self._engine.shortest_path_tree(s)
+            for i, dst in targets:
+                path_idx = path_from_parents(parent, s, self._index[dst])
+                yield i, self._build_result(src, dst, path_idx, explain)
+
+    def warm_paths(self, pairs: Iterable[tuple[str, str]]) -> int:
+        """Cache paths for (src, dst) node id pairs; return how many were found.
+
+        Used to carry another instance's hot keys over to a reloaded graph.
+        Ids missing from this graph and windowed keys are skipped, and no
+        LLM calls are made.
+        """
+        names = [
+            (self._id_to_name[key[0]], self._id_to_name[key[1]])
+            for key in pairs
+            if len(key) == 2
+            and key[0] in self._id_to_name
+            and key[1] in self._id_to_name
+        ]
+        return sum(result.error is None for _, result in self.find_paths(names))
+
+    def _build_result(
+        self,
+        src: str,
+        dst: str,
+        path_idx: list[int] | None,
+        explain: bool = True,
+        window: GameFilter | None = None,
+        games: list[int] | None = None,
+    ) -> PathResult:
+        """Turn an engine path into a response, falling back when there is none.
+
+        ``games`` holds the game chosen per edge under ``window``, whose
+        labels replace the edges' own.
+        """
+        if path_idx is None:
+            if explain:
+                msg, success, retry_after = self._fallback_with_deadline(src, dst)
+            else:
+                cached_msg = self.cached_explanation(src, dst)
+                msg = cached_msg or "No victory chain exists."
+                success, retry_after = cached_msg is not None, None
             if success:
                 # Include logos in the response for the frontend to use
                 return PathResult(
                     [self._id_to_name[src], self._id_to_name[dst]],
                     [
                         {
-                            "fromLogo": self._id_to_logo.get(str(src), ""),
-                            "toLogo": self._id_to_logo.get(str(dst), ""),
+                            "fromLogo": self._logo(src),
+                            "toLogo": self._logo(dst),
                         }
                     ],
                     llm_text=msg,
                 )
-            return PathResult([], [], error=msg)
-        except nx.NodeNotFound:
-            return PathResult([], [], error="Unknown team name provided.")
+            return PathResult([], [], error=msg, retry_after=retry_after)
 
-        path_names = [self._id_to_name[node] for node in path_nodes]
-        edges: list[dict[str, str]] = []
-        for u, v in zip(path_nodes, path_nodes[1:]):
-            edge_data = self.graph[u][v]
-            label = (
-                edge_data.get("label")
-                or f"{self._id_to_name[u]} def. {self._id_to_name[v]}"
+        path_names = [self._id_to_name[self._node_ids[i]] for i in path_idx]
+        result = PathResult(path_names, self._path_edges(path_idx, games))
+        if games is None:
+            # Cached with the result, so a repeat query is served as-is
+            find_edge = self.snapshot.find_edge
+            edge_ids = [find_edge(u, v) for u, v in zip(path_idx, path_idx[1:])]
+            result.body = path_body(
+                path_names, self.edge_fragments.edges_json(edge_ids)
             )
+        self.path_cache.put(
+            (src, dst) if window is None else (src, dst, window), result
+        )
+        return result
+
+    def _path_edges(
+        self, path_idx: list[int], games: list[int] | None = None
+    ) -> list[dict[str, str]]:
+        edges = []
+        for ui, vi in zip(path_idx, path_idx[1:]):
+            u, v = self._node_ids[ui], self._node_ids[vi]
             edges.append(
                 {
                     "from": self._id_to_name[u],
                     "to": self._id_to_name[v],
-                    "label": label,
-                    "fromLogo": self._id_to_logo.get(str(u), ""),
-                    "toLogo": self._id_to_logo.get(str(v), ""),
+                    "label": self._edge_label(ui, vi, games),
+                    "fromLogo": self._logo(u),
+                    "toLogo": self._logo(v),
+                }
+            )
+        return edges
+
+    def _edge_label(self, ui: int, vi: int, games: list[int] | None = None) -> str:
+        e = self.snapshot.find_edge(ui, vi)
+        if games is None:
+            label = self.snapshot.edge_labels[e]
+        else:
+            label = self.snapshot.game_labels[games[e]]
+        if label:
+            return label
+        u, v = self._node_ids[ui], self._node_ids[vi]
+        return f"{self._id_to_name[u]} def. {self._id_to_name[v]}"
+
+    def reach_tree(self, team_name: str) -> ReachTree:
+        """Every team ``team_name`` transitively beats, from one search."""
+        src = self._resolve(team_name)
+        if not src:
+            return ReachTree("", [], [], error="Unknown team name provided.")
+        cached = self.reach_cache.get(src)
+        if cached is not None:
+            return cached
+
+        s = self._index[src]
+        parent = self._engine.shortest_path_tree(s)
+        children: list[list[int]] = [[] for _ in parent]
+        for v, p in enumerate(parent):
+            if p != -1 and v != s:
+                children[p].append(v)
+
+        # Walk the tree top-down so each node extends its parent's chain
+        snap = self.snapshot
+        hops = {s: 0}
+        back = {s: 0}
+        nodes: list[dict[str, str | int]] = []
+        frontier = [s]
+        while frontier:
+            next_frontier = []
+            for p in frontier:
+                for v in children[p]:
+                    e = snap.find_edge(p, v)
+                    hops[v] = hops[p] + 1
+                    back[v] = max(back[p], self._seasons_back[snap.weights[e]])
+                    v_id = self._node_ids[v]
+                    nodes.append(
+                        {
+                            "team": self._id_to_name[v_id],
+                            "parent": self._id_to_name[self._node_ids[p]],
+                            "label": self._edge_label(p, v),
+                            "logo": self._logo(v_id),
+                            "hops": hops[v],
+                            "seasons_back": back[v],
+                        }
+                    )
+                    next_frontier.append(v)
+            frontier = next_frontier
+
+        # A parent never has more seasons_back or hops than its child
+        nodes.sort(key=lambda n: (n["seasons_back"], n["hops"], n["team"]))
+        counts: dict[int, int] = {}
+        for node in nodes:
+            counts[node["seasons_back"]] = counts.get(node["seasons_back"], 0) + 1
+        by_depth = [{"seasons_back": k, "teams": counts[k]} for k in sorted(counts)]
+
+        result = ReachTree(self._id_to_name[src], nodes, by_depth)
+        self.reach_cache.put(src, result)
+        return result
+
+    def alternative_paths(
+        self,
+        start_name: str,
+        end_name: str,
+        k: int,
+        window: GameFilter | None = None,
+        exclude_teams: Iterable[str] = (),
+        budget: float | None = None,
+    ) -> AlternativePaths:
+        """Up to ``k`` cheapest loopless chains, optionally limited to the
+        games ``window`` allows and avoiding teams. ``budget`` caps the
+        search time in seconds.
+        """
+        src = self._resolve(start_name)
+        dst = self._resolve(end_name)
+        error = self._check_pair(src, dst)
+        if error:
+            return AlternativePaths([], error=error.error)
+        blocked = []
+        for name in exclude_teams:
+            node_id = self._resolve(name)
+            if node_id is None:
+                return AlternativePaths([], error="Unknown team name provided.")
+            if node_id in (src, dst):
+                return AlternativePaths(
+                    [], error="Cannot exclude a team from its own matchup."
+                )
+            blocked.append(self._index[node_id])
+        if window is not None and self._window_error(window):
+            return AlternativePaths([], error=self._window_error(window))
+
+        s, d = self._index[src], self._index[dst]
+        if not self.reachability.reachable(s, d):
+            return AlternativePaths([])
+        weights, games = self._game_filter(window)
+        deadline = None if budget is None else time.perf_counter() + budget
+        found, complete = self.k_paths.search(s, d, k, weights, blocked, deadline)
+
+        find_edge = self.snapshot.find_edge
+        paths = []
+        for path_idx, _ in found:
+            back = max(
+                self._seasons_back[weights[find_edge(ui, vi)]]
+                for ui, vi in zip(path_idx, path_idx[1:])
+            )
+            paths.append(
+                {
+                    "path": [self._id_to_name[self._node_ids[i]] for i in path_idx],
+                    "edges": self._path_edges(path_idx, games),
+                    "seasons_back": back,
                 }
             )
+        return AlternativePaths(paths, complete)
+
+    def _game_filter(
+        self, window: GameFilter | None
+    ) -> tuple[Sequence[float], list[int] | None]:
+        """Per-edge weights using only the games ``window`` allows.
+
+        Returns the weights (``inf`` where no game is left) and the chosen
+        game per edge, or the snapshot's own weights and None without a
+        window. Searches skip infinite edges, so nothing is copied per query.
+        """
+        if window is None:
+            return self.snapshot.weights, None
+        cached = self._filtered_weights.get(window)
+        if cached is not None:
+            return cached
+
+        snap = self.snapshot
+        offsets, game_weights = snap.game_offsets, snap.game_weights
+        allowed = [
+            window.allows(season, week)
+            for season, week in zip(snap.game_seasons, snap.game_weeks)
+        ]
+        weights = [float("inf")] * snap.num_edges
+        games = [-1] * snap.num_edges
+        for e in range(snap.num_edges):
+            # Lightest allowed game; ties go to the last listed, as in the snapshot
+            for g in range(offsets[e], offsets[e + 1]):
+                w = game_weights[g]
+                if allowed[g] and w <= weights[e]:
+                    weights[e], games[e] = w, g
+        self._filtered_weights.put(window, (weights, games))
+        return weights, games
+
+    def _explanation_key(
+        self, victor_id: str, loser_id: str
+    ) -> tuple[str, str, tuple[str, str, str, str]]:
+        # Supply team names along with mascots
+        victor = self._id_to_name[victor_id] + " " + self._mascot(victor_id)
+        loser = self._id_to_name[loser_id] + " " + self._mascot(loser_id)
+        key = (
+            victor_id,
+            loser_id,
+            self._llm_service.model,
+            self._llm_service.prompt_hash(victor, loser),
+        )
+        return victor, loser, key
+
+    def cached_explanation(self, victor_id: str, loser_id: str) -> str | None:
+        """Return a stored explanation without calling the LLM."""
+        if not self._llm_service or self._llm_cache is None:
+            return None
+        _, _, key = self._explanation_key(victor_id, loser_id)
+        return self._llm_cache.get(*key)
+
+    def _fallback_with_deadline(
+        self, victor_id: str, loser_id: str
+    ) -> tuple[str, bool, int | None]:
+        """Run the LLM fallback off the request thread.
+
+        A request for a pair that is already being generated waits on that
+        generation. Otherwise it needs a free fallback slot and a rate-limit
+        token; without either it returns a degraded message with a retry
+        hint at once. Waits at most ``LLM_TIMEOUT`` seconds. A generation
+        that timed out keeps running and lands in the explanation cache, so
+        the retry is usually a cache hit.
+        """
+        if not self._llm_service:
+            metrics.LLM_FALLBACKS.inc("unconfigured")
+            return "LLM service not configured.", False, None
+        cached = self.cached_explanation(victor_id, loser_id)
+        if cached is not None:
+            metrics.LLM_FALLBACKS.inc("cached")
+            return cached, True, None
+
+        pair = (victor_id, loser_id)
+        leader = False
+        with self._llm_inflight_lock:
+            future = self._llm_inflight.get(pair)
+            if future is not None:
+                metrics.LLM_FALLBACKS.inc("coalesced")
+            elif not self._llm_slots.acquire(blocking=False):
+                metrics.LLM_FALLBACKS.inc("busy")
+                return LLM_BUSY_MESSAGE, False, LLM_RETRY_AFTER
+            elif self._llm_rate is not None and not self._llm_rate.try_acquire():
+                self._llm_slots.release()
+                metrics.LLM_FALLBACKS.inc("rate_limited")
+                retry_after = max(1, math.ceil(self._llm_rate.wait_time()))
+                return LLM_BUSY_MESSAGE, False, retry_after
+            else:
+                try:
+                    future = self._llm_executor.submit(
+                        self.fallback_to_llm, victor_id, loser_id
+                    )
+                except RuntimeError:
+                    # Closed after a reload swapped in a new graph
+                    self._llm_slots.release()
+                    metrics.LLM_FALLBACKS.inc("busy")
+                    return LLM_BUSY_MESSAGE, False, LLM_RETRY_AFTER
+                self._llm_inflight[pair] = future
+                leader = True
+        if leader:
+            # Outside the lock: a finished future runs the callback right here
+            future.add_done_callback(lambda f: self._llm_finished(pair, f))
+        try:
+            msg, success = future.result(timeout=Config.LLM_TIMEOUT)
+        except FutureTimeout:
+            metrics.LLM_FALLBACKS.inc("timeout")
+            return LLM_TIMEOUT_MESSAGE, False, LLM_RETRY_AFTER
+        return msg, success, None
+
+    def _llm_finished(self, pair: tuple[str, str], future: Future) -> None:
+        with self._llm_inflight_lock:
+            if self._llm_inflight.get(pair) is future:
+                del self._llm_inflight[pair]
+        self._llm_slots.release()
 
-        return PathResult(path_names, edges)
+    def fallback_to_llm(
+        self, victor_id: str, loser_id: str, pin: bool = False
+    ) -> tuple[str, bool]:
+        """Generate a fallback explanation using the LLM service.
 
-    def fallback_to_llm(self, victor_id: int, loser_id: int) -> tuple[str, bool]:
-        """Generate a fallback explanation using the LLM service."""
+        ``pin`` stores the result outside the cache's TTL and size limits.
+        """
         if not self._llm_service:
             return "LLM service not configured.", False
         try:
-            # Supply team names along with mascots
-            victor = self._id_to_name[victor_id] + " " + self._id_to_mascot[victor_id]
-            loser = self._id_to_name[loser_id] + " " + self._id_to_mascot[loser_id]
-            return self._llm_service.generate_response(victor, loser), True
+            victor, loser, key = self._explanation_key(victor_id, loser_id)
+            text = self._llm_cache.get(*key) if self._llm_cache is not None else None
+            if text is None:
+                start = time.perf_counter()
+                try:
+                    text = self._llm_service.generate_response(victor, loser)
+                finally:
+                    metrics.PATH_STAGE_SECONDS.observe(
+                        time.perf_counter() - start, "llm"
+                    )
+                if self._llm_cache is not None and text:
+                    self._llm_cache.put(*key, text, pinned=pin)
+                metrics.LLM_FALLBACKS.inc("generated")
+            else:
+                metrics.LLM_FALLBACKS.inc("cached")
+            return text, True
         except Exception as e:
+            metrics.LLM_FALLBACKS.inc("error")
             return f"Error generating LLM response: {str(e)}", False
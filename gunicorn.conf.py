@@ -0,0 +1,71 @@
+"""Gunicorn settings, picked up automatically by ``gunicorn app:app``.
+
+Threaded workers let fast path queries proceed while another thread in the
+same worker waits on an LLM fallback. The fallback itself is capped per
+worker by LLM_MAX_CONCURRENCY and LLM_TIMEOUT (see config.py).
+
+With GUNICORN_PRELOAD=1 the master imports the app and loads the graph
+once, then forks the workers, which share those pages copy-on-write
+instead of each importing and loading their own copy.
+
+The app does not import google.genai at load, so a worker starts serving
+sooner; once it is up it imports genai and builds the Gemini client in the
+background (LLM_WARMUP). qed_worker_boot_seconds records both stages.
+"""
+
+import gc
+import os
+import time
+from pathlib import Path
+
+worker_class = "gthread"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+timeout = 30
+preload_app = os.getenv("GUNICORN_PRELOAD", "0") == "1"
+
+if preload_app:
+    # No collections in the master while the app loads, so freed objects do
+    # not leave holes in pages the workers will share
+    gc.disable()
+
+
+def pre_fork(server, worker):
+    if not server.cfg.preload_app:
+        return
+    from config import Config
+
+    # Lazy indexes built now are shared; built in a worker they are private
+    graph_reloader = server.app.wsgi().extensions["graph_reloader"]
+    graph_reloader.service.build_indexes()
+    if Config.LLM_WARMUP and Config.GEMINI_API_KEY:
+        # Imported once here, its modules are shared by every worker too
+        import google.genai
+        import google.genai.types  # noqa: F401
+    # Move everything to the permanent generation: the workers' collector
+    # then never writes to these objects' headers and unshares their pages.
+    # Later collections, in the master and in workers forked from it, skip
+    # frozen objects, so collection can resume
+    gc.freeze()
+    gc.enable()
+
+
+def post_fork(server, worker):
+    worker.forked_at = time.perf_counter()
+
+
+def post_worker_init(worker):
+    import metrics
+    from config import Config
+
+    metrics.WORKER_BOOT_SECONDS.observe(time.perf_counter() - worker.forked_at, "app")
+    if Config.LLM_WARMUP:
+        worker.wsgi.extensions["graph_reloader"].service.warm_up()
+
+
+def on_starting(server):
+    # Files left by a previous run would otherwise add to the new totals
+    metrics_dir = os.getenv("METRICS_DIR")
+    if metrics_dir:
+        for path in Path(metrics_dir).glob("metrics-*.bin"):
+            path.unlink()
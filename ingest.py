@@ -0,0 +1,464 @@
+"""Incremental ingestion of CFBD game results into the graph artifacts.
+
+Replaces the full rebuild in ``data/get_games.ipynb``. Raw API responses
+are cached on disk per season, season type and week; a week is only
+fetched again while some of its games are unfinished, so a weekly run
+touches the network for the current week, the team list and the records.
+
+Every game applied to the graph is kept in a compact ledger
+(``data/cfbd/state.json``). A run applies only games missing from the
+ledger, as an edge delta on the existing graph. When the season rolls over
+(or the team count changes, which rescales every weight) the graph is
+rebuilt from the ledger instead, with recomputed weights and labels. The
+graph is a ``MultiDiGraph`` with one edge per game, so rematches and games
+from earlier seasons are kept next to the latest result; the snapshot
+searches the lightest game per pair. The graph, teams, snapshot and
+rankings files are each replaced atomically.
+
+    python ingest.py [--season 2025] [--seasons 6] [--refresh] [--dry-run]
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import logging
+import pickle
+import sys
+import urllib.error
+import urllib.parse
+import urllib.request
+from pathlib import Path
+from typing import Any
+
+import networkx as nx
+
+from atomic_file import atomic_open, atomic_write
+from rankings import Rankings
+from snapshot import build_snapshot
+
+logger = logging.getLogger(__name__)
+
+API_URL = "https://api.collegefootballdata.com"
+# Ledger layout version; older states trigger a rebuild. Version 2 keeps
+# every game per pair in the graph rather than only the latest; version 3
+# records each game's season and week on its edge.
+STATE_VERSION = 3
+# Order of season types within a season
+SEASON_TYPES = ("regular", "postseason")
+# Week ordinals of later season types start at multiples of this
+WEEKS_PER_SEASON_TYPE = 100
+
+
+class IngestError(Exception):
+    """Raised when the CFBD API or the local artifacts cannot be used."""
+
+
+class CFBDClient:
+    """Minimal CollegeFootballData REST client with an on-disk cache.
+
+    Responses are stored as JSON under ``cache_dir``. Callers decide per
+    request whether a cached copy may be reused.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = API_URL,
+        cache_dir: Path | None = None,
+        timeout: float = 30,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.timeout = timeout
+        self.requests = 0
+
+    def _fetch(self, endpoint: str, params: dict[str, Any]) -> Any:
+        url = f"{self.base_url}/{endpoint}?{urllib.parse.urlencode(params)}"
+        request = urllib.request.Request(
+            url, headers={"Authorization": f"Bearer {self.api_key}"}
+        )
+        self.requests += 1
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as rsp:
+                return json.load(rsp)
+        except (urllib.error.URLError, ValueError) as e:
+            raise IngestError(f"GET {endpoint} {params} failed: {e}") from e
+
+    def get(
+        self,
+        endpoint: str,
+        params: dict[str, Any],
+        cache_name: str | None = None,
+        reuse=lambda data: True,
+    ) -> Any:
+        """Fetch ``endpoint``, reusing the cached copy when ``reuse`` accepts it."""
+        path = None
+        if self.cache_dir is not None and cache_name is not None:
+            path = self.cache_dir / cache_name
+            if path.exists():
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+                if reuse(data):
+                    return data
+        data = self._fetch(endpoint, params)
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write(path, json.dumps(data).encode("utf-8"))
+        return data
+
+    def calendar(self, year: int, refresh: bool = False) -> list[dict]:
+        return self.get(
+            "calendar",
+            {"year": year},
+            f"{year}/calendar.json",
+            reuse=lambda data: not refresh,
+        )
+
+    def games(self, year: int, week: int, season_type: str) -> list[dict]:
+        # Finished weeks never change; weeks with pending games are refetched
+        return self.get(
+            "games",
+            {"year": year, "week": week, "seasonType": season_type},
+            f"{year}/games-{season_type}-{week:02d}.json",
+            reuse=lambda data: bool(data) and all(g.get("completed") for g in data),
+        )
+
+    def teams(self, year: int, refresh: bool = False) -> list[dict]:
+        return self.get(
+            "teams", {"year": year}, f"{year}/teams.json", reuse=lambda _: not refresh
+        )
+
+    def records(self, year: int) -> list[dict]:
+        # Records change every week; cached only as a copy of the last run
+        return self.get(
+            "records", {"year": year}, f"{year}/records.json", reuse=lambda _: False
+        )
+
+
+def current_season(today: datetime.date | None = None) -> int:
+    """Season in progress (or last finished) on ``today``; seasons start in August."""
+    today = today or datetime.date.today()
+    return today.year if today.month >= 8 else today.year - 1
+
+
+def generate_weight(year: int, max_year: int, num_teams: int) -> int:
+    """Edge weight making any path of newer games beat one using older games.
+
+    ``num_teams`` bounds the number of edges on a shortest path, so one
+    step back a season always costs more than any number of newer edges.
+    """
+    return num_teams * (max_year - year) + 1
+
+
+def parse_game(data: dict) -> dict | None:
+    """Reduce a CFBD game to its result, or None when it has no winner yet."""
+    if not data.get("completed", True):
+        # Scores of a game in progress are partial; once in the ledger the
+        # game would never be read again
+        return None
+    home_score, away_score = data.get("homePoints"), data.get("awayPoints")
+    # A shutout is a result; only missing scores and ties are skipped
+    if home_score is None or away_score is None or home_score == away_score:
+        return None
+    home, away = data["homeTeam"], data["awayTeam"]
+    winner, loser = (home, away) if home_score > away_score else (away, home)
+    return {
+        "id": data["id"],
+        "winner": winner,
+        "loser": loser,
+        "year": data["season"],
+        "season_type": data.get("seasonType", "regular"),
+        "week": data.get("week") or 0,
+        "start": data.get("startDate") or "",
+    }
+
+
+def _type_rank(season_type: str) -> int:
+    if season_type in SEASON_TYPES:
+        return SEASON_TYPES.index(season_type)
+    return len(SEASON_TYPES)
+
+
+def game_order(game: dict) -> tuple:
+    """Chronological sort key for games, and for a pair's edges in the graph."""
+    type_rank = _type_rank(game["season_type"])
+    return (game["year"], type_rank, game["week"], game["start"], game["id"])
+
+
+def week_ordinal(game: dict) -> int:
+    """Week within the season, counting postseason weeks after regular ones."""
+    return _type_rank(game["season_type"]) * WEEKS_PER_SEASON_TYPE + game["week"]
+
+
+def merge_teams(
+    teams: list[dict], team_data: list[dict], record_data: list[dict]
+) -> list[dict]:
+    """Update ``teams`` from the API, keeping every existing team's id.
+
+    Schools new to the API are appended with the next id. Schools that
+    disappeared keep their node so older games still resolve. Win/loss
+    records are refreshed for the current season only.
+    """
+    teams = [dict(team) for team in teams]
+    by_name = {team["name"]: team for team in teams}
+    for data in team_data:
+        team = by_name.get(data["school"])
+        if team is None:
+            team = {"id": len(teams), "name": data["school"]}
+            teams.append(team)
+            by_name[team["name"]] = team
+        team["mascot"] = data.get("mascot")
+        logos = data.get("logos")
+        team["logo"] = logos[0] if logos else None
+
+    records = {record["team"]: record["total"] for record in record_data}
+    for team in teams:
+        total = records.get(team["name"])
+        if total is None:
+            team.pop("wins", None)
+            team.pop("losses", None)
+        else:
+            team["wins"], team["losses"] = total["wins"], total["losses"]
+    return teams
+
+
+def _edge_attrs(game: dict, season: int, names: list[str], num_teams: int) -> dict:
+    label = f"{names[game['winner_id']]} def. {names[game['loser_id']]}"
+    if game["year"] != season:
+        label += f" ({game['year']})"
+    return {
+        "label": label,
+        "weight": generate_weight(game["year"], season, num_teams),
+        "season": game["year"],
+        "week": week_ordinal(game),
+    }
+
+
+def build_graph(teams: list[dict], games: list[dict], season: int) -> nx.MultiDiGraph:
+    """Build the victory graph from scratch, with one edge per game.
+
+    ``games`` are ledger entries with ``winner_id``/``loser_id``. The
+    notebook's ``DiGraph`` kept only the last game written per pair; here
+    every game is added, in chronological order.
+    """
+    names = [team["name"] for team in teams]
+    graph = nx.MultiDiGraph()
+    graph.add_nodes_from((str(team["id"]), {"label": team["name"]}) for team in teams)
+    for game in sorted(games, key=game_order):
+        attrs = _edge_attrs(game, season, names, len(teams))
+        graph.add_edge(str(game["winner_id"]), str(game["loser_id"]), **attrs)
+    return graph
+
+
+def apply_delta(
+    graph: nx.MultiDiGraph,
+    teams: list[dict],
+    ledger: list[dict],
+    new_games: list[dict],
+    season: int,
+) -> dict[str, int]:
+    """Add ``new_games`` to ``graph`` in place; return added/updated edge counts.
+
+    The games of each touched pair are rewritten from ``ledger`` plus the
+    new ones in chronological order, so a late-arriving result from an
+    earlier week lands where a rebuild would put it.
+    """
+    names = [team["name"] for team in teams]
+    by_pair: dict[tuple[int, int], list[dict]] = {}
+    for game in new_games:
+        by_pair.setdefault((game["winner_id"], game["loser_id"]), []).append(game)
+    for game in ledger:
+        pair = (game["winner_id"], game["loser_id"])
+        if pair in by_pair:
+            by_pair[pair].append(game)
+
+    counts = {"edges_added": 0, "edges_updated": 0}
+    for (winner, loser), games in by_pair.items():
+        u, v = str(winner), str(loser)
+        counts["edges_updated" if graph.has_edge(u, v) else "edges_added"] += 1
+        while graph.has_edge(u, v):
+            graph.remove_edge(u, v)
+        for game in sorted(games, key=game_order):
+            graph.add_edge(u, v, **_edge_attrs(game, season, names, len(teams)))
+    return counts
+
+
+def load_state(path: Path) -> dict | None:
+    if not Path(path).exists():
+        return None
+    with open(path, encoding="utf-8") as f:
+        state = json.load(f)
+    if state.get("version") != STATE_VERSION:
+        return None
+    return state
+
+
+def write_artifacts(
+    graph: nx.MultiDiGraph,
+    teams: list[dict],
+    graph_path: Path,
+    teams_path: Path,
+    snapshot_path: Path | None,
+    rankings_path: Path | None = None,
+) -> None:
+    """Replace the teams pickle, GEXF graph, snapshot and rankings, each atomically.
+
+    Rankings are computed from the snapshot, so need ``snapshot_path``.
+    """
+    atomic_write(Path(teams_path), pickle.dumps(teams))
+    with atomic_open(Path(graph_path)) as f:
+        nx.write_gexf(graph, f)
+    if snapshot_path is not None:
+        snapshot = build_snapshot(graph_path, teams_path, snapshot_path)
+        if rankings_path is not None:
+            Rankings.compute(snapshot).write(rankings_path)
+
+
+def _load_graph(graph_path: Path) -> nx.MultiDiGraph:
+    # read_gexf returns a DiGraph when no pair has several games yet
+    graph = nx.MultiDiGraph(nx.read_gexf(graph_path))
+    # GEXF stores weights as floats and assigns edge ids on write
+    for _, _, data in graph.edges(data=True):
+        data.pop("id", None)
+        data["weight"] = int(data["weight"])
+    return graph
+
+
+def ingest(
+    client: CFBDClient,
+    state_path: Path,
+    graph_path: Path,
+    teams_path: Path,
+    snapshot_path: Path | None = None,
+    rankings_path: Path | None = None,
+    season: int | None = None,
+    num_seasons: int = 6,
+    refresh: bool = False,
+    dry_run: bool = False,
+) -> dict[str, Any]:
+    """Bring the artifacts up to date with the API; return a summary.
+
+    ``refresh`` refetches the calendar and team list, which otherwise are
+    cached per season.
+    """
+    season = season if season is not None else current_season()
+    years = list(range(season - num_seasons + 1, season + 1))
+    state = load_state(state_path)
+
+    # Existing ids are kept even on a rebuild: cached explanations use them
+    old_teams: list[dict] = []
+    if Path(teams_path).exists():
+        with open(teams_path, "rb") as f:
+            old_teams = pickle.load(f)
+    teams = merge_teams(
+        old_teams, client.teams(season, refresh), client.records(season)
+    )
+    team_idx = {team["name"]: team["id"] for team in teams}
+
+    ledger = state["games"] if state is not None else []
+    ledger = [game for game in ledger if game["year"] in years]
+    seen = {game["id"] for game in ledger}
+
+    new_games, unknown = [], set()
+    for year in years:
+        weeks = client.calendar(year, refresh=refresh and year == season)
+        for week in weeks:
+            season_type = week.get("seasonType", "regular")
+            for data in client.games(year, week["week"], season_type):
+                if data["id"] in seen:
+                    continue
+                game = parse_game(data)
+                if game is None:
+                    continue
+                winner, loser = (
+                    team_idx.get(game["winner"]),
+                    team_idx.get(game["loser"]),
+                )
+                if winner is None or loser is None:
+                    # Same as the notebook: teams missing from /teams are dropped
+                    unknown.update(
+                        name
+                        for name in (game["winner"], game["loser"])
+                        if name not in team_idx
+                    )
+                    continue
+                game["winner_id"], game["loser_id"] = winner, loser
+                del game["winner"], game["loser"]
+                seen.add(game["id"])
+                new_games.append(game)
+
+    rebuild = (
+        state is None
+        or state["season"] != season
+        or state["seasons"] != num_seasons
+        or state["num_teams"] != len(teams)
+        or not old_teams
+        or not Path(graph_path).exists()
+    )
+    summary: dict[str, Any] = {
+        "season": season,
+        "new_games": len(new_games),
+        "rebuilt": rebuild,
+        "unknown_teams": len(unknown),
+        "requests": client.requests,
+    }
+    if rebuild:
+        graph = build_graph(teams, ledger + new_games, season)
+    else:
+        graph = _load_graph(graph_path)
+        summary.update(apply_delta(graph, teams, ledger, new_games, season))
+    summary["edges"] = sum(len(nbrs) for _, nbrs in graph.adjacency())
+    summary["games"] = graph.number_of_edges()
+    if dry_run or not (rebuild or new_games or teams != old_teams):
+        return summary
+
+    write_artifacts(graph, teams, graph_path, teams_path, snapshot_path, rankings_path)
+    state = {
+        "version": STATE_VERSION,
+        "season": season,
+        "seasons": num_seasons,
+        "num_teams": len(teams),
+        "games": sorted(ledger + new_games, key=game_order),
+    }
+    atomic_write(Path(state_path), json.dumps(state).encode("utf-8"))
+    return summary
+
+
+def main(argv: list[str] | None = None) -> None:
+    from config import Config
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--season", type=int, help="latest season (default: current)")
+    parser.add_argument("--seasons", type=int, default=6, help="seasons in the graph")
+    parser.add_argument(
+        "--refresh", action="store_true", help="refetch the calendar and team list"
+    )
+    parser.add_argument("--dry-run", action="store_true", help="do not write files")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if not Config.CFB_API_KEY:
+        sys.exit("CFB_API_KEY must be set")
+    client = CFBDClient(
+        Config.CFB_API_KEY, Config.CFBD_BASE_URL, Config.INGEST_DIR / "responses"
+    )
+    summary = ingest(
+        client,
+        Config.INGEST_DIR / "state.json",
+        Config.GRAPH_PATH,
+        Config.TEAMS_PATH,
+        Config.SNAPSHOT_PATH,
+        Config.RANKINGS_PATH,
+        season=args.season,
+        num_seasons=args.seasons,
+        refresh=args.refresh,
+        dry_run=args.dry_run,
+    )
+    print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""K shortest loopless paths (Yen's algorithm) over the snapshot's CSR arrays.
+
+Each of Yen's spur searches is an A* search guided by the exact distance
+to the target, taken from a single reverse Dijkstra run before the first
+path. Spur searches only remove edges and nodes, so those distances stay
+admissible lower bounds. A spur search also stops early: as soon as it
+settles a node whose reverse-tree route to the target avoids everything
+removed, that route is the cheapest completion and is spliced on without
+searching further.
+
+Callers pass per-edge ``weights`` (``inf`` drops an edge) and ``blocked``
+nodes to filter the graph, plus an optional ``deadline`` on the
+``time.perf_counter`` clock after which the search returns the paths
+found so far.
+"""
+
+from __future__ import annotations
+
+import time
+from heapq import heappop, heappush
+from itertools import count
+from typing import Sequence
+
+from path_engine import reverse_csr
+from snapshot import GraphSnapshot
+
+_INF = float("inf")
+
+
+class KShortestPaths:
+    """Yen's k shortest loopless paths with A* spur searches.
+
+    The reverse adjacency is built once per snapshot and shared by every
+    query.
+    """
+
+    def __init__(self, snapshot: GraphSnapshot):
+        self.snapshot = snapshot
+        # rev_offsets[v]:rev_offsets[v + 1] index rev_edges, the edges into v
+        self._rev_offsets, self._rev_edges, self._sources = reverse_csr(snapshot)
+
+    def _reverse_tree(
+        self, dst: int, weights: Sequence[float], blocked: bytearray
+    ) -> tuple[list[float], list[int]]:
+        """Distance to ``dst`` per node, and the first edge of that route."""
+        n = self.snapshot.num_nodes
+        dist = [_INF] * n
+        next_edge = [-1] * n
+        done = bytearray(n)
+        rev_offsets, rev_edges = self._rev_offsets, self._rev_edges
+        sources = self._sources
+        dist[dst] = 0.0
+        counter = count(1)
+        heap = [(0.0, 0, dst)]
+        while heap:
+            d, _, v = heappop(heap)
+            if done[v]:
+                continue
+            done[v] = 1
+            for i in range(rev_offsets[v], rev_offsets[v + 1]):
+                e = rev_edges[i]
+                u = sources[e]
+                if done[u] or blocked[u]:
+                    continue
+                nd = d + weights[e]
+                if nd < dist[u]:
+                    dist[u] = nd
+                    next_edge[u] = e
+                    heappush(heap, (nd, next(counter), u))
+        return dist, next_edge
+
+    def search(
+        self,
+        src: int,
+        dst: int,
+        k: int,
+        weights: Sequence[float] | None = None,
+        blocked: Sequence[int] = (),
+        deadline: float | None = None,
+    ) -> tuple[list[tuple[list[int], float]], bool]:
+        """Return up to ``k`` (nodes, cost) paths, cheapest first, and whether
+        the search finished before ``deadline``.
+        """
+        snap = self.snapshot
+        weights = snap.weights if weights is None else weights
+        blocked_mask = bytearray(snap.num_nodes)
+        for v in blocked:
+            blocked_mask[v] = 1
+        if blocked_mask[src] or blocked_mask[dst] or src == dst:
+            return [], True
+
+        h, next_edge = self._reverse_tree(dst, weights, blocked_mask)
+        if h[src] == _INF:
+            return [], True
+        targets = snap.targets
+
+        # Paths are kept as edge index lists; the first follows the tree
+        first = []
+        v = src
+        while v != dst:
+            first.append(next_edge[v])
+            v = targets[next_edge[v]]
+        found = [(first, h[src])]
+        candidates: list[tuple[float, int, list[int]]] = []
+        seen = {tuple(first)}
+        tiebreak = count()
+
+        while len(found) < k:
+            prev_edges, _ = found[-1]
+            prev_nodes = [src] + [targets[e] for e in prev_edges]
+            root_cost = 0.0
+            for i in range(len(prev_edges)):
+                if deadline is not None and time.perf_counter() > deadline:
+                    return self._with_nodes(src, found), False
+                spur = prev_nodes[i]
+                root = prev_edges[:i]
+                # Edges leaving the spur node along any found path sharing this root
+                removed_edges = {
+                    edges[i]
+                    for edges, _ in found
+                    if len(edges) > i and edges[:i] == root
+                }
+                removed_nodes = set(prev_nodes[:i])
+                spur_path = self._spur(
+                    spur, dst, weights, blocked_mask, h, next_edge,
+                    removed_edges, removed_nodes,
+                )  # fmt: skip
+                if spur_path is not None:
+                    edges, cost = spur_path
+                    total = root + edges
+                    key = tuple(total)
+                    if key not in seen:
+                        seen.add(key)
+                        heappush(candidates, (root_cost + cost, next(tiebreak), total))
+                root_cost += weights[prev_edges[i]]
+            if not candidates:
+                break
+            cost, _, edges = heappop(candidates)
+            found.append((edges, cost))
+        return self._with_nodes(src, found), True
+
+    def _spur(
+        self,
+        spur: int,
+        dst: int,
+        weights: Sequence[float],
+        blocked: bytearray,
+        h: list[float],
+        next_edge: list[int],
+        removed_edges: set[int],
+        removed_nodes: set[int],
+    ) -> tuple[list[int], float] | None:
+        """Cheapest spur -> dst route avoiding the removed edges and nodes."""
+        offsets, targets = self.snapshot.offsets, self.snapshot.targets
+        sources = self._sources
+        g = {spur: 0.0}
+        parent_edge: dict[int, int] = {}
+        done: set[int] = set()
+        counter = count(1)
+        heap = [(h[spur], 0, spur)]
+        while heap:
+            _, _, v = heappop(heap)
+            if v in done:
+                continue
+            done.add(v)
+            tail = self._tree_route(v, dst, next_edge, removed_edges, removed_nodes)
+            if tail is not None:
+                cost = g[v] + h[v]
+                head = []
+                while v != spur:
+                    head.append(parent_edge[v])
+                    v = sources[head[-1]]
+                head.reverse()
+                return head + tail, cost
+            gv = g[v]
+            for e in range(offsets[v], offsets[v + 1]):
+                if e in removed_edges:
+                    continue
+                u = targets[e]
+                if u in done or u in removed_nodes or blocked[u] or h[u] == _INF:
+                    continue
+                nd = gv + weights[e]
+                if nd < g.get(u, _INF):
+                    g[u] = nd
+                    parent_edge[u] = e
+                    heappush(heap, (nd + h[u], next(counter), u))
+        return None
+
+    def _tree_route(
+        self,
+        v: int,
+        dst: int,
+        next_edge: list[int],
+        removed_edges: set[int],
+        removed_nodes: set[int],
+    ) -> list[int] | None:
+        """The reverse-tree route v -> dst, or None if it uses anything removed."""
+        targets = self.snapshot.targets
+        edges = []
+        while v != dst:
+            e = next_edge[v]
+            if e in removed_edges:
+                return None
+            v = targets[e]
+            if v in removed_nodes:
+                return None
+            edges.append(e)
+        return edges
+
+    def _with_nodes(
+        self, src: int, found: list[tuple[list[int], float]]
+    ) -> list[tuple[list[int], float]]:
+        targets = self.snapshot.targets
+        return [([src] + [targets[e] for e in edges], cost) for edges, cost in found]
@@ -0,0 +1,173 @@
+"""Persistent on-disk cache of LLM mascot explanations.
+
+Explanations are stored in SQLite keyed by (victor id, loser id, model,
+prompt hash). The prompt hash covers the system prompt and the rendered
+user prompt, so changing ``LLMService.model`` or ``system_prompt`` (or a
+team's mascot) produces new keys and old entries are never served again;
+they age out through the TTL and size limits. Pinned entries, written by
+the offline pre-generation job (pregenerate.py), are exempt from both.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Bump when the table layout changes; older databases are rebuilt
+_SCHEMA_VERSION = 2
+_SCHEMA = (
+    "DROP TABLE IF EXISTS explanations",
+    """CREATE TABLE explanations (
+        victor_id TEXT NOT NULL,
+        loser_id TEXT NOT NULL,
+        model TEXT NOT NULL,
+        prompt_hash TEXT NOT NULL,
+        text TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        accessed_at REAL NOT NULL,
+        pinned INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (victor_id, loser_id, model, prompt_hash)
+    )""",
+    "CREATE INDEX explanations_accessed ON explanations (accessed_at)",
+    f"PRAGMA user_version = {_SCHEMA_VERSION}",
+)
+
+
+def prompt_hash(model: str, system_prompt: str, prompt: str) -> str:
+    """Hash everything that determines the generated text besides the teams."""
+    digest = hashlib.sha256()
+    for part in (model, system_prompt, prompt):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ExplanationCache:
+    """SQLite-backed explanation store with TTL and size limits.
+
+    ``ttl`` is in seconds; 0 keeps entries until they are evicted by
+    ``max_entries``, which drops the least recently read entries first.
+    Cache failures are logged and treated as misses so they never break
+    the fallback itself.
+    """
+
+    def __init__(self, path: Path, ttl: float = 0, max_entries: int = 0):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._pid: int | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        # Connections must not be shared across forked gunicorn workers
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Serialize schema setup between workers opening a fresh file
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                (version,) = conn.execute("PRAGMA user_version").fetchone()
+                if version != _SCHEMA_VERSION:
+                    for statement in _SCHEMA:
+                        conn.execute(statement)
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def get(
+        self, victor_id: str, loser_id: str, model: str, prompt_digest: str
+    ) -> str | None:
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT text, created_at, pinned FROM explanations "
+                    "WHERE victor_id = ? AND loser_id = ? AND model = ? "
+                    "AND prompt_hash = ?",
+                    (victor_id, loser_id, model, prompt_digest),
+                ).fetchone()
+                if row is None:
+                    return None
+                text, created_at, pinned = row
+                if self.ttl and not pinned and now - created_at > self.ttl:
+                    return None
+                with conn:
+                    conn.execute(
+                        "UPDATE explanations SET accessed_at = ? "
+                        "WHERE victor_id = ? AND loser_id = ? AND model = ? "
+                        "AND prompt_hash = ?",
+                        (now, victor_id, loser_id, model, prompt_digest),
+                    )
+                return text
+        except sqlite3.Error as e:
+            logger.warning("Explanation cache read failed: %s", e)
+            return None
+
+    def put(
+        self,
+        victor_id: str,
+        loser_id: str,
+        model: str,
+        prompt_digest: str,
+        text: str,
+        pinned: bool = False,
+    ) -> None:
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO explanations "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            victor_id,
+                            loser_id,
+                            model,
+                            prompt_digest,
+                            text,
+                            now,
+                            now,
+                            int(pinned),
+                        ),
+                    )
+                    self._prune(conn, now)
+        except sqlite3.Error as e:
+            logger.warning("Explanation cache write failed: %s", e)
+
+    def _prune(self, conn: sqlite3.Connection, now: float) -> None:
+        if self.ttl:
+            conn.execute(
+                "DELETE FROM explanations WHERE NOT pinned AND created_at < ?",
+                (now - self.ttl,),
+            )
+        if self.max_entries:
+            conn.execute(
+                "DELETE FROM explanations WHERE rowid IN ("
+                "SELECT rowid FROM explanations WHERE NOT pinned "
+                "ORDER BY accessed_at DESC "
+                "LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return (
+                self._connect()
+                .execute("SELECT COUNT(*) FROM explanations")
+                .fetchone()[0]
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
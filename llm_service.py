@@ -1,12 +1,37 @@
-from google import genai
-from google.genai import types
+"""Gemini client wrapper for the fallback explanations.
+
+``google.genai`` takes about half a second to import, longer than loading
+the graph, and most requests never need it. It is imported, and the client
+built, on first use or by :meth:`LLMService.warm_up`, which workers run in
+the background once they are serving.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+
+from llm_cache import prompt_hash
+
+if TYPE_CHECKING:
+    from google import genai
 
 
 class LLMService:
     """Service to interact with the LLM for generating responses."""
 
-    def __init__(self, api_key: str):
-        self.client = genai.Client(api_key=api_key)
+    def __init__(
+        self,
+        api_key: str,
+        client: genai.Client | None = None,
+        timeout: float | None = None,
+        base_url: str | None = None,
+    ):
+        self._api_key = api_key
+        self._timeout = timeout
+        self._base_url = base_url
+        self._client = client
+        self._client_lock = threading.Lock()
         self.model = "gemini-2.5-flash-lite"
         self.system_prompt = (
             "You are an expert college football analyst in a parallel universe where games are decided by competitions between the teams' mascots. "
@@ -16,10 +41,42 @@ class LLMService:
             "Given two college football teams, provide a prediction as to why one team would defeat the other in under 150 words"
         )
 
-    def generate_response(self, victor: str, loser: str) -> str:
-        prompt = (
-            f"Explain why {victor} would defeat {loser} in a college football game."
+    @property
+    def client(self) -> genai.Client:
+        """The genai client, imported and built on first use."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    from google import genai
+                    from google.genai import types
+
+                    # timeout bounds each HTTP call; base_url allows a local stub
+                    http_options = types.HttpOptions(
+                        timeout=int(self._timeout * 1000) if self._timeout else None,
+                        base_url=self._base_url or None,
+                    )
+                    self._client = genai.Client(
+                        api_key=self._api_key, http_options=http_options
+                    )
+        return self._client
+
+    def warm_up(self) -> None:
+        """Import genai and build the client now instead of on the first call."""
+        self.client
+
+    def build_prompt(self, victor: str, loser: str) -> str:
+        return f"Explain why {victor} would defeat {loser} in a college football game."
+
+    def prompt_hash(self, victor: str, loser: str) -> str:
+        """Fingerprint of the model and prompts, used as an explanation cache key."""
+        return prompt_hash(
+            self.model, self.system_prompt, self.build_prompt(victor, loser)
         )
+
+    def generate_response(self, victor: str, loser: str) -> str:
+        from google.genai import types
+
+        prompt = self.build_prompt(victor, loser)
         rsp = self.client.models.generate_content(
             model=self.model,
             config=types.GenerateContentConfig(
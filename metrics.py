@@ -0,0 +1,295 @@
+"""Prometheus-style counters and histograms, rendered at ``/metrics``.
+
+Every series (name plus label values) is declared before it is used, and
+new series are only ever appended, so a process's values are a flat array
+of doubles whose layout is the same in every worker running the same
+code. With METRICS_DIR set that array is a memory-mapped file per process
+and ``render`` sums the files of every worker, so a scrape that lands on
+any gunicorn worker sees the whole server; files of workers that have
+exited keep counting, so totals never go backwards. Without it each
+process reports only its own values.
+"""
+
+from __future__ import annotations
+
+import itertools
+import mmap
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Sequence
+
+from config import Config
+
+# Seconds; covers a cached hit (microseconds) up to a slow LLM call
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)  # fmt: skip
+
+
+class Registry:
+    """Owns the value array behind every declared series."""
+
+    def __init__(self, directory: str | Path | None = None, enabled: bool = True):
+        self.directory = Path(directory) if directory else None
+        self.enabled = enabled
+        self._metrics: list[_Metric] = []
+        self._size = 0
+        self._lock = threading.Lock()
+        self._values: array | memoryview | None = None
+        self._mmap: mmap.mmap | None = None
+        if hasattr(os, "register_at_fork"):
+            # A forked worker starts its own file instead of the parent's
+            os.register_at_fork(after_in_child=self._forget)
+
+    def _forget(self) -> None:
+        self._lock = threading.Lock()
+        self._values = self._mmap = None
+
+    def _allocate(self, slots: int) -> int:
+        with self._lock:
+            offset = self._size
+            self._size += slots
+            if self._values is not None:
+                self._open()
+            return offset
+
+    def _open(self) -> None:
+        """Size the value array to every declared slot, keeping the values."""
+        if self.directory is None:
+            if self._values is None:
+                self._values = array("d")
+            self._values.extend(itertools.repeat(0.0, self._size - len(self._values)))
+            return
+        if self._mmap is not None:
+            self._values.release()
+            self._mmap.close()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"metrics-{os.getpid()}.bin"
+        with open(path, "a+b") as f:
+            f.truncate(max(8 * self._size, 8))
+            self._mmap = mmap.mmap(f.fileno(), 0)
+        self._values = memoryview(self._mmap).cast("d")
+
+    def add(self, slot: int, amount: float) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._values is None:
+                self._open()
+            self._values[slot] += amount
+
+    def snapshot(self) -> list[float]:
+        """Values of this process, or summed over every process sharing the directory."""
+        with self._lock:
+            if self._values is None:
+                self._open()
+            if self.directory is None:
+                return list(self._values)
+            totals = [0.0] * self._size
+            for path in self.directory.glob("metrics-*.bin"):
+                values = array("d", path.read_bytes())
+                for i, value in enumerate(values[: self._size]):
+                    totals[i] += value
+            return totals
+
+    def counter(
+        self, name: str, help: str, labels: dict[str, Sequence[str]] | None = None
+    ) -> Counter:
+        return self._declare(Counter, name, help, labels)
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labels: dict[str, Sequence[str]] | None = None,
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._declare(Histogram, name, help, labels, tuple(buckets))
+
+    def _declare(self, cls, name, help, labels, *args):
+        for metric in self._metrics:
+            if metric.name == name:
+                # Declaring the same series again (a second create_app) is fine
+                wanted = {key: tuple(values) for key, values in (labels or {}).items()}
+                if type(metric) is not cls or metric.labels != wanted:
+                    raise ValueError(f"metric {name!r} already declared differently")
+                return metric
+        metric = cls(self, name, help, labels or {}, *args)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """All series in the Prometheus text exposition format."""
+        values = self.snapshot()
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            metric.render(values, lines)
+        return "\n".join(lines) + "\n"
+
+
+def _number(value: float) -> str:
+    # Counts print exactly; %g would round large ones
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class _Metric:
+    kind = ""
+    slots_per_series = 1
+
+    def __init__(self, registry: Registry, name: str, help: str, labels):
+        self.registry = registry
+        self.name = name
+        self.help = help
+        self.labels = {key: tuple(values) for key, values in labels.items()}
+        series = list(itertools.product(*self.labels.values()))
+        base = registry._allocate(len(series) * self.slots_per_series)
+        self._slots = {
+            key: base + i * self.slots_per_series for i, key in enumerate(series)
+        }
+
+    def _label_text(self, key: tuple[str, ...], extra: str = "") -> str:
+        pairs = [f'{k}="{v}"' for k, v in zip(self.labels, key)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter(_Metric):
+    """A count that only goes up, one per combination of label values."""
+
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self.registry.add(self._slots[labels], amount)
+
+    def value(self, *labels: str) -> float:
+        return self.registry.snapshot()[self._slots[labels]]
+
+    def render(self, values: list[float], lines: list[str]) -> None:
+        for key, slot in self._slots.items():
+            lines.append(f"{self.name}{self._label_text(key)} {_number(values[slot])}")
+
+
+class Histogram(_Metric):
+    """Observation counts per bucket upper bound, plus their sum."""
+
+    kind = "histogram"
+
+    def __init__(self, registry, name, help, labels, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        # One slot per bucket, one for +Inf and one for the sum
+        self.slots_per_series = len(buckets) + 2
+        super().__init__(registry, name, help, labels)
+
+    def observe(self, value: float, *labels: str) -> None:
+        registry = self.registry
+        if not registry.enabled:
+            return
+        with registry._lock:
+            if registry._values is None:
+                registry._open()
+            self._add(registry._values, value, labels)
+
+    def _add(self, values, value: float, labels: tuple[str, ...]) -> None:
+        # Caller holds the registry lock
+        base = self._slots[labels]
+        values[base + bisect_left(self.buckets, value)] += 1
+        values[base + len(self.buckets) + 1] += value
+
+    def count(self, *labels: str) -> float:
+        base = self._slots[labels]
+        return sum(self.registry.snapshot()[base : base + len(self.buckets) + 1])
+
+    def render(self, values: list[float], lines: list[str]) -> None:
+        for key, base in self._slots.items():
+            total = 0.0
+            for i, bound in enumerate((*self.buckets, "+Inf")):
+                total += values[base + i]
+                le = f'le="{bound}"'
+                lines.append(
+                    f"{self.name}_bucket{self._label_text(key, le)} {_number(total)}"
+                )
+            labels = self._label_text(key)
+            lines.append(
+                f"{self.name}_sum{labels} {_number(values[base + len(self.buckets) + 1])}"
+            )
+            lines.append(f"{self.name}_count{labels} {_number(total)}")
+
+
+class StageTimer:
+    """Times the stages of one query and records them together at the end.
+
+    ``lap`` only reads the clock. ``record`` observes every lap into
+    ``histogram`` and counts the query's outcome under one acquisition of
+    the registry lock, which is most of what an update costs.
+    """
+
+    __slots__ = ("histogram", "_laps", "_last")
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+        self._laps: list[tuple[str, float]] = []
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        now = time.perf_counter()
+        self._laps.append((stage, now - self._last))
+        self._last = now
+
+    def record(self, counter: Counter | None = None, *labels: str) -> None:
+        """Observe the laps so far and add one to ``counter`` under ``labels``."""
+        registry = self.histogram.registry
+        if not registry.enabled:
+            return
+        with registry._lock:
+            if registry._values is None:
+                registry._open()
+            values = registry._values
+            for stage, seconds in self._laps:
+                self.histogram._add(values, seconds, (stage,))
+            if counter is not None:
+                values[counter._slots[labels]] += 1
+        self._laps.clear()
+
+
+REGISTRY = Registry(Config.METRICS_DIR or None, enabled=Config.METRICS_ENABLED)
+
+PATH_STAGES = ("resolve", "search", "build", "fallback", "llm")
+PATH_STAGE_SECONDS = REGISTRY.histogram(
+    "qed_path_stage_seconds",
+    "Time spent per stage of a path query.",
+    {"stage": PATH_STAGES},
+)
+PATH_QUERIES = REGISTRY.counter(
+    "qed_path_queries_total",
+    "Path queries by outcome.",
+    {"outcome": ("found", "cached", "no_chain", "invalid")},
+)
+PATH_HOPS = REGISTRY.histogram(
+    "qed_path_hops",
+    "Games in each returned chain.",
+    buckets=(1, 2, 3, 4, 5, 6, 8, 10, 15),
+)
+WORKER_BOOT_SECONDS = REGISTRY.histogram(
+    "qed_worker_boot_seconds",
+    "Worker start-up: loading the app after the fork, then warming the LLM client.",
+    {"stage": ("app", "llm")},
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+LLM_FALLBACKS = REGISTRY.counter(
+    "qed_llm_fallbacks_total",
+    "LLM fallbacks by outcome; error counts failed generations.",
+    {
+        "outcome": (
+            "generated", "cached", "coalesced", "busy", "rate_limited",
+            "timeout", "error", "unconfigured",
+        )
+    },
+)  # fmt: skip
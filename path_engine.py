@@ -0,0 +1,264 @@
+"""Shortest-path engines over dense node indices.
+
+``GraphService`` resolves team names to node indices once and asks an
+engine for paths. Three engines are available:
+
+- ``csr``: heap-based Dijkstra directly over the snapshot's flat offset,
+  target and weight arrays. No NetworkX objects are touched per query.
+- ``bidir``: the same arrays searched from both ends at once for
+  point-to-point queries; full trees are built as ``csr`` builds them.
+- ``networkx``: the reference implementation, ``nx.dijkstra_path`` over a
+  ``DiGraph`` rebuilt from the snapshot.
+
+``csr`` and ``networkx`` settle nodes in the same order (ties broken by
+push order), so they return identical paths, not just paths of equal
+weight. ``bidir`` returns paths of the same weight, but where several
+chains tie it may pick a different one.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from array import array
+from heapq import heappop, heappush
+from itertools import count
+from typing import TYPE_CHECKING, Sequence
+
+from snapshot import GraphSnapshot
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+_INF = float("inf")
+
+
+def path_from_parents(parent: list[int], src: int, dst: int) -> list[int] | None:
+    """Walk a shortest-path tree back from ``dst``; None if it is unreachable."""
+    if parent[dst] == -1:
+        return None
+    nodes = [dst]
+    while dst != src:
+        dst = parent[dst]
+        nodes.append(dst)
+    nodes.reverse()
+    return nodes
+
+
+def reverse_csr(snapshot: GraphSnapshot) -> tuple[array, array, array]:
+    """Incoming-edge index of the snapshot: (rev_offsets, rev_edges, sources).
+
+    ``rev_edges[rev_offsets[v]:rev_offsets[v + 1]]`` are the edges into
+    ``v`` and ``sources[e]`` is the node edge ``e`` leaves.
+    """
+    n, offsets, targets = snapshot.num_nodes, snapshot.offsets, snapshot.targets
+    indegree = [0] * (n + 1)
+    for v in targets:
+        indegree[v + 1] += 1
+    for v in range(n):
+        indegree[v + 1] += indegree[v]
+    rev_offsets = array("I", indegree)
+    rev_edges = array("I", bytes(4 * len(targets)))
+    sources = array("I", bytes(4 * len(targets)))
+    fill = indegree[:]
+    for u in range(n):
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            rev_edges[fill[v]] = e
+            fill[v] += 1
+            sources[e] = u
+    return rev_offsets, rev_edges, sources
+
+
+class PathEngine(ABC):
+    """Interface for shortest-path searches between node indices."""
+
+    name = ""
+
+    def __init__(self, snapshot: GraphSnapshot):
+        self.snapshot = snapshot
+        self.num_nodes = snapshot.num_nodes
+
+    @abstractmethod
+    def shortest_path(self, src: int, dst: int) -> list[int] | None:
+        """Return the node indices from ``src`` to ``dst``, or None if unreachable."""
+
+    @abstractmethod
+    def shortest_path_tree(self, src: int) -> list[int]:
+        """Return predecessors from a full search; -1 marks unreachable nodes."""
+
+
+class CSREngine(PathEngine):
+    """Dijkstra over the snapshot's CSR arrays."""
+
+    name = "csr"
+
+    def _search(
+        self, src: int, dst: int = -1, weights: Sequence[float] | None = None
+    ) -> list[int]:
+        offsets = self.snapshot.offsets
+        targets = self.snapshot.targets
+        # Filtered searches pass their own weights; inf drops an edge
+        weights = self.snapshot.weights if weights is None else weights
+        n = self.num_nodes
+
+        dist = [_INF] * n
+        parent = [-1] * n
+        done = bytearray(n)
+        dist[src] = 0.0
+        parent[src] = src
+        counter = count(1)
+        heap = [(0.0, 0, src)]
+        while heap:
+            d, _, v = heappop(heap)
+            if done[v]:
+                continue
+            done[v] = 1
+            if v == dst:
+                break
+            for e in range(offsets[v], offsets[v + 1]):
+                u = targets[e]
+                if done[u]:
+                    continue
+                nd = d + weights[e]
+                if nd < dist[u]:
+                    dist[u] = nd
+                    parent[u] = v
+                    heappush(heap, (nd, next(counter), u))
+        return parent
+
+    def shortest_path(
+        self, src: int, dst: int, weights: Sequence[float] | None = None
+    ) -> list[int] | None:
+        return path_from_parents(self._search(src, dst, weights), src, dst)
+
+    def shortest_path_tree(self, src: int) -> list[int]:
+        return self._search(src)
+
+
+class BidirectionalEngine(CSREngine):
+    """Dijkstra from both ends, meeting in the middle.
+
+    Each step advances whichever frontier is smaller. The search stops once
+    the two frontiers' smallest distances add up to at least the best
+    complete path seen, so a typical query settles a small ball around
+    each end instead of everything closer to ``src`` than ``dst`` is.
+    """
+
+    name = "bidir"
+
+    def __init__(self, snapshot: GraphSnapshot):
+        super().__init__(snapshot)
+        self._rev_offsets, self._rev_edges, self._sources = reverse_csr(snapshot)
+
+    def shortest_path(
+        self, src: int, dst: int, weights: Sequence[float] | None = None
+    ) -> list[int] | None:
+        if src == dst:
+            return [src]
+        offsets, targets = self.snapshot.offsets, self.snapshot.targets
+        rev_offsets, rev_edges = self._rev_offsets, self._rev_edges
+        sources = self._sources
+        weights = self.snapshot.weights if weights is None else weights
+        n = self.num_nodes
+
+        dist_f, dist_b = [_INF] * n, [_INF] * n
+        # Predecessor towards src, and successor towards dst
+        parent, child = [-1] * n, [-1] * n
+        done_f, done_b = bytearray(n), bytearray(n)
+        dist_f[src] = dist_b[dst] = 0.0
+        counter = count(1)
+        heap_f, heap_b = [(0.0, 0, src)], [(0.0, 0, dst)]
+        best, meet = _INF, -1
+        while heap_f and heap_b and heap_f[0][0] + heap_b[0][0] < best:
+            if len(heap_f) <= len(heap_b):
+                d, _, v = heappop(heap_f)
+                if done_f[v]:
+                    continue
+                done_f[v] = 1
+                for e in range(offsets[v], offsets[v + 1]):
+                    u = targets[e]
+                    if done_f[u]:
+                        continue
+                    nd = d + weights[e]
+                    if nd < dist_f[u]:
+                        dist_f[u] = nd
+                        parent[u] = v
+                        heappush(heap_f, (nd, next(counter), u))
+                        if nd + dist_b[u] < best:
+                            best, meet = nd + dist_b[u], u
+            else:
+                d, _, v = heappop(heap_b)
+                if done_b[v]:
+                    continue
+                done_b[v] = 1
+                for i in range(rev_offsets[v], rev_offsets[v + 1]):
+                    e = rev_edges[i]
+                    u = sources[e]
+                    if done_b[u]:
+                        continue
+                    nd = d + weights[e]
+                    if nd < dist_b[u]:
+                        dist_b[u] = nd
+                        child[u] = v
+                        heappush(heap_b, (nd, next(counter), u))
+                        if nd + dist_f[u] < best:
+                            best, meet = nd + dist_f[u], u
+        if meet == -1:
+            return None
+        nodes = [meet]
+        while nodes[-1] != src:
+            nodes.append(parent[nodes[-1]])
+        nodes.reverse()
+        while nodes[-1] != dst:
+            nodes.append(child[nodes[-1]])
+        return nodes
+
+
+class NetworkXEngine(PathEngine):
+    """Reference engine backed by NetworkX, imported only when it is used."""
+
+    name = "networkx"
+
+    def __init__(self, snapshot: GraphSnapshot, graph: nx.DiGraph | None = None):
+        super().__init__(snapshot)
+        self.graph = graph if graph is not None else snapshot.to_networkx()
+        self._node_ids = list(snapshot.node_ids)
+        self._index = {node: i for i, node in enumerate(self._node_ids)}
+
+    def shortest_path(self, src: int, dst: int) -> list[int] | None:
+        import networkx as nx
+
+        try:
+            path = nx.dijkstra_path(
+                self.graph, self._node_ids[src], self._node_ids[dst], weight="weight"
+            )
+        except nx.NetworkXNoPath:
+            return None
+        return [self._index[node] for node in path]
+
+    def shortest_path_tree(self, src: int) -> list[int]:
+        import networkx as nx
+
+        parent = [-1] * self.num_nodes
+        _, paths = nx.single_source_dijkstra(
+            self.graph, self._node_ids[src], weight="weight"
+        )
+        for node, path in paths.items():
+            parent[self._index[node]] = self._index[path[-2]] if len(path) > 1 else src
+        return parent
+
+
+ENGINES = {
+    engine.name: engine for engine in (CSREngine, BidirectionalEngine, NetworkXEngine)
+}
+
+
+def make_engine(
+    name: str, snapshot: GraphSnapshot, graph: nx.DiGraph | None = None
+) -> PathEngine:
+    """Construct the engine registered under ``name``."""
+    if name not in ENGINES:
+        raise ValueError(f"Unknown path engine {name!r}; choose from {sorted(ENGINES)}")
+    if name == NetworkXEngine.name:
+        return NetworkXEngine(snapshot, graph)
+    return ENGINES[name](snapshot)
@@ -0,0 +1,163 @@
+"""Precomputed shortest-path trees for constant-time path lookups.
+
+The victory graph never changes once loaded, so every single-source
+Dijkstra run can be kept. For each source we store one row of predecessor
+indices (a shortest-path tree); a path is rebuilt by walking predecessors
+back from the target. Rows are filled lazily on first use, or all at once
+offline and memory-mapped from disk:
+
+    python path_table.py [--out data/paths.bin]
+
+Rows come from the wrapped engine's full single-source search, which
+settles nodes in the same order as its point-to-point search, so
+tie-breaking between equal-weight chains, and therefore every returned
+path, matches exactly.
+"""
+
+from __future__ import annotations
+
+import argparse
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
+
+from atomic_file import atomic_open
+from path_engine import PathEngine, make_engine
+from snapshot import GraphSnapshot, load_fresh_snapshot
+
+MAGIC = b"QEDPATH\0"
+TABLE_VERSION = 1
+
+# magic, version, little-endian flag, typecode, node count, snapshot fingerprint
+_HEADER = struct.Struct("<8sHH4sI32s")
+
+
+class PathTableError(Exception):
+    """Raised when a path table file is corrupt or does not match the graph."""
+
+
+def _typecode(num_nodes: int) -> str:
+    # Index num_nodes itself is the "unreachable" sentinel
+    return "H" if num_nodes < 0xFFFF else "I"
+
+
+class PathTable:
+    """Per-source predecessor rows over dense node indices.
+
+    ``row[v]`` is the predecessor of ``v`` on the shortest path from the
+    row's source, the source itself for the source, and ``num_nodes`` when
+    ``v`` is unreachable.
+    """
+
+    def __init__(self, engine: PathEngine):
+        self.engine = engine
+        self.num_nodes = engine.num_nodes
+        self._typecode = _typecode(self.num_nodes)
+        self._rows: dict[int, memoryview | array] = {}
+        self._mmap = None
+
+    @property
+    def rows_built(self) -> int:
+        return len(self._rows)
+
+    def _compute_row(self, src: int) -> array:
+        n = self.num_nodes
+        parents = self.engine.shortest_path_tree(src)
+        return array(self._typecode, (n if p == -1 else p for p in parents))
+
+    def row(self, src: int):
+        """Return the predecessor row for ``src``, computing it if needed."""
+        row = self._rows.get(src)
+        if row is None:
+            row = self._rows[src] = self._compute_row(src)
+        return row
+
+    def build_all(self) -> None:
+        for src in range(self.num_nodes):
+            self.row(src)
+
+    def shortest_path(self, src: int, dst: int) -> list[int] | None:
+        """Return the node indices from ``src`` to ``dst``, or None if unreachable."""
+        row = self.row(src)
+        if row[dst] == self.num_nodes:
+            return None
+        nodes = [dst]
+        while dst != src:
+            dst = row[dst]
+            nodes.append(dst)
+        nodes.reverse()
+        return nodes
+
+    def shortest_path_tree(self, src: int) -> list[int]:
+        """Return the row in engine form, with -1 marking unreachable nodes."""
+        n = self.num_nodes
+        return [-1 if p == n else p for p in self.row(src)]
+
+    def write(self, path: Path, fingerprint: bytes) -> None:
+        """Write every row to ``path``, replacing any existing file atomically."""
+        self.build_all()
+        header = _HEADER.pack(
+            MAGIC,
+            TABLE_VERSION,
+            sys.byteorder == "little",
+            self._typecode.encode().ljust(4, b"\0"),
+            self.num_nodes,
+            fingerprint,
+        )
+        with atomic_open(path) as f:
+            f.write(header)
+            for src in range(self.num_nodes):
+                f.write(array(self._typecode, self._rows[src]).tobytes())
+
+    def load(self, path: Path, fingerprint: bytes) -> None:
+        """Memory-map all rows from a file written by :meth:`write`."""
+        try:
+            with open(path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise PathTableError(f"Cannot map path table {path}: {e}") from e
+
+        buf = memoryview(mm)
+        if len(buf) < _HEADER.size:
+            raise PathTableError(f"Path table {path} is truncated")
+        magic, version, little, typecode, n_nodes, stored = _HEADER.unpack_from(buf)
+        if magic != MAGIC or version != TABLE_VERSION:
+            raise PathTableError(f"{path} is not a version {TABLE_VERSION} path table")
+        if bool(little) != (sys.byteorder == "little"):
+            raise PathTableError("Path table was built on a different byte order")
+        if n_nodes != self.num_nodes or stored != fingerprint:
+            raise PathTableError(f"Path table {path} was built for a different graph")
+        typecode = typecode.rstrip(b"\0").decode()
+        rows = buf[_HEADER.size :].cast(typecode)
+        if len(rows) != n_nodes * n_nodes:
+            raise PathTableError(f"Path table {path} is truncated")
+
+        self._typecode = typecode
+        self._rows = {
+            src: rows[src * n_nodes : (src + 1) * n_nodes] for src in range(n_nodes)
+        }
+        self._mmap = mm
+
+
+def main(argv: list[str] | None = None) -> None:
+    from config import Config
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--graph", type=Path, default=Config.GRAPH_PATH)
+    parser.add_argument("--teams", type=Path, default=Config.TEAMS_PATH)
+    parser.add_argument("--snapshot", type=Path, default=Config.SNAPSHOT_PATH)
+    parser.add_argument("--out", type=Path, default=Config.PATH_TABLE_PATH)
+    args = parser.parse_args(argv)
+
+    snapshot = load_fresh_snapshot(args.snapshot, args.graph, args.teams)
+    if snapshot is None:
+        snapshot = GraphSnapshot.from_sources(args.graph, args.teams)
+    table = PathTable(make_engine(Config.PATH_ENGINE, snapshot))
+    table.write(args.out, snapshot.fingerprint)
+    print(f"Wrote {args.out} ({table.num_nodes} x {table.num_nodes} predecessors)")
+
+
+if __name__ == "__main__":
+    main()
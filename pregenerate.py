@@ -0,0 +1,105 @@
+"""Pre-generate LLM explanations for every team pair with no victory chain.
+
+A pair has no path exactly when the source's strongly connected component
+cannot reach the target's in the condensation DAG, so the full list comes
+from one pass over that DAG rather than a search per pair. Explanations are
+generated with bounded concurrency behind a token-bucket rate limit and
+pinned in the explanation cache (llm_cache.py) that ``GraphService`` reads.
+
+Each explanation is committed as soon as it arrives and pairs already in
+the cache are skipped, so an interrupted run resumes where it stopped:
+
+    python pregenerate.py [--concurrency 4] [--rate 2] [--limit N] [--dry-run]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import networkx as nx
+
+from graph_service import GraphService
+from rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+def unreachable_pairs(graph: nx.DiGraph) -> Iterator[tuple[str, str]]:
+    """Yield every (src, dst) node pair with no directed path from src to dst."""
+    dag = nx.condensation(graph)
+    members = {comp: sorted(nodes) for comp, nodes in dag.nodes(data="members")}
+    for comp in dag:
+        reachable = nx.descendants(dag, comp)
+        reachable.add(comp)
+        blocked = [
+            node for other in dag if other not in reachable for node in members[other]
+        ]
+        for src in members[comp]:
+            for dst in blocked:
+                yield src, dst
+
+
+def pregenerate(
+    service: GraphService,
+    pairs: list[tuple[str, str]],
+    concurrency: int = 4,
+    rate: float = 2.0,
+) -> dict[str, int]:
+    """Generate and pin explanations for ``pairs`` not already cached."""
+    todo = [pair for pair in pairs if service.cached_explanation(*pair) is None]
+    stats = {"pairs": len(pairs), "cached": len(pairs) - len(todo)}
+    stats.update(generated=0, failed=0)
+    limiter = TokenBucket(rate)
+
+    def generate(pair: tuple[str, str]) -> tuple[str, bool]:
+        limiter.acquire()
+        return service.fallback_to_llm(*pair, pin=True)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {pool.submit(generate, pair): pair for pair in todo}
+        for done, future in enumerate(as_completed(futures), 1):
+            msg, success = future.result()
+            if success:
+                stats["generated"] += 1
+            else:
+                stats["failed"] += 1
+                logger.warning("%s -> %s: %s", *futures[future], msg)
+            if done % 100 == 0:
+                logger.info("%d/%d explanations done", done, len(todo))
+    return stats
+
+
+def main(argv: list[str] | None = None) -> None:
+    from config import Config
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=2.0, help="requests/second")
+    parser.add_argument("--limit", type=int, help="stop after this many pairs")
+    parser.add_argument("--dry-run", action="store_true", help="only count pairs")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    service = GraphService(Config.GRAPH_PATH, Config.TEAMS_PATH, Config.SNAPSHOT_PATH)
+    pairs = list(unreachable_pairs(service.graph))
+    if args.limit is not None:
+        pairs = pairs[: args.limit]
+    if args.dry_run:
+        print(f"{len(pairs)} unreachable pairs")
+        return
+    if not Config.GEMINI_API_KEY or not Config.LLM_CACHE_PATH:
+        sys.exit("GEMINI_API_KEY and LLM_CACHE_PATH must both be set")
+
+    stats = pregenerate(service, pairs, args.concurrency, args.rate)
+    print(
+        f"{stats['pairs']} pairs: {stats['cached']} already cached, "
+        f"{stats['generated']} generated, {stats['failed']} failed"
+    )
+
+
+if __name__ == "__main__":
+    main()
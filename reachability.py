@@ -0,0 +1,106 @@
+"""Constant-time "is there any chain from A to B?" over the snapshot.
+
+The graph's strongly connected components are found with an iterative
+Tarjan pass over the CSR arrays. Tarjan numbers components in reverse
+topological order, so every edge between two components points to a
+lower number, and one sweep in increasing order builds each component's
+transitive closure as a bitset over components. ``reachable(u, v)`` is
+then two array reads and a bit test, so a pair with no chain is rejected
+without a search that would have settled everything ``u`` can reach.
+"""
+
+from __future__ import annotations
+
+from array import array
+
+from snapshot import GraphSnapshot
+
+
+def strongly_connected_components(snapshot: GraphSnapshot) -> tuple[array, int]:
+    """Component number per node, and the number of components.
+
+    Components are numbered in reverse topological order of the
+    condensation: an edge from component ``a`` to a different component
+    ``b`` always has ``a > b``.
+    """
+    n, offsets, targets = snapshot.num_nodes, snapshot.offsets, snapshot.targets
+    index = [-1] * n
+    low = [0] * n
+    on_stack = bytearray(n)
+    stack: list[int] = []
+    comp = array("I", bytes(4 * n))
+    num_comps = 0
+    counter = 0
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        # (node, next edge to look at) frames instead of recursion
+        work = [(root, offsets[root])]
+        while work:
+            v, e = work[-1]
+            if e < offsets[v + 1]:
+                work[-1] = (v, e + 1)
+                w = targets[e]
+                if index[w] == -1:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = 1
+                    work.append((w, offsets[w]))
+                elif on_stack[w] and index[w] < low[v]:
+                    low[v] = index[w]
+                continue
+            work.pop()
+            if work:
+                u = work[-1][0]
+                if low[v] < low[u]:
+                    low[u] = low[v]
+            if low[v] == index[v]:
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = 0
+                    comp[w] = num_comps
+                    if w == v:
+                        break
+                num_comps += 1
+    return comp, num_comps
+
+
+class ReachabilityIndex:
+    """Transitive closure of the condensation DAG, one bitset per component."""
+
+    def __init__(self, snapshot: GraphSnapshot):
+        self.num_nodes = snapshot.num_nodes
+        offsets, targets = snapshot.offsets, snapshot.targets
+        self.component, self.num_components = strongly_connected_components(snapshot)
+        comp = self.component
+
+        members: list[list[int]] = [[] for _ in range(self.num_components)]
+        for v in range(self.num_nodes):
+            members[comp[v]].append(v)
+        # Successor components all have lower numbers, so are already closed
+        closure: list[int] = []
+        for c, nodes in enumerate(members):
+            bits = 1 << c
+            for v in nodes:
+                for e in range(offsets[v], offsets[v + 1]):
+                    d = comp[targets[e]]
+                    if d != c:
+                        bits |= closure[d]
+            closure.append(bits)
+
+        # Fixed-width rows in one buffer make a lookup a single byte read
+        self._stride = (self.num_components + 7) // 8
+        self._rows = b"".join(bits.to_bytes(self._stride, "little") for bits in closure)
+        self.largest_component = max(map(len, members), default=0)
+
+    def reachable(self, src: int, dst: int) -> bool:
+        """Whether any directed path leads from node ``src`` to node ``dst``."""
+        c = self.component[dst]
+        return bool(
+            self._rows[self.component[src] * self._stride + (c >> 3)] >> (c & 7) & 1
+        )
@@ -0,0 +1,196 @@
+"""Hot reload of the graph in a running worker.
+
+``GraphReloader`` owns the live ``GraphService``. Request handlers read
+``reloader.service`` once and keep that reference, so a request that
+started on the old graph finishes on it. A background thread stats the
+graph sources; once they change and have been quiet for a moment (the
+ingester replaces several files), it compares the source fingerprint with
+the live snapshot's, builds a replacement, warms it with the old
+service's most recently used paths and swaps the reference. After a
+drain period the old service is closed. A failed build is logged and the
+old graph keeps serving.
+"""
+
+from __future__ import annotations
+
+import datetime
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from graph_service import GraphService
+from snapshot import source_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+def _stat_signature(paths: list[Path]) -> tuple:
+    signature = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            signature.append(None)
+        else:
+            signature.append((st.st_mtime_ns, st.st_size))
+    return tuple(signature)
+
+
+class GraphReloader:
+    """Holds the live ``GraphService`` and replaces it when the graph changes.
+
+    ``factory`` builds a service from the current files. ``interval`` is
+    the poll period in seconds (0 disables the watcher thread), ``settle``
+    how long the sources must be unchanged before a reload,
+    ``warm_pairs`` how many cached paths to recompute before a swap, and
+    ``drain`` how many seconds a replaced service stays open for the
+    requests still using it.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], GraphService],
+        graph_path: Path,
+        teams_path: Path,
+        snapshot_path: Path | None = None,
+        interval: float = 30.0,
+        settle: float = 2.0,
+        warm_pairs: int = 256,
+        drain: float = 60.0,
+    ):
+        self._factory = factory
+        self.graph_path = Path(graph_path)
+        self.teams_path = Path(teams_path)
+        self._watched = [self.graph_path, self.teams_path]
+        if snapshot_path is not None:
+            self._watched.append(Path(snapshot_path))
+        self.interval = interval
+        self.settle = settle
+        self.warm_pairs = warm_pairs
+        self.drain = drain
+
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+        self._signature = _stat_signature(self._watched)
+        self.reloads = 0
+        self.last_error: str | None = None
+        self.last_checked: float | None = None
+
+        start = time.perf_counter()
+        self.service = factory()
+        self.reload_seconds = time.perf_counter() - start
+        self.loaded_at = time.time()
+
+    @property
+    def version(self) -> str:
+        return self.service.snapshot.fingerprint.hex()
+
+    def start(self) -> None:
+        """Start the watcher thread in this process, if not already running."""
+        # Threads do not survive a fork, so each gunicorn worker starts its own
+        if self.interval <= 0 or self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._watch, name="graph-reloader", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None and self._pid == os.getpid():
+            self._thread.join()
+        self._pid = None
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                logger.exception("Graph reload check failed")
+
+    def check(self) -> bool:
+        """Reload if the sources changed and have settled; True if swapped."""
+        self.last_checked = time.time()
+        signature = _stat_signature(self._watched)
+        if signature == self._signature:
+            return False
+        newest = max((entry[0] for entry in signature if entry), default=0)
+        if time.time_ns() - newest < self.settle * 1e9:
+            # Still being written; look again on the next poll
+            return False
+        if None in signature[:2]:
+            return False
+        fingerprint = source_fingerprint(self.graph_path, self.teams_path)
+        if fingerprint == self.service.snapshot.fingerprint:
+            # Touched but not changed, or only the snapshot was rebuilt
+            self._signature = signature
+            return False
+        # Remembered even on failure: broken files are retried once they change
+        self._signature = signature
+        return self.reload()
+
+    def reload(self) -> bool:
+        """Build a replacement service and swap it in; False if the build fails."""
+        with self._reload_lock:
+            old = self.service
+            start = time.perf_counter()
+            try:
+                new = self._factory()
+                hot = (
+                    old.path_cache.keys()[-self.warm_pairs :] if self.warm_pairs else []
+                )
+                new.warm_paths(hot)
+                new.build_indexes()
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                logger.exception("Graph reload failed; keeping the current graph")
+                return False
+            # A single reference assignment: requests see old or new, never a mix
+            self.service = new
+            self.reload_seconds = time.perf_counter() - start
+            self.loaded_at = time.time()
+            self.reloads += 1
+            self.last_error = None
+            logger.info(
+                "Reloaded graph %s in %.2fs", self.version[:12], self.reload_seconds
+            )
+        self._close_later(old)
+        return True
+
+    def _close_later(self, service: GraphService) -> None:
+        # Requests hold their own reference to the old service, so give them
+        # time to finish before its threads and connections go away
+        if self.drain <= 0:
+            service.close()
+            return
+        timer = threading.Timer(self.drain, service.close)
+        timer.name = "graph-drain"
+        timer.daemon = True
+        timer.start()
+
+    def status(self) -> dict[str, Any]:
+        service = self.service
+        return {
+            "version": service.snapshot.fingerprint.hex(),
+            "nodes": service.snapshot.num_nodes,
+            "edges": service.snapshot.num_edges,
+            "loaded_at": _isoformat(self.loaded_at),
+            "reload_seconds": round(self.reload_seconds, 3),
+            "reloads": self.reloads,
+            "last_checked": _isoformat(self.last_checked),
+            "last_error": self.last_error,
+            "watching": self.interval > 0 and self._pid == os.getpid(),
+        }
+
+
+def _isoformat(timestamp: float | None) -> str | None:
+    if timestamp is None:
+        return None
+    return datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc).isoformat()
@@ -0,0 +1,486 @@
+"""Compact binary snapshot of the victory graph and team metadata.
+
+Parsing graph.gexf (XML) and unpickling teams.pkl dominates worker start
+time. This module compiles both into a single versioned file holding CSR
+adjacency arrays, edge weights, every game behind each edge with its
+season and week, and string tables. Loading memory-maps the
+file, so numeric arrays are used in place and strings are decoded on
+demand.
+
+Build it with:
+
+    python snapshot.py [--graph data/graph.gexf] [--teams data/teams.pkl]
+
+``--check`` writes nothing and only reports how many games share an edge
+with another game between the same teams, which a graph with one edge per
+pair would lose. A graph built that way has already lost them, so the
+check also counts repeated pairs in the ingester's ledger when there is
+one.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import mmap
+import pickle
+import re
+import struct
+import sys
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Sequence
+
+from atomic_file import atomic_open
+
+MAGIC = b"QEDSNAP\0"
+SNAPSHOT_VERSION = 3
+
+# magic, version, little-endian flag, node count, edge count, source fingerprint
+_HEADER = struct.Struct("<8sHHII32s")
+# (offset, length) pairs for each section, in _SECTIONS order
+_SECTION = struct.Struct("<QQ")
+_SECTIONS = (
+    "offsets",
+    "targets",
+    "weights",
+    "node_ids",
+    "labels",
+    "logos",
+    "mascots",
+    "edge_labels",
+    "game_offsets",
+    "game_weights",
+    "game_labels",
+    "game_seasons",
+    "game_weeks",
+)
+_ALIGN = 8
+# Week of games whose week is not recorded (graphs built by the notebook);
+# they sort after every real week of their season
+WEEK_UNKNOWN = 0xFFFF
+# Older games are labelled "A def. B (2024)"; the latest season has no year
+_LABEL_SEASON = re.compile(r"\((\d{4})\)$")
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is missing, corrupt or built by another version."""
+
+
+def source_fingerprint(graph_path: Path, teams_path: Path) -> bytes:
+    """Hash the source artifacts so stale snapshots can be detected."""
+    digest = hashlib.sha256()
+    for path in (graph_path, teams_path):
+        digest.update(Path(path).read_bytes())
+    return digest.digest()
+
+
+class StringTable(Sequence):
+    """Read-only list of optional strings decoded lazily from a buffer.
+
+    Layout: u32 count, (count + 1) u32 byte offsets, count null flags,
+    padding, then the UTF-8 blob.
+    """
+
+    def __init__(self, buf: memoryview):
+        (count,) = struct.unpack_from("<I", buf, 0)
+        start = 4
+        self._offsets = buf[start : start + 4 * (count + 1)].cast("I")
+        start += 4 * (count + 1)
+        self._nulls = buf[start : start + count]
+        start = _pad(start + count)
+        self._blob = buf[start:]
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(self._count))]
+        if idx < 0:
+            idx += self._count
+        if not 0 <= idx < self._count:
+            raise IndexError("string table index out of range")
+        if self._nulls[idx]:
+            return None
+        return str(self._blob[self._offsets[idx] : self._offsets[idx + 1]], "utf-8")
+
+    @staticmethod
+    def encode(values: Sequence[str | None]) -> bytes:
+        offsets = array("I", [0])
+        nulls = bytearray()
+        blob = bytearray()
+        for value in values:
+            nulls.append(value is None)
+            blob += (value or "").encode("utf-8")
+            offsets.append(len(blob))
+        head = struct.pack("<I", len(values)) + offsets.tobytes() + bytes(nulls)
+        return head + b"\0" * (_pad(len(head)) - len(head)) + bytes(blob)
+
+
+def _pad(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _latest_season(graph, seasons_back: dict[float, int]) -> int:
+    """Season of the lightest games, from any dated game; 0 if there is none."""
+    for _, _, data in graph.edges(data=True):
+        back = seasons_back[float(data.get("weight", 1))]
+        if data.get("season") is not None:
+            return int(data["season"]) + back
+        match = _LABEL_SEASON.search(data.get("label") or "")
+        if match:
+            return int(match.group(1)) + back
+    return 0
+
+
+@dataclass
+class GraphSnapshot:
+    """Graph plus team metadata, indexed by dense node position.
+
+    Node ``i`` has the original GEXF id ``node_ids[i]``; its outgoing edges
+    are ``offsets[i]:offsets[i + 1]`` into ``targets``, ``weights`` and
+    ``edge_labels``. Teams that met more than once have one edge per
+    ordered pair; its games are ``game_offsets[e]:game_offsets[e + 1]``
+    into ``game_weights``, ``game_labels``, ``game_seasons`` and
+    ``game_weeks``, and the edge carries the lightest of them. Weeks are
+    the ingester's ordinals (postseason after the regular season), or
+    ``WEEK_UNKNOWN``.
+    """
+
+    node_ids: Sequence[str]
+    labels: Sequence[str]
+    logos: Sequence[str | None]
+    mascots: Sequence[str | None]
+    offsets: Sequence[int]
+    targets: Sequence[int]
+    weights: Sequence[float]
+    edge_labels: Sequence[str | None]
+    game_offsets: Sequence[int]
+    game_weights: Sequence[float]
+    game_labels: Sequence[str | None]
+    game_seasons: Sequence[int]
+    game_weeks: Sequence[int]
+    fingerprint: bytes = b"\0" * 32
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.targets)
+
+    @property
+    def num_games(self) -> int:
+        return len(self.game_weights)
+
+    def game_stats(self) -> dict[str, int]:
+        """Count the games that a one-edge-per-pair graph would have dropped."""
+        offsets = self.game_offsets
+        repeated = sum(offsets[e + 1] - offsets[e] > 1 for e in range(self.num_edges))
+        return {
+            "edges": self.num_edges,
+            "games": self.num_games,
+            "edges_with_several_games": repeated,
+            "collapsed_games": self.num_games - self.num_edges,
+        }
+
+    def find_edge(self, u: int, v: int) -> int:
+        """Return the index of edge ``u -> v``, or -1 if there is none."""
+        targets = self.targets
+        for e in range(self.offsets[u], self.offsets[u + 1]):
+            if targets[e] == v:
+                return e
+        return -1
+
+    @classmethod
+    def from_networkx(
+        cls, graph, teams: list[dict], fingerprint: bytes = b"\0" * 32
+    ) -> GraphSnapshot:
+        """Flatten a NetworkX graph and the teams list into CSR arrays.
+
+        ``graph`` may be a ``MultiDiGraph`` with one edge per game. Each
+        ordered pair becomes one edge weighted and labelled by its lightest
+        game; among equally light games the last one listed wins, which is
+        the latest when games are added in chronological order.
+
+        Games carry ``season`` and ``week`` attributes when the ingester
+        wrote them. Otherwise the week is unknown and the season is
+        recovered from the weight: each season has one weight, so the rank
+        of a weight counts seasons back from the latest, which a dated label
+        pins down.
+        """
+        node_ids = [str(node) for node in graph.nodes]
+        index = {node: i for i, node in enumerate(graph.nodes)}
+        teams_by_id = {str(team["id"]): team for team in teams}
+
+        multi = graph.is_multigraph()
+        offsets = array("I", [0])
+        targets = array("I")
+        weights = array("d")
+        edge_labels: list[str | None] = []
+        game_offsets = array("I", [0])
+        game_weights = array("d")
+        game_labels: list[str | None] = []
+        game_seasons = array("H")
+        game_weeks = array("H")
+        weights_seen = {float(w) for _, _, w in graph.edges(data="weight", default=1)}
+        seasons_back = {w: rank for rank, w in enumerate(sorted(weights_seen))}
+        latest = _latest_season(graph, seasons_back)
+        for node in graph.nodes:
+            for nbr, data in graph[node].items():
+                games = list(data.values()) if multi else [data]
+                best = None
+                for game in games:
+                    weight = float(game.get("weight", 1))
+                    game_weights.append(weight)
+                    game_labels.append(game.get("label"))
+                    season = game.get("season")
+                    if season is None:
+                        season = latest - seasons_back[weight] if latest else 0
+                    game_seasons.append(int(season))
+                    game_weeks.append(int(game.get("week", WEEK_UNKNOWN)))
+                    if best is None or weight <= best[0]:
+                        best = (weight, game.get("label"))
+                game_offsets.append(len(game_weights))
+                targets.append(index[nbr])
+                weights.append(best[0])
+                edge_labels.append(best[1])
+            offsets.append(len(targets))
+
+        empty: dict = {}
+        return cls(
+            node_ids=node_ids,
+            labels=[data.get("label", node) for node, data in graph.nodes(data=True)],
+            logos=[teams_by_id.get(n, empty).get("logo", "") for n in node_ids],
+            mascots=[teams_by_id.get(n, empty).get("mascot", "") for n in node_ids],
+            offsets=offsets,
+            targets=targets,
+            weights=weights,
+            edge_labels=edge_labels,
+            game_offsets=game_offsets,
+            game_weights=game_weights,
+            game_labels=game_labels,
+            game_seasons=game_seasons,
+            game_weeks=game_weeks,
+            fingerprint=fingerprint,
+        )
+
+    @classmethod
+    def from_sources(cls, graph_path: Path, teams_path: Path) -> GraphSnapshot:
+        """Build a snapshot by parsing the GEXF graph and teams pickle."""
+        import networkx as nx
+
+        graph = nx.read_gexf(graph_path)
+        with open(teams_path, "rb") as f:
+            teams = pickle.load(f)
+        return cls.from_networkx(
+            graph, teams, source_fingerprint(graph_path, teams_path)
+        )
+
+    def to_networkx(self):
+        """Rebuild an ``nx.DiGraph`` of the chosen edges, keyed by node id."""
+        import networkx as nx
+
+        graph = nx.DiGraph()
+        ids = list(self.node_ids)
+        graph.add_nodes_from(
+            (node, {"label": label}) for node, label in zip(ids, self.labels)
+        )
+        targets, weights, labels = self.targets, self.weights, self.edge_labels
+        offsets = self.offsets
+        edges = []
+        for u in range(len(ids)):
+            for e in range(offsets[u], offsets[u + 1]):
+                data = {"weight": weights[e]}
+                label = labels[e]
+                if label is not None:
+                    data["label"] = label
+                edges.append((ids[u], ids[targets[e]], data))
+        graph.add_edges_from(edges)
+        return graph
+
+    def write(self, path: Path) -> None:
+        """Serialize to ``path``, replacing any existing file atomically."""
+        sections = [
+            array("I", self.offsets).tobytes(),
+            array("I", self.targets).tobytes(),
+            array("d", self.weights).tobytes(),
+            StringTable.encode(list(self.node_ids)),
+            StringTable.encode(list(self.labels)),
+            StringTable.encode(list(self.logos)),
+            StringTable.encode(list(self.mascots)),
+            StringTable.encode(list(self.edge_labels)),
+            array("I", self.game_offsets).tobytes(),
+            array("d", self.game_weights).tobytes(),
+            StringTable.encode(list(self.game_labels)),
+            array("H", self.game_seasons).tobytes(),
+            array("H", self.game_weeks).tobytes(),
+        ]
+        header = _HEADER.pack(
+            MAGIC,
+            SNAPSHOT_VERSION,
+            sys.byteorder == "little",
+            self.num_nodes,
+            self.num_edges,
+            self.fingerprint,
+        )
+        pos = _pad(len(header) + _SECTION.size * len(sections))
+        directory = b""
+        for data in sections:
+            directory += _SECTION.pack(pos, len(data))
+            pos = _pad(pos + len(data))
+
+        with atomic_open(path) as f:
+            f.write(header + directory)
+            for data in sections:
+                f.write(b"\0" * (_pad(f.tell()) - f.tell()))
+                f.write(data)
+
+    @classmethod
+    def load(cls, path: Path) -> GraphSnapshot:
+        """Memory-map a snapshot file written by :meth:`write`."""
+        try:
+            with open(path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise SnapshotError(f"Cannot map snapshot {path}: {e}") from e
+
+        buf = memoryview(mm)
+        if len(buf) < _HEADER.size:
+            raise SnapshotError(f"Snapshot {path} is truncated")
+        magic, version, little, n_nodes, n_edges, fingerprint = _HEADER.unpack_from(
+            buf, 0
+        )
+        if magic != MAGIC:
+            raise SnapshotError(f"{path} is not a graph snapshot")
+        if version != SNAPSHOT_VERSION:
+            raise SnapshotError(
+                f"Snapshot version {version} != expected {SNAPSHOT_VERSION}"
+            )
+        if bool(little) != (sys.byteorder == "little"):
+            raise SnapshotError("Snapshot was built on a different byte order")
+
+        views = {}
+        for i, name in enumerate(_SECTIONS):
+            offset, length = _SECTION.unpack_from(buf, _HEADER.size + i * _SECTION.size)
+            if offset + length > len(buf):
+                raise SnapshotError(f"Snapshot {path} is truncated")
+            views[name] = buf[offset : offset + length]
+
+        snap = cls(
+            node_ids=StringTable(views["node_ids"]),
+            labels=StringTable(views["labels"]),
+            logos=StringTable(views["logos"]),
+            mascots=StringTable(views["mascots"]),
+            offsets=views["offsets"].cast("I"),
+            targets=views["targets"].cast("I"),
+            weights=views["weights"].cast("d"),
+            edge_labels=StringTable(views["edge_labels"]),
+            game_offsets=views["game_offsets"].cast("I"),
+            game_weights=views["game_weights"].cast("d"),
+            game_labels=StringTable(views["game_labels"]),
+            game_seasons=views["game_seasons"].cast("H"),
+            game_weeks=views["game_weeks"].cast("H"),
+            fingerprint=fingerprint,
+        )
+        if (
+            len(snap.offsets) != n_nodes + 1
+            or len(snap.targets) != n_edges
+            or len(snap.game_offsets) != n_edges + 1
+            or len(snap.game_labels) != len(snap.game_weights)
+            or len(snap.game_seasons) != len(snap.game_weights)
+            or len(snap.game_weeks) != len(snap.game_weights)
+        ):
+            raise SnapshotError(f"Snapshot {path} has inconsistent section sizes")
+        # Keep the mapping alive as long as the views are
+        snap._mmap = mm
+        return snap
+
+
+def load_fresh_snapshot(
+    snapshot_path: Path, graph_path: Path, teams_path: Path
+) -> GraphSnapshot | None:
+    """Return the snapshot if it exists and matches the sources, else None."""
+    if not Path(snapshot_path).exists():
+        return None
+    try:
+        snap = GraphSnapshot.load(snapshot_path)
+    except SnapshotError:
+        return None
+    if snap.fingerprint != source_fingerprint(graph_path, teams_path):
+        return None
+    return snap
+
+
+def build_snapshot(graph_path: Path, teams_path: Path, out_path: Path) -> GraphSnapshot:
+    """Compile the GEXF graph and teams pickle into ``out_path``."""
+    snap = GraphSnapshot.from_sources(graph_path, teams_path)
+    snap.write(out_path)
+    return snap
+
+
+def ledger_stats(path: Path) -> dict[str, int] | None:
+    """Count repeated (winner, loser) pairs in an ingest ledger, if there is one."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            games = json.load(f)["games"]
+    except FileNotFoundError:
+        return None
+    per_pair = Counter((game["winner_id"], game["loser_id"]) for game in games)
+    return {
+        "games": len(games),
+        "pairs": len(per_pair),
+        "pairs_with_several_games": sum(count > 1 for count in per_pair.values()),
+        "collapsed_games": len(games) - len(per_pair),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    from config import Config
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--graph", type=Path, default=Config.GRAPH_PATH)
+    parser.add_argument("--teams", type=Path, default=Config.TEAMS_PATH)
+    parser.add_argument("--out", type=Path, default=Config.SNAPSHOT_PATH)
+    parser.add_argument(
+        "--check", action="store_true", help="report repeated games, write nothing"
+    )
+    parser.add_argument("--ledger", type=Path, default=Config.INGEST_DIR / "state.json")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        stats = GraphSnapshot.from_sources(args.graph, args.teams).game_stats()
+        print(
+            f"Graph: {stats['games']} games on {stats['edges']} edges; "
+            f"{stats['edges_with_several_games']} edges hold several games, "
+            f"{stats['collapsed_games']} games would be lost with one edge per pair"
+        )
+        stats = ledger_stats(args.ledger)
+        if stats is None:
+            print(
+                f"No ingest ledger at {args.ledger}; games a one-edge-per-pair "
+                "graph already dropped cannot be counted"
+            )
+        else:
+            print(
+                f"Ledger: {stats['games']} games between {stats['pairs']} pairs; "
+                f"{stats['pairs_with_several_games']} pairs met more than once, "
+                f"{stats['collapsed_games']} games would be lost with one edge "
+                "per pair"
+            )
+        return
+    snap = build_snapshot(args.graph, args.teams, args.out)
+    print(
+        f"Wrote {args.out} ({snap.num_nodes} nodes, {snap.num_edges} edges, "
+        f"{snap.num_games} games)"
+    )
+
+
+if __name__ == "__main__":
+    main()
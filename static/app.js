@@ -5,6 +5,57 @@ const statusEl = document.getElementById("status");
 const resultsEl = document.getElementById("results");
 const pathListEl = document.getElementById("path-list");
 const swapBtn = document.getElementById("swap");
+const teamListEl = document.getElementById("team-list");
+
+let suggestTimer = null;
+let suggestController = null;
+let allTeams = [];
+
+function showTeams(teams) {
+  teamListEl.innerHTML = "";
+  teams.forEach((match) => {
+    const option = document.createElement("option");
+    option.value = match.team;
+    if (match.matched && match.matched !== match.team) option.label = match.matched;
+    teamListEl.appendChild(option);
+  });
+}
+
+async function loadTeams() {
+  // Versioned URL: after the first visit the browser answers from its cache
+  const src = teamListEl?.dataset.src;
+  if (!src) return;
+  try {
+    const res = await fetch(src);
+    allTeams = (await res.json()).teams || [];
+    if (!teamListEl.children.length) showTeams(allTeams);
+  } catch (err) {
+    console.error(err);
+  }
+}
+
+function suggestTeams(event) {
+  const query = event.target.value.trim();
+  clearTimeout(suggestTimer);
+  if (!query) {
+    showTeams(allTeams);
+    return;
+  }
+  suggestTimer = setTimeout(async () => {
+    // Drop answers to keystrokes the user has already typed past
+    suggestController?.abort();
+    suggestController = new AbortController();
+    try {
+      const res = await fetch(`/api/teams/search?q=${encodeURIComponent(query)}`, {
+        signal: suggestController.signal,
+      });
+      const data = await res.json();
+      showTeams(data.results || []);
+    } catch (err) {
+      if (err.name !== "AbortError") console.error(err);
+    }
+  }, 120);
+}
 
 function setStatus(message, tone = "info") {
   if (!statusEl) return;
@@ -60,9 +111,9 @@ function renderPath(path, edges) {
     return;
   }
 
-  // Update description with actual team names
-  const fromTeam = teamAInput.value.trim();
-  const toTeam = teamBInput.value.trim();
+  // Update description with the team names the server resolved
+  const fromTeam = path[0];
+  const toTeam = path[path.length - 1];
   const descEl = document.getElementById("results-description");
   if (descEl) {
     descEl.textContent = `Shortest chain of victories from ${fromTeam} to ${toTeam}`;
@@ -114,11 +165,8 @@ async function handleSubmit(event) {
   resultsEl.classList.add("hidden");
 
   try {
-    const res = await fetch("/api/path", {
-      method: "POST",
-      headers: { "Content-Type": "application/json" },
-      body: JSON.stringify({ from, to }),
-    });
+    // GET, so the browser cache and CDNs can reuse the chain
+    const res = await fetch(`/api/path?${new URLSearchParams({ from, to })}`);
 
     const data = await res.json();
     if (!res.ok) {
@@ -129,7 +177,7 @@ async function handleSubmit(event) {
     if (data.llm_text) {
       const fromLogo = data.edges && data.edges.length > 0 ? data.edges[0].fromLogo : null;
       const toLogo = data.edges && data.edges.length > 0 ? data.edges[0].toLogo : null;
-      renderLLMExplanation(from, to, data.llm_text, fromLogo, toLogo);
+      renderLLMExplanation(data.path[0], data.path[1], data.llm_text, fromLogo, toLogo);
       setStatus("Generated explanation (no transitive path found)", "fallback");
     }
     else {
@@ -150,3 +198,6 @@ function handleSwap() {
 
 form?.addEventListener("submit", handleSubmit);
 swapBtn?.addEventListener("click", handleSwap);
+teamAInput?.addEventListener("input", suggestTeams);
+teamBInput?.addEventListener("input", suggestTeams);
+loadTeams();
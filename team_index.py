@@ -0,0 +1,324 @@
+"""Fuzzy team-name index for autocomplete and name resolution.
+
+Every team is indexed under its name, a few derived forms ("State" <-> "St",
+"St." <-> "Saint", name plus mascot, the mascot alone when no other team
+shares it) and curated aliases from ``data/aliases.json`` ("Bama", "Appalachian
+State"). Keys are normalized (case, accents, punctuation) and a query is
+ranked in tiers:
+
+1. exact key;
+2. prefix of a whole key, then prefix of any word inside a key, found by
+   bisecting one sorted array of word suffixes (a flat prefix trie);
+3. typo match: keys sharing the most trigrams with the query, reranked by
+   edit distance, counting a swap of adjacent letters as one edit.
+
+All structures are built once per worker; a query only bisects, counts a
+few trigram posting lists and runs edit distance on a dozen short keys.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+import unicodedata
+from bisect import bisect_left
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Key sources, best first: an alias never shadows another team's real name
+_NAME, _ALIAS, _DERIVED = 0, 1, 2
+# Tiers in the ranking, best first
+_EXACT, _PREFIX, _WORD_PREFIX, _FUZZY = 0, 1, 2, 3
+# Keys sharing trigrams with the query that get an edit-distance check
+_FUZZY_CANDIDATES = 12
+# Most results kept for one- and two-letter queries
+SHORT_QUERY_RESULTS = 25
+
+_DROP = re.compile(r"['’.&]")
+_SPACE = re.compile(r"[^a-z0-9]+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and punctuation, collapse whitespace."""
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(c for c in text if not unicodedata.combining(c))
+    text = text.lower()
+    # "Hawai'i" -> "hawaii", "Texas A&M" -> "texas am", "St." -> "st"
+    text = _DROP.sub("", text)
+    return _SPACE.sub(" ", text).strip()
+
+
+def _variants(key: str) -> list[str]:
+    """Spellings of ``key`` with State/St and Saint/St swapped."""
+    words = key.split()
+    out = []
+    for i, word in enumerate(words):
+        swap = None
+        if word == "state":
+            swap = "st"
+        elif word == "saint" and i == 0:
+            swap = "st"
+        elif word == "st":
+            swap = "saint" if i == 0 else "state"
+        if swap:
+            out.append(" ".join(words[:i] + [swap] + words[i + 1 :]))
+    return out
+
+
+def _trigrams(text: str, closed: bool = True) -> set[str]:
+    # Queries are open-ended (the user may still be typing), keys are not
+    padded = "  " + text + (" " if closed else "")
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distances(query: str, key: str, limit: int) -> tuple[int, int]:
+    """Return (distance to ``key``, distance to the closest prefix of ``key``).
+
+    Optimal string alignment distance: insertions, deletions, substitutions
+    and swaps of adjacent characters each cost one. Only a band of ``limit``
+    around the diagonal is filled, and any distance above ``limit`` is
+    reported as ``limit + 1``.
+    """
+    m = len(query)
+    over = limit + 1
+    prev2: list[int] = []
+    prev = [i if i <= limit else over for i in range(m + 1)]
+    best_prefix = prev[m]
+    prev_min = 0
+    for j in range(1, len(key) + 1):
+        cur = [over] * (m + 1)
+        col_min = cur[0] = j if j <= limit else over
+        kc = key[j - 1]
+        kp = key[j - 2] if j > 1 else ""
+        for i in range(max(1, j - limit), min(m, j + limit) + 1):
+            qc = query[i - 1]
+            d = prev[i - 1] if qc == kc else prev[i - 1] + 1
+            if prev[i] < d:
+                d = prev[i] + 1
+            if cur[i - 1] < d:
+                d = cur[i - 1] + 1
+            if qc == kp and i > 1 and query[i - 2] == kc and prev2[i - 2] < d:
+                d = prev2[i - 2] + 1
+            if d > over:
+                d = over
+            cur[i] = d
+            if d < col_min:
+                col_min = d
+        if cur[m] < best_prefix:
+            best_prefix = cur[m]
+        if col_min == over and prev_min == over:
+            # Every later cell builds on these two columns
+            return over, best_prefix
+        prev2, prev, prev_min = prev, cur, col_min
+    return prev[m], best_prefix
+
+
+def max_edits(query: str) -> int:
+    """Edits tolerated for a query of this length."""
+    return 1 if len(query) <= 5 else 2 if len(query) <= 10 else 3
+
+
+def load_aliases(path: Path | None) -> dict[str, list[str]]:
+    """Read ``{"Team Name": ["alias", ...]}``; a missing file means no aliases."""
+    if path is None or not Path(path).exists():
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class TeamIndex:
+    """Autocomplete and forgiving lookup over canonical team names."""
+
+    def __init__(
+        self,
+        names: list[str],
+        mascots: list[str | None] | None = None,
+        aliases: dict[str, list[str]] | None = None,
+    ):
+        self.names = list(names)
+        mascots = list(mascots) if mascots is not None else [None] * len(names)
+        by_name = {name: team for team, name in enumerate(self.names)}
+
+        # (key, team, text shown as the match, source)
+        entries: list[tuple[str, int, str, int]] = []
+        for team, name in enumerate(self.names):
+            entries.append((normalize(name), team, name, _NAME))
+        unknown = []
+        for name, team_aliases in (aliases or {}).items():
+            team = by_name.get(name)
+            if team is None:
+                unknown.append(name)
+                continue
+            for alias in team_aliases:
+                entries.append((normalize(alias), team, alias, _ALIAS))
+        if unknown:
+            logger.warning("Ignoring aliases for %d unknown teams", len(unknown))
+        mascot_keys = [normalize(mascot) if mascot else "" for mascot in mascots]
+        mascot_counts: dict[str, int] = {}
+        for mascot_key in mascot_keys:
+            mascot_counts[mascot_key] = mascot_counts.get(mascot_key, 0) + 1
+        for team, (name, mascot) in enumerate(zip(self.names, mascots)):
+            if mascot:
+                key = normalize(name) + " " + mascot_keys[team]
+                entries.append((key, team, name, _DERIVED))
+                if mascot_counts[mascot_keys[team]] == 1:
+                    entries.append((mascot_keys[team], team, mascot, _DERIVED))
+        for key, team, text, source in list(entries):
+            for variant in _variants(key):
+                entries.append((variant, team, text, max(source, _DERIVED)))
+
+        # A key resolves exactly when one team owns it at its best source
+        owners: dict[str, tuple[int, set[int]]] = {}
+        for key, team, _, source in entries:
+            best = owners.get(key)
+            if best is None or source < best[0]:
+                owners[key] = (source, {team})
+            elif source == best[0]:
+                best[1].add(team)
+        self._exact = {
+            key: next(iter(teams))
+            for key, (_, teams) in owners.items()
+            if len(teams) == 1
+        }
+
+        # Parallel arrays over deduplicated (key, team) entries
+        seen: set[tuple[str, int]] = set()
+        self._keys: list[str] = []
+        self._key_team: list[int] = []
+        self._key_text: list[str] = []
+        self._key_source: list[int] = []
+        for key, team, text, source in sorted(entries, key=lambda e: e[3]):
+            if not key or (key, team) in seen:
+                continue
+            seen.add((key, team))
+            self._keys.append(key)
+            self._key_team.append(team)
+            self._key_text.append(text)
+            self._key_source.append(source)
+
+        # Every word-start suffix of every key, sorted for prefix bisection
+        suffixes = []
+        for k, key in enumerate(self._keys):
+            suffixes.append((key, k))
+            for match in re.finditer(r" (?=\S)", key):
+                suffixes.append((key[match.end() :], k))
+        suffixes.sort()
+        self._suffixes = [s for s, _ in suffixes]
+        self._suffix_key = [k for _, k in suffixes]
+
+        self._postings: dict[str, list[int]] = {}
+        for k, key in enumerate(self._keys):
+            for gram in _trigrams(key):
+                self._postings.setdefault(gram, []).append(k)
+
+        # One- and two-letter queries match hundreds of suffixes; rank them
+        # once here instead of on every keystroke
+        self._short: dict[str, list[tuple[tuple, int]]] = {}
+        for prefix in {s[:n] for s in self._suffixes for n in (1, 2)}:
+            self._short[prefix] = self._prefix_matches(prefix)[:SHORT_QUERY_RESULTS]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _score(self, tier: int, dist: int, k: int) -> tuple:
+        key = self._keys[k]
+        return (tier, dist, self._key_source[k], len(key), key)
+
+    def _prefix_matches(self, q: str) -> list[tuple[tuple, int]]:
+        """Best (score, key) per team among keys with a word starting with ``q``."""
+        best: dict[int, tuple[tuple, int]] = {}
+        for j in range(bisect_left(self._suffixes, q), len(self._suffixes)):
+            suffix = self._suffixes[j]
+            if not suffix.startswith(q):
+                break
+            k = self._suffix_key[j]
+            key = self._keys[k]
+            if suffix != key:
+                tier = _WORD_PREFIX
+            else:
+                tier = _EXACT if key == q else _PREFIX
+            score = self._score(tier, 0, k)
+            team = self._key_team[k]
+            if team not in best or score < best[team][0]:
+                best[team] = (score, k)
+        return sorted(best.values())
+
+    def _fuzzy_matches(self, q: str) -> list[tuple[tuple, int]]:
+        """Best (score, key) per team among keys within a few edits of ``q``."""
+        allowed = max_edits(q)
+        grams = _trigrams(q, closed=False)
+        counts: dict[int, int] = {}
+        for gram in grams:
+            for k in self._postings.get(gram, ()):
+                counts[k] = counts.get(k, 0) + 1
+        # Each edit destroys at most three of the query's trigrams
+        needed = len(grams) - 3 * allowed
+        candidates = sorted(
+            (k for k, c in counts.items() if c >= needed),
+            key=lambda k: (-counts[k], len(self._keys[k])),
+        )
+        best: dict[int, tuple[tuple, int]] = {}
+        for k in candidates[:_FUZZY_CANDIDATES]:
+            # Later characters can only push the prefix distance up
+            _, dist = edit_distances(q, self._keys[k][: len(q) + allowed], allowed)
+            if dist > allowed:
+                continue
+            score = self._score(_FUZZY, dist, k)
+            team = self._key_team[k]
+            if team not in best or score < best[team][0]:
+                best[team] = (score, k)
+        return sorted(best.values())
+
+    def _ranked(self, q: str) -> list[tuple[tuple, int]]:
+        if len(q) <= 2:
+            return self._short.get(q, [])
+        # Typos are only considered once nothing matches as typed
+        return self._prefix_matches(q) or self._fuzzy_matches(q)
+
+    def search(self, query: str, limit: int = 10) -> list[tuple[str, str]]:
+        """Return up to ``limit`` (team name, matched name or alias), best first."""
+        q = normalize(query)
+        if not q or limit <= 0:
+            return []
+        return [
+            (self.names[self._key_team[k]], self._key_text[k])
+            for _, k in self._ranked(q)[:limit]
+        ]
+
+    def resolve(self, query: str) -> str | None:
+        """Return the one team ``query`` clearly names, or None if unsure.
+
+        Exact names and aliases always resolve. Otherwise a prefix of whole
+        names resolves when it matches a single team ("vanderb"), and a typo
+        resolves when one team is strictly closer than every other
+        ("Gerogia").
+        """
+        q = normalize(query)
+        if not q:
+            return None
+        team = self._exact.get(q)
+        if team is not None:
+            return self.names[team]
+        if len(q) < 3:
+            return None
+
+        prefixed = self._prefix_matches(q)
+        if prefixed:
+            # Matches inside a name ("carol") are too loose to pick from
+            whole = [k for score, k in prefixed if score[0] == _PREFIX]
+            if len(whole) == 1 and len(prefixed) == 1:
+                return self.names[self._key_team[whole[0]]]
+            return None
+
+        allowed = max_edits(q)
+        scored = sorted(
+            (edit_distances(q, self._keys[k], allowed)[0], self._key_team[k])
+            for _, k in self._fuzzy_matches(q)
+        )
+        scored = [(d, team) for d, team in scored if d <= allowed]
+        if not scored or (len(scored) > 1 and scored[1][0] == scored[0][0]):
+            return None
+        return self.names[scored[0][1]]
@@ -1,11 +1,41 @@
 """Fixtures for testing."""
 
 import pickle
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 
 import networkx as nx
 import pytest
 
+from snapshot import GraphSnapshot
+
+
+@pytest.fixture(autouse=True)
+def isolated_llm_cache(tmp_path, monkeypatch):
+    """Keep the explanation cache out of the real data directory."""
+    path = tmp_path / "llm_cache.sqlite3"
+    monkeypatch.setattr("config.Config.LLM_CACHE_PATH", str(path))
+    return path
+
+
+class FakeGenAIClient:
+    """Offline stand-in for ``genai.Client`` that records each call."""
+
+    def __init__(self, text="The Bulldog simply wants it more."):
+        self.text = text
+        self.calls = []
+        self.models = self
+
+    def generate_content(self, model, config, contents):
+        self.calls.append({"model": model, "contents": contents})
+        return SimpleNamespace(text=self.text)
+
+
+@pytest.fixture
+def fake_genai_client():
+    """Create a fake genai client."""
+    return FakeGenAIClient()
+
 
 @pytest.fixture
 def mock_graph():
@@ -84,6 +114,12 @@ def mock_teams_data():
     ]
 
 
+@pytest.fixture
+def mock_snapshot(mock_graph, mock_teams_data):
+    """Flatten the mock graph into an in-memory snapshot."""
+    return GraphSnapshot.from_networkx(mock_graph, mock_teams_data)
+
+
 @pytest.fixture
 def temp_graph_file(tmp_path, mock_graph):
     """Write a temporary GEXF graph file."""
@@ -110,6 +146,8 @@ def mock_llm_service():
         "ferocity and size of the mascot would overwhelm the Jumbo. "
         "A bulldog would never back down from a fight."
     )
+    mock_service.model = "gemini-test"
+    mock_service.prompt_hash.side_effect = lambda victor, loser: f"{victor}|{loser}"
     return mock_service
 
 
@@ -126,7 +164,15 @@ def app(temp_graph_file, temp_teams_file, monkeypatch):
     # Disable LLM functionality by default
     monkeypatch.setattr("config.Config.GRAPH_PATH", temp_graph_file)
     monkeypatch.setattr("config.Config.TEAMS_PATH", temp_teams_file)
+    monkeypatch.setattr(
+        "config.Config.SNAPSHOT_PATH", temp_graph_file.with_suffix(".snap")
+    )
+    monkeypatch.setattr(
+        "config.Config.RANKINGS_PATH", temp_graph_file.with_suffix(".rankings")
+    )
     monkeypatch.setattr("config.Config.GEMINI_API_KEY", None)
+    # No watcher threads; test_reload drives reloads directly
+    monkeypatch.setattr("config.Config.RELOAD_INTERVAL", 0)
 
     from app import create_app
 
@@ -1,7 +1,11 @@
 """Tests for Flask app routes and API."""
 
+import gzip
+import json
 from unittest.mock import patch
 
+import pytest
+
 
 class TestFlaskApp:
     """Test suite for Flask app routes."""
@@ -28,6 +32,25 @@ class TestFlaskApp:
         assert data["path"] == ["Alabama", "Georgia", "Auburn"]
         assert len(data["edges"]) == 2
 
+    def test_metrics_endpoint(self, client):
+        """Test that /metrics counts requests per endpoint and status class."""
+        text = client.get("/metrics").get_data(as_text=True)
+        assert "# TYPE qed_http_request_seconds histogram" in text
+        assert "# TYPE qed_path_queries_total counter" in text
+
+        def requests(endpoint, status):
+            series = (
+                f'qed_http_requests_total{{endpoint="{endpoint}",status="{status}"}}'
+            )
+            text = client.get("/metrics").get_data(as_text=True)
+            return float(text.split(series + " ")[1].split()[0])
+
+        ok, bad = requests("api_path", "2xx"), requests("api_path", "4xx")
+        client.post("/api/path", json={"from": "Alabama", "to": "Auburn"})
+        client.post("/api/path", json={"from": "Alabama", "to": "Alabama"})
+        assert requests("api_path", "2xx") == ok + 1
+        assert requests("api_path", "4xx") == bad + 1
+
     def test_api_path_unknown_team(self, client):
         """Test API path endpoint with unknown team."""
         payload = {"from": "Unknown Team", "to": "Alabama"}
@@ -127,3 +150,274 @@ class TestFlaskApp:
             # Just check that links exist, not that they necessarily match the team
             assert edge["fromLogo"]
             assert edge["toLogo"]
+
+    def test_api_paths_batch_streams_ndjson(self, client):
+        """Test that the batch endpoint streams one JSON line per pair."""
+        payload = {
+            "pairs": [
+                {"from": "Alabama", "to": "Auburn"},
+                ["Georgia", "Vanderbilt"],
+                {"from": "Alabama", "to": "Nowhere State"},
+                "not a pair",
+            ]
+        }
+        rsp = client.post("/api/paths/batch", json=payload)
+        assert rsp.status_code == 200
+        assert rsp.mimetype == "application/x-ndjson"
+        lines = [json.loads(line) for line in rsp.data.decode().splitlines()]
+        by_index = {line["index"]: line for line in lines}
+        assert sorted(by_index) == [0, 1, 2, 3]
+        assert by_index[0]["path"] == ["Alabama", "Georgia", "Auburn"]
+        assert by_index[1]["path"] == ["Georgia", "Auburn", "Vanderbilt"]
+        assert "error" in by_index[2]
+        assert "error" in by_index[3]
+
+    def test_api_paths_batch_non_string_names(self, client):
+        """Test that names of the wrong type fail on their own line."""
+        payload = {
+            "pairs": [["Alabama", "Georgia"], [1, 2], {"from": ["Alabama"], "to": 3}]
+        }
+        rsp = client.post("/api/paths/batch", json=payload)
+        assert rsp.status_code == 200
+        lines = [json.loads(line) for line in rsp.data.decode().splitlines()]
+        by_index = {line["index"]: line for line in lines}
+        assert by_index[0]["path"] == ["Alabama", "Georgia"]
+        for index in (1, 2):
+            assert by_index[index]["error"] == "Unknown team name provided."
+            assert by_index[index]["from"] is None
+
+    def test_api_paths_batch_rejects_bad_payload(self, client, monkeypatch):
+        """Test that a missing or oversized pairs list is a 400."""
+        rsp = client.post("/api/paths/batch", json={})
+        assert rsp.status_code == 400
+        monkeypatch.setattr("config.Config.BATCH_MAX_PAIRS", 1)
+        pairs = [["Alabama", "Auburn"], ["Georgia", "Auburn"]]
+        rsp = client.post("/api/paths/batch", json={"pairs": pairs})
+        assert rsp.status_code == 400
+
+    def test_api_reach_paginates(self, client):
+        """Test that the reach endpoint pages through the tree."""
+        rsp = client.get("/api/reach?team=Georgia&limit=2")
+        assert rsp.status_code == 200
+        data = rsp.get_json()
+        assert data["reachable"] == 3
+        assert [node["team"] for node in data["nodes"]] == ["Auburn", "Vanderbilt"]
+        rsp = client.get("/api/reach?team=Georgia&offset=2&limit=2")
+        assert [node["team"] for node in rsp.get_json()["nodes"]] == ["Alabama"]
+
+    def test_api_reach_bad_request(self, client):
+        """Test that unknown teams and bad paging arguments are a 400."""
+        assert client.get("/api/reach?team=Nowhere").status_code == 400
+        assert client.get("/api/reach?team=Georgia&limit=x").status_code == 400
+
+    def test_api_rankings_sorts_and_paginates(self, client):
+        """Test that rankings sort by the requested key, one page at a time."""
+        rsp = client.get("/api/rankings?sort=avg_chain&limit=2")
+        assert rsp.status_code == 200
+        data = rsp.get_json()
+        assert (data["sort"], data["order"], data["total"]) == ("avg_chain", "asc", 5)
+        assert [(t["rank"], t["team"]) for t in data["teams"]] == [
+            (1, "Auburn"),
+            (2, "Georgia"),
+        ]
+        assert data["teams"][0]["reach"] == 3
+        assert data["teams"][0]["logo"].endswith("auburn-logo.png")
+        rsp = client.get("/api/rankings?sort=reach&order=asc&offset=4")
+        [last] = rsp.get_json()["teams"]
+        assert (last["rank"], last["team"], last["reach"]) == (5, "Georgia", 3)
+        default = client.get("/api/rankings").get_json()
+        assert default["sort"] == "dominance"
+        scores = [t["dominance"] for t in default["teams"]]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_api_rankings_bad_request(self, client):
+        """Test that unknown keys, orders and paging arguments are a 400."""
+        assert client.get("/api/rankings?sort=wins").status_code == 400
+        assert client.get("/api/rankings?order=up").status_code == 400
+        assert client.get("/api/rankings?limit=x").status_code == 400
+
+    def test_api_teams_search(self, client):
+        """Test that team search returns ranked matches."""
+        rsp = client.get("/api/teams/search?q=geo")
+        assert rsp.status_code == 200
+        data = rsp.get_json()
+        assert data["results"][0]["team"] == "Georgia"
+        rsp = client.get("/api/teams/search?q=zzzz")
+        assert rsp.get_json()["results"] == []
+        assert client.get("/api/teams/search?q=a&limit=x").status_code == 400
+
+    def test_api_stats_reports_path_cache(self, client):
+        """Test that the stats endpoint reports path cache counters."""
+        payload = {"from": "Alabama", "to": "Auburn"}
+        client.post("/api/path", json=payload)
+        client.post("/api/path", json=payload)
+        rsp = client.get("/api/stats")
+        assert rsp.status_code == 200
+        stats = rsp.get_json()["path_cache"]
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["size"] == 1
+
+    def test_api_status_reports_graph(self, client, app):
+        """Test that the status endpoint reports the live graph version."""
+        rsp = client.get("/api/status")
+        assert rsp.status_code == 200
+        status = rsp.get_json()["graph"]
+        assert status["version"] == app.extensions["graph_reloader"].version
+        assert (status["nodes"], status["edges"]) == (5, 4)
+        assert status["last_error"] is None
+
+    def test_api_paths_alternatives(self, client):
+        """Test that alternatives come back with a completeness flag."""
+        rsp = client.post(
+            "/api/paths/alternatives", json={"from": "Alabama", "to": "Auburn", "k": 2}
+        )
+        assert rsp.status_code == 200
+        data = rsp.get_json()
+        assert data["complete"]
+        assert data["paths"][0]["path"] == ["Alabama", "Georgia", "Auburn"]
+
+    def test_api_paths_alternatives_bad_request(self, client):
+        """Test that malformed filters and unknown teams are rejected."""
+        bad = {"from": "Alabama", "to": "Auburn", "exclude_seasons": ["2020"]}
+        assert client.post("/api/paths/alternatives", json=bad).status_code == 400
+        unknown = {"from": "Alabama", "to": "Nowhere"}
+        assert client.post("/api/paths/alternatives", json=unknown).status_code == 400
+
+    @pytest.mark.parametrize(
+        "changes",
+        [
+            {"exclude_teams": [5]},
+            {"exclude_teams": ["Auburn", None]},
+            {"from": 1},
+            {"to": ["Vanderbilt"]},
+            {"k": True},
+            {"exclude_seasons": [False]},
+        ],
+    )
+    def test_api_paths_alternatives_wrong_types(self, client, changes):
+        """Test that values of the wrong type are a 400, not a crash."""
+        payload = {"from": "Georgia", "to": "Vanderbilt", **changes}
+        rsp = client.post("/api/paths/alternatives", json=payload)
+        assert rsp.status_code == 400
+        assert rsp.get_json()["error"].startswith("Expected")
+
+    def test_api_path_window(self, client):
+        """Test that a season window limits the chain and bad windows are rejected."""
+        payload = {"from": "Georgia", "to": "Alabama", "window": {"from": 2024}}
+        rsp = client.post("/api/path", json=payload)
+        assert rsp.get_json()["path"] == ["Georgia", "Auburn", "Alabama"]
+        payload["window"] = {"from": 2025}
+        assert client.post("/api/path", json=payload).status_code == 400
+        payload["window"] = {"week": 8}
+        rsp = client.post("/api/path", json=payload)
+        assert rsp.status_code == 400
+        assert "window" in rsp.get_json()["error"]
+        # The mock graph, like the notebook's, has no week data
+        payload["window"] = {"to": 2025, "week": 8}
+        rsp = client.post("/api/path", json=payload)
+        assert rsp.status_code == 400
+        assert (
+            rsp.get_json()["error"] == "Week filters are not available for this graph."
+        )
+
+
+class TestHttpCaching:
+    """Test suite for ETags and Cache-Control on cacheable responses."""
+
+    def test_home_revalidates(self, client, app):
+        """Test that the index page links the versioned team list and 304s."""
+        rsp = client.get("/")
+        version = app.extensions["graph_reloader"].version[:20]
+        assert f"/api/teams?v={version}".encode() in rsp.data
+        assert rsp.headers["Cache-Control"] == "no-cache"
+        etag = rsp.headers["ETag"]
+        again = client.get("/", headers={"If-None-Match": etag})
+        assert again.status_code == 304
+        assert not again.data
+        assert again.headers["ETag"] == etag
+
+    def test_teams_asset(self, client, app):
+        """Test that the team list is compressed, versioned and conditional."""
+        version = app.extensions["graph_reloader"].version[:20]
+        rsp = client.get(f"/api/teams?v={version}", headers={"Accept-Encoding": "gzip"})
+        assert rsp.headers["Content-Encoding"] == "gzip"
+        assert rsp.headers["Vary"] == "Accept-Encoding"
+        assert "immutable" in rsp.headers["Cache-Control"]
+        data = json.loads(gzip.decompress(rsp.data))
+        assert data["version"] == version
+        assert [team["team"] for team in data["teams"]] == [
+            "Alabama",
+            "Auburn",
+            "Georgia",
+            "Tufts",
+            "Vanderbilt",
+        ]
+        assert data["teams"][0]["logo"].endswith("alabama-logo.png")
+
+        plain = client.get("/api/teams")
+        assert "Content-Encoding" not in plain.headers
+        assert plain.headers["Cache-Control"] == "no-cache"
+        assert plain.get_json() == data
+        assert plain.headers["ETag"] != rsp.headers["ETag"]
+        again = client.get(
+            "/api/teams", headers={"If-None-Match": plain.headers["ETag"]}
+        )
+        assert again.status_code == 304
+
+    def test_get_path_matches_post(self, client):
+        """Test that the GET variant answers like POST, with validators."""
+        rsp = client.get("/api/path?from=Georgia&to=Alabama&window_from=2024")
+        posted = client.post(
+            "/api/path",
+            json={"from": "Georgia", "to": "Alabama", "window": {"from": 2024}},
+        )
+        assert rsp.get_json() == posted.get_json()
+        assert rsp.headers["ETag"]
+        assert rsp.headers["Cache-Control"].startswith("public, max-age=")
+        assert "ETag" not in posted.headers
+        bad = client.get("/api/path?from=Georgia&to=Alabama&window_week=8")
+        assert bad.status_code == 400
+        assert bad.headers["Cache-Control"] == "no-store"
+
+    def test_get_path_304_skips_search(self, client, app):
+        """Test that a matching If-None-Match is answered without a search."""
+        rsp = client.get("/api/path?from=Alabama&to=Auburn")
+        service = app.extensions["graph_reloader"].service
+        with patch.object(service, "find_path", side_effect=AssertionError):
+            again = client.get(
+                "/api/path?from=Alabama&to=Auburn",
+                headers={"If-None-Match": rsp.headers["ETag"]},
+            )
+        assert again.status_code == 304
+        assert again.headers["Cache-Control"] == rsp.headers["Cache-Control"]
+
+    def test_get_path_validates_before_304(self, client):
+        """Test that a bad window is a 400 even with a matching ETag."""
+        etag = client.get("/api/path?from=Alabama&to=Auburn").headers["ETag"]
+        rsp = client.get(
+            "/api/path?from=Alabama&to=Auburn&window_from=soon",
+            headers={"If-None-Match": etag},
+        )
+        assert rsp.status_code == 400
+
+    def test_etag_changes_with_aliases(self, client, tmp_path, monkeypatch):
+        """Test that new aliases on the same graph invalidate cached chains."""
+        url = "/api/path?from=Alabama&to=Auburn"
+        etag = client.get(url).headers["ETag"]
+        aliases = tmp_path / "aliases.json"
+        aliases.write_text(json.dumps({"Alabama": ["Bama"]}))
+        monkeypatch.setattr("config.Config.TEAM_ALIASES_PATH", aliases)
+
+        from app import create_app
+
+        rsp = create_app().test_client().get(url, headers={"If-None-Match": etag})
+        assert rsp.status_code == 200
+        assert rsp.headers["ETag"] != etag
+
+    def test_get_path_fallbacks_not_cached(self, client):
+        """Test that explanations and errors carry no ETag."""
+        rsp = client.get("/api/path?from=Alabama&to=Tufts")
+        assert rsp.status_code == 400
+        assert "ETag" not in rsp.headers
+        assert rsp.headers["Cache-Control"] == "no-store"
@@ -0,0 +1,38 @@
+"""Tests for atomic file replacement."""
+
+import pytest
+
+from atomic_file import atomic_open, atomic_write
+
+
+class TestAtomicFile:
+    """Test suite for atomic_open and atomic_write."""
+
+    def test_replaces_contents(self, tmp_path):
+        """Test that a write replaces the file and leaves no temp file."""
+        path = tmp_path / "data.bin"
+        path.write_bytes(b"old")
+        atomic_write(path, b"new")
+        assert path.read_bytes() == b"new"
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_failure_keeps_old_contents(self, tmp_path):
+        """Test that an error inside the block leaves the file untouched."""
+        path = tmp_path / "data.bin"
+        path.write_bytes(b"old")
+        with pytest.raises(RuntimeError):
+            with atomic_open(path) as f:
+                f.write(b"partial")
+                raise RuntimeError("boom")
+        assert path.read_bytes() == b"old"
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_concurrent_writers_use_distinct_temp_files(self, tmp_path):
+        """Test that two open writers of one path do not share a temp file."""
+        path = tmp_path / "data.bin"
+        with atomic_open(path) as first, atomic_open(path) as second:
+            assert first.name != second.name
+            first.write(b"first")
+            second.write(b"second")
+        assert path.read_bytes() == b"first"
+        assert list(tmp_path.iterdir()) == [path]
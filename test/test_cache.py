@@ -0,0 +1,84 @@
+"""Tests for the LRU cache and path result caching."""
+
+import pytest
+
+from cache import LRUCache
+from graph_service import GraphService
+
+
+class TestLRUCache:
+    """Test suite for LRUCache."""
+
+    def test_hit_and_miss_counters(self):
+        """Test that lookups are counted as hits or misses."""
+        cache = LRUCache(2)
+        assert cache.get("a") is None
+        cache.put("a", 1)
+        assert cache.get("a") == 1
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest untouched entry is evicted first."""
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.evictions == 1
+        assert len(cache) == 2
+
+    def test_zero_size_disables(self):
+        """Test that a zero-size cache stores nothing."""
+        cache = LRUCache(0)
+        cache.put("a", 1)
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_negative_size_rejected(self):
+        """Test that a negative size raises ValueError."""
+        with pytest.raises(ValueError):
+            LRUCache(-1)
+
+
+class TestPathCache:
+    """Test suite for GraphService path result caching."""
+
+    def test_repeat_query_hits_cache(self, temp_graph_file, temp_teams_file):
+        """Test that a repeated pair is served from the cache."""
+        service = GraphService(temp_graph_file, temp_teams_file)
+        first = service.find_path("Alabama", "Auburn")
+        second = service.find_path("  ALABAMA ", "auburn")
+        assert second is first
+        assert service.path_cache.hits == 1
+        assert service.path_cache.misses == 1
+
+    def test_errors_are_not_cached(self, temp_graph_file, temp_teams_file):
+        """Test that failed lookups do not populate the cache."""
+        service = GraphService(temp_graph_file, temp_teams_file)
+        service.find_path("Alabama", "Tufts")
+        service.find_path("Unknown", "Alabama")
+        assert len(service.path_cache) == 0
+
+    def test_new_service_starts_cold(self, temp_graph_file, temp_teams_file):
+        """Test that reloading the graph does not reuse cached results."""
+        service = GraphService(temp_graph_file, temp_teams_file)
+        service.find_path("Alabama", "Auburn")
+        reloaded = GraphService(temp_graph_file, temp_teams_file)
+        assert len(reloaded.path_cache) == 0
+
+    def test_cache_size_from_config(
+        self, temp_graph_file, temp_teams_file, monkeypatch
+    ):
+        """Test that PATH_CACHE_SIZE bounds the cache."""
+        monkeypatch.setattr("config.Config.PATH_CACHE_SIZE", 1)
+        service = GraphService(temp_graph_file, temp_teams_file)
+        service.find_path("Alabama", "Auburn")
+        service.find_path("Georgia", "Alabama")
+        assert len(service.path_cache) == 1
+        assert service.path_cache.evictions == 1
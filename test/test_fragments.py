@@ -0,0 +1,51 @@
+"""Tests for pre-encoded edge fragments and response bodies."""
+
+import json
+
+import pytest
+
+import fragments
+from fragments import EdgeFragments, dumps
+from graph_service import GameFilter, GraphService
+
+
+class TestEdgeFragments:
+    """Test suite for EdgeFragments and the bodies built from them."""
+
+    def test_fragments_match_edge_payloads(self, temp_graph_file, temp_teams_file):
+        """Test that each fragment encodes the edge dict find_path builds."""
+        service = GraphService(temp_graph_file, temp_teams_file)
+        snap = service.snapshot
+        edges = EdgeFragments(snap)
+        assert len(edges) == snap.num_edges
+        for u in range(snap.num_nodes):
+            for e in range(snap.offsets[u], snap.offsets[u + 1]):
+                [payload] = service._path_edges([u, snap.targets[e]])
+                assert json.loads(edges[e]) == payload
+
+    def test_body_matches_result(self, temp_graph_file, temp_teams_file):
+        """Test that a chain's prebuilt body decodes to its own fields."""
+        service = GraphService(temp_graph_file, temp_teams_file)
+        result = service.find_path("Alabama", "Vanderbilt")
+        assert json.loads(result.body) == {
+            "path": result.path_names,
+            "edges": result.edges,
+            "llm_text": None,
+        }
+        assert service.find_path("Alabama", "Vanderbilt").body is result.body
+
+    def test_windowed_chain_has_no_body(self, temp_graph_file, temp_teams_file):
+        """Test that a window's game labels are not taken from the fragments."""
+        service = GraphService(temp_graph_file, temp_teams_file)
+        result = service.find_path("Georgia", "Alabama", GameFilter(first_season=2024))
+        assert result.edges
+        assert result.body is None
+
+    def test_stdlib_fallback_matches_orjson(self, monkeypatch):
+        """Test that the json fallback encodes exactly like orjson."""
+        if fragments.orjson is None:
+            pytest.skip("orjson is not installed")
+        value = {"path": ["Texas A&M", "São Paulo"], "n": 3, "x": None}
+        fast = dumps(value)
+        monkeypatch.setattr(fragments, "orjson", None)
+        assert dumps(value) == fast
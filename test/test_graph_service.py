@@ -1,10 +1,11 @@
 """Tests for GraphService."""
 
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
+import networkx as nx
 import pytest
 
-from graph_service import GraphService, PathResult
+from graph_service import NO_WEEKS_MESSAGE, GameFilter, GraphService, PathResult
 
 
 class TestGraphService:
@@ -80,6 +81,21 @@ class TestGraphService:
         assert result.llm_text is None
         assert not result.edges
 
+    def test_unreachable_pair_skips_search(
+        self, temp_graph_file, temp_teams_file, monkeypatch
+    ):
+        """Test that a pair with no chain never reaches the path engine."""
+        monkeypatch.setattr("config.Config.GEMINI_API_KEY", None)
+        service = GraphService(temp_graph_file, temp_teams_file)
+        engine = MagicMock(wraps=service._engine)
+        service._engine = engine
+        assert service.find_path("Alabama", "Tufts").error
+        assert dict(service.find_paths([("Georgia", "Tufts"), ("Tufts", "Auburn")]))
+        engine.shortest_path.assert_not_called()
+        engine.shortest_path_tree.assert_not_called()
+        assert service.find_path("Alabama", "Auburn").path_names
+        engine.shortest_path.assert_called_once()
+
     def test_find_path_no_path_with_llm(
         self, temp_graph_file, temp_teams_file, mock_llm_service, monkeypatch
     ):
@@ -118,6 +134,139 @@ class TestGraphService:
         assert len(result.edges) == 2
         assert "(2024)" in result.edges[1]["label"]
 
+    def test_find_paths_matches_find_path(self, temp_graph_file, temp_teams_file):
+        """Test that batched results match single queries for every pair."""
+        service = GraphService(temp_graph_file, temp_teams_file)
+        pairs = [
+            ("Alabama", "Auburn"),
+            ("Alabama", "Vanderbilt"),
+            ("Georgia", "Alabama"),
+            ("Auburn", "Georgia"),
+        ]
+        results = dict(service.find_paths(pairs))
+        assert sorted(results) == [0, 1, 2, 3]
+        service.path_cache.clear()
+        for i, pair in enumerate(pairs):
+            assert results[i].path_names == service.find_path(*pair).path_names
+
+    def test_find_paths_one_search_per_source(self, temp_graph_file, temp_teams_file):
+        """Test that pairs sharing a source run a single tree search."""
+        service = GraphService(temp_graph_file, temp_teams_file)
+        pairs = [("Alabama", "Georgia"), ("Alabama", "Auburn"), ("Georgia", "Auburn")]
+        with (
+            patch.object(
+                service._engine,
+                "shortest_path_tree",
+                wraps=service._engine.shortest_path_tree,
+            ) as tree,
+            patch.object(
+                service._engine, "shortest_path", wraps=service._engine.shortest_path
+            ) as single,
+        ):
+            list(service.find_paths(pairs))
+        assert tree.call_count == 1
+        assert single.call_count == 1
+
+    def test_find_paths_errors_are_per_pair(
+        self, temp_graph_file, temp_teams_file, monkeypatch
+    ):
+        """Test that bad pairs report errors without failing the batch."""
+        monkeypatch.setattr("config.Config.GEMINI_API_KEY", None)
+        service = GraphService(temp_graph_file, temp_teams_file)
+        pairs = [
+            ("Alabama", "Nowhere State"),
+            ("Alabama", "Alabama"),
+            ("Alabama", "Tufts"),
+            ("Alabama", "Auburn"),
+        ]
+        results = dict(service.find_paths(pairs))
+        assert results[0].error == "Unknown team name provided."
+        assert "different teams" in results[1].error
+        assert results[2].error == "No victory chain exists."
+        assert results[3].error is None
+
+    def test_find_paths_skips_llm_unless_explaining(
+        self, temp_graph_file, temp_teams_file, mock_llm_service, monkeypatch
+    ):
+        """Test that batches only call the LLM when explain is set."""
+        monkeypatch.setattr("config.Config.GEMINI_API_KEY", "test-key")
+        with patch("graph_service.LLMService", return_value=mock_llm_service):
+            service = GraphService(temp_graph_file, temp_teams_file)
+            [(_, result)] = service.find_paths([("Alabama", "Tufts")])
+            assert result.error is not None
+            mock_llm_service.generate_response.assert_not_called()
+
+            [(_, result)] = service.find_paths([("Alabama", "Tufts")], explain=True)
+            assert "sheer ferocity" in result.llm_text
+            # Now cached, so a plain batch serves it without another call
+            [(_, result)] = service.find_paths([("Alabama", "Tufts")])
+            assert "sheer ferocity" in result.llm_text
+            assert mock_llm_service.generate_response.call_count == 1
+
+    def test_find_paths_caps_new_explanations(
+        self, temp_graph_file, temp_teams_file, mock_llm_service, monkeypatch
+    ):
+        """Test that explain_limit bounds the LLM calls a batch may wait on."""
+        monkeypatch.setattr("config.Config.GEMINI_API_KEY", "test-key")
+        with patch("graph_service.LLMService", return_value=mock_llm_service):
+            service = GraphService(temp_graph_file, temp_teams_file)
+            [(_, result)] = service.find_paths([("Alabama", "Tufts")], explain=True)
+            assert result.llm_text
+            pairs = [
+                ("Alabama", "Tufts"),
+                ("Georgia", "Tufts"),
+                ("Auburn", "Tufts"),
+                ("Vanderbilt", "Tufts"),
+            ]
+            results = dict(service.find_paths(pairs, explain=True, explain_limit=2))
+        # The stored explanation does not use up the limit
+        assert [results[i].llm_text is not None for i in range(4)] == [
+            True,
+            True,
+            True,
+            False,
+        ]
+        assert results[3].error == "No victory chain exists."
+        assert mock_llm_service.generate_response.call_count == 3
+
+    def test_reach_tree_parents_and_season_depth(
+        self, temp_graph_file, temp_teams_file
+    ):
+        """Test that the reach tree links each team to its parent in the chain."""
+        service = GraphService(temp_graph_file, temp_teams_file)
+        tree = service.reach_tree("Georgia")
+        assert tree.error is None
+        nodes = {node["team"]: node for node in tree.nodes}
+        assert set(nodes) == {"Auburn", "Vanderbilt", "Alabama"}
+        assert nodes["Vanderbilt"]["parent"] == "Auburn"
+        assert nodes["Vanderbilt"]["hops"] == 2
+        # Reaching Alabama needs last season's Auburn win
+        assert nodes["Alabama"]["seasons_back"] == 1
+        assert "(2024)" in nodes["Alabama"]["label"]
+        assert tree.by_season_depth == [
+            {"seasons_back": 0, "teams": 2},
+            {"seasons_back": 1, "teams": 1},
+        ]
+
+    def test_reach_tree_matches_find_path(self, temp_graph_file, temp_teams_file):
+        """Test that walking parents reproduces find_path for every team."""
+        service = GraphService(temp_graph_file, temp_teams_file)
+        tree = service.reach_tree("Alabama")
+        parents = {node["team"]: node["parent"] for node in tree.nodes}
+        for team in parents:
+            chain = [team]
+            while chain[-1] != "Alabama":
+                chain.append(parents[chain[-1]])
+            assert chain[::-1] == service.find_path("Alabama", team).path_names
+
+    def test_reach_tree_unknown_and_isolated(self, temp_graph_file, temp_teams_file):
+        """Test unknown teams error and isolated teams reach nobody."""
+        service = GraphService(temp_graph_file, temp_teams_file)
+        assert service.reach_tree("Nowhere State").error is not None
+        tree = service.reach_tree("Tufts")
+        assert tree.error is None
+        assert tree.nodes == []
+
     def test_path_result_dataclass(self):
         """Test PathResult dataclass structure."""
         result = PathResult(
@@ -130,3 +279,93 @@ class TestGraphService:
         assert len(result.edges) == 1
         assert result.error is None
         assert result.llm_text is None
+
+
+class TestAlternativePaths:
+    """Test suite for GraphService.alternative_paths."""
+
+    @pytest.fixture
+    def service(self, tmp_path, mock_graph, temp_teams_file):
+        """A service whose Alabama -> Vanderbilt has two chains."""
+        mock_graph.add_edge("1", "3", weight=1, label="Georgia def. Vanderbilt")
+        graph_path = tmp_path / "diamond.gexf"
+        nx.write_gexf(mock_graph, graph_path)
+        return GraphService(graph_path, temp_teams_file)
+
+    def test_k_chains_best_first(self, service):
+        """Test that both chains are returned, shortest first."""
+        result = service.alternative_paths("Alabama", "Vanderbilt", 3)
+        assert result.complete
+        assert [p["path"] for p in result.paths] == [
+            ["Alabama", "Georgia", "Vanderbilt"],
+            ["Alabama", "Georgia", "Auburn", "Vanderbilt"],
+        ]
+        assert result.paths[1]["edges"][1]["label"] == "Georgia def. Auburn"
+
+    def test_exclude_teams(self, service):
+        """Test that an excluded team is never part of a chain."""
+        result = service.alternative_paths(
+            "Alabama", "Vanderbilt", 3, exclude_teams=["auburn"]
+        )
+        assert [p["path"] for p in result.paths] == [
+            ["Alabama", "Georgia", "Vanderbilt"]
+        ]
+        assert service.alternative_paths(
+            "Alabama", "Vanderbilt", 3, exclude_teams=["Alabama"]
+        ).error
+
+    def test_exclude_seasons(self, service):
+        """Test that games from an excluded season are not used."""
+        assert service.latest_season == 2025
+        result = service.alternative_paths("Georgia", "Alabama", 3)
+        assert [p["seasons_back"] for p in result.paths] == [1]
+        window = GameFilter(exclude_seasons=frozenset({2024}))
+        result = service.alternative_paths("Georgia", "Alabama", 3, window=window)
+        assert result.paths == [] and result.error is None
+
+
+class TestGameWindows:
+    """Test suite for season-windowed path queries."""
+
+    def test_game_filter_allows(self):
+        """Test season bounds, the as-of week and excluded seasons."""
+        window = GameFilter(first_season=2023, last_season=2025, last_week=8)
+        assert window.allows(2024, 200)
+        assert window.allows(2025, 8)
+        assert not window.allows(2025, 9)
+        assert not window.allows(2022, 1)
+        assert not GameFilter(exclude_seasons=frozenset({2024})).allows(2024, 1)
+
+    def test_window_limits_the_search(self, temp_graph_file, temp_teams_file):
+        """Test that a chain needing an older game disappears from the window."""
+        service = GraphService(temp_graph_file, temp_teams_file)
+        full = service.find_path("Georgia", "Alabama")
+        assert full.path_names == ["Georgia", "Auburn", "Alabama"]
+        both = service.find_path("Georgia", "Alabama", GameFilter(first_season=2024))
+        assert both == full
+        latest = service.find_path("Georgia", "Alabama", GameFilter(first_season=2025))
+        assert latest.error == "No victory chain exists in that window."
+
+    def test_week_window_needs_week_data(self, temp_graph_file, temp_teams_file):
+        """Test that an as-of week is refused on a graph without weeks."""
+        service = GraphService(temp_graph_file, temp_teams_file)
+        assert not service.has_weeks
+        as_of = GameFilter(last_season=2025, last_week=8)
+        result = service.find_path("Alabama", "Georgia", as_of)
+        assert result.error == NO_WEEKS_MESSAGE
+        alternatives = service.alternative_paths("Alabama", "Georgia", 2, window=as_of)
+        assert alternatives.error == NO_WEEKS_MESSAGE
+        # Season bounds alone still work
+        season = GameFilter(last_season=2025)
+        assert service.find_path("Alabama", "Georgia", season).error is None
+
+    def test_windows_cache_separately(self, temp_graph_file, temp_teams_file):
+        """Test that each window has its own path cache entry."""
+        service = GraphService(temp_graph_file, temp_teams_file)
+        window = GameFilter(first_season=2024)
+        service.find_path("Alabama", "Auburn")
+        service.find_path("Alabama", "Auburn", window)
+        service.find_path("Alabama", "Auburn", window)
+        stats = service.path_cache.stats()
+        assert (stats["size"], stats["hits"]) == (2, 1)
+        assert service.warm_paths(service.path_cache.keys()) == 1
@@ -0,0 +1,48 @@
+"""Tests for the gunicorn server hooks."""
+
+import gc
+import runpy
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+CONF_PATH = Path(__file__).resolve().parent.parent / "gunicorn.conf.py"
+
+
+@pytest.fixture
+def hooks(monkeypatch):
+    """The settings module's globals, loaded without preloading."""
+    monkeypatch.delenv("GUNICORN_PRELOAD", raising=False)
+    return runpy.run_path(str(CONF_PATH))
+
+
+class TestGunicornHooks:
+    """Test suite for the preload fork hooks."""
+
+    def test_preload_builds_indexes_before_fork(self, hooks, app):
+        """Test that pre_fork builds the shared indexes and re-enables GC."""
+        server = SimpleNamespace(
+            cfg=SimpleNamespace(preload_app=True),
+            app=SimpleNamespace(wsgi=lambda: app),
+        )
+        worker = SimpleNamespace()
+        service = app.extensions["graph_reloader"].service
+        # As left by loading the settings with GUNICORN_PRELOAD=1
+        gc.disable()
+        try:
+            hooks["pre_fork"](server, worker)
+            assert gc.isenabled()
+        finally:
+            gc.enable()
+            gc.unfreeze()
+        for name in ("team_index", "k_paths", "edge_fragments", "rankings"):
+            assert name in service.__dict__
+        hooks["post_fork"](server, worker)
+        assert worker.forked_at > 0
+
+    def test_no_preload_leaves_indexes_lazy(self, hooks, app):
+        """Test that without preload the master builds nothing."""
+        server = SimpleNamespace(cfg=SimpleNamespace(preload_app=False))
+        hooks["pre_fork"](server, SimpleNamespace())
+        assert "team_index" not in app.extensions["graph_reloader"].service.__dict__
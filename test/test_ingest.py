@@ -0,0 +1,349 @@
+"""Tests for incremental CFBD ingestion against a local fake API."""
+
+import json
+import pickle
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import networkx as nx
+import pytest
+
+from graph_service import GraphService
+from ingest import (
+    CFBDClient,
+    apply_delta,
+    build_graph,
+    ingest,
+    load_state,
+    merge_teams,
+    parse_game,
+    week_ordinal,
+)
+from rankings import Rankings
+from snapshot import GraphSnapshot
+
+
+def _game(game_id, season, week, home, home_pts, away, away_pts, completed=True):
+    return {
+        "id": game_id,
+        "season": season,
+        "week": week,
+        "seasonType": "regular",
+        "startDate": f"{season}-09-{week:02d}T19:00:00.000Z",
+        "completed": completed,
+        "homeTeam": home,
+        "homePoints": home_pts,
+        "awayTeam": away,
+        "awayPoints": away_pts,
+    }
+
+
+class FakeCFBDServer(ThreadingHTTPServer):
+    """Serves calendar, games, teams and records from in-memory lists."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _FakeCFBDHandler)
+        self.schools = ["Alabama", "Georgia", "Auburn", "Tufts"]
+        self.games = [
+            _game(1, 2024, 1, "Alabama", 14, "Auburn", 21),
+            # Shutouts are results too
+            _game(2, 2024, 2, "Alabama", 35, "Tufts", 0),
+            _game(3, 2025, 1, "Georgia", 10, "Alabama", 28),
+            _game(4, 2025, 1, "Georgia", 20, "Auburn", None, completed=False),
+            _game(5, 2025, 2, "Auburn", None, "Georgia", None, completed=False),
+            # Not in /teams, so dropped like the notebook does
+            _game(6, 2025, 2, "Tufts", 7, "Mystery U", 10),
+        ]
+        self.weeks = {2024: [1, 2], 2025: [1, 2]}
+        self.hits: list[tuple[str, dict]] = []
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def respond(self, endpoint: str, params: dict[str, str]):
+        year = int(params["year"])
+        if endpoint == "calendar":
+            return [
+                {"season": year, "week": w, "seasonType": "regular"}
+                for w in self.weeks.get(year, [])
+            ]
+        if endpoint == "games":
+            return [
+                g
+                for g in self.games
+                if g["season"] == year
+                and g["week"] == int(params["week"])
+                and g["seasonType"] == params["seasonType"]
+            ]
+        if endpoint == "teams":
+            return [
+                {"school": s, "mascot": f"{s} Mascots", "logos": [f"{s}.png"]}
+                for s in self.schools
+            ]
+        if endpoint == "records":
+            return [
+                {"team": s, "total": {"wins": 1, "losses": 1}} for s in self.schools
+            ]
+        return None
+
+
+class _FakeCFBDHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urllib.parse.urlparse(self.path)
+        endpoint = url.path.strip("/")
+        params = dict(urllib.parse.parse_qsl(url.query))
+        self.server.hits.append((endpoint, params))
+        data = None
+        if self.headers.get("Authorization") == "Bearer test-key":
+            data = self.server.respond(endpoint, params)
+        body = json.dumps(data).encode()
+        self.send_response(200 if data is not None else 401)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def cfbd():
+    """Start a fake CFBD API on a free local port."""
+    server = FakeCFBDServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def paths(tmp_path):
+    """Artifact locations in a scratch directory."""
+    return {
+        "state_path": tmp_path / "cfbd" / "state.json",
+        "graph_path": tmp_path / "graph.gexf",
+        "teams_path": tmp_path / "teams.pkl",
+        "snapshot_path": tmp_path / "graph.snap",
+        "rankings_path": tmp_path / "rankings.json",
+    }
+
+
+def run(cfbd, paths, season=2025, **kwargs):
+    cache_dir = paths["state_path"].parent / "responses"
+    paths["state_path"].parent.mkdir(exist_ok=True)
+    client = CFBDClient("test-key", cfbd.url, cache_dir)
+    return ingest(client, season=season, num_seasons=2, **paths, **kwargs)
+
+
+def games(graph_path):
+    graph = nx.read_gexf(graph_path)
+    labels = dict(graph.nodes(data="label"))
+    found = {}
+    for u, v, data in graph.edges(data=True):
+        game = (data["label"], int(data["weight"]))
+        found.setdefault((labels[u], labels[v]), []).append(game)
+    return found
+
+
+def edges(graph_path):
+    """The latest game per pair, for graphs without rematches."""
+    return {pair: found[-1] for pair, found in games(graph_path).items()}
+
+
+class TestParseGame:
+    """Test suite for reducing raw games to results."""
+
+    def test_shutout_is_a_win(self):
+        """Test that a zero score still produces a result."""
+        game = parse_game(_game(1, 2025, 1, "Alabama", 35, "Tufts", 0))
+        assert (game["winner"], game["loser"]) == ("Alabama", "Tufts")
+
+    def test_missing_scores_and_ties_are_skipped(self):
+        """Test that unfinished and tied games have no result."""
+        assert parse_game(_game(1, 2025, 1, "Alabama", None, "Tufts", 0)) is None
+        assert parse_game(_game(1, 2025, 1, "Alabama", 7, "Tufts", 7)) is None
+        live = _game(1, 2025, 1, "Alabama", 3, "Tufts", 0, completed=False)
+        assert parse_game(live) is None
+
+
+class TestWeekOrdinal:
+    """Test suite for week ordinals."""
+
+    def test_postseason_follows_regular_season(self):
+        """Test that postseason weeks sort after every regular week."""
+        game = parse_game(_game(1, 2025, 1, "Alabama", 35, "Tufts", 0))
+        assert week_ordinal(game) == 1
+        game["season_type"] = "postseason"
+        assert week_ordinal(game) == 101
+
+
+class TestMergeTeams:
+    """Test suite for keeping team ids stable."""
+
+    def test_existing_ids_kept_and_new_schools_appended(self):
+        """Test that merging never renumbers known teams."""
+        teams = [{"id": 0, "name": "Georgia"}, {"id": 1, "name": "Gone State"}]
+        api = [{"school": "Alabama", "mascot": "Tide", "logos": []}]
+        api.append({"school": "Georgia", "mascot": "Dawgs", "logos": ["g.png"]})
+        records = [{"team": "Georgia", "total": {"wins": 9, "losses": 3}}]
+        merged = merge_teams(teams, api, records)
+        ids = {team["name"]: team["id"] for team in merged}
+        assert ids == {"Georgia": 0, "Gone State": 1, "Alabama": 2}
+        assert merged[0]["wins"] == 9
+        assert merged[0]["logo"] == "g.png"
+        assert "wins" not in merged[2]
+
+
+class TestIngest:
+    """Test suite for ingest runs against the fake API."""
+
+    def test_initial_run_builds_notebook_graph(self, cfbd, paths):
+        """Test that a first run builds labels and weights like the notebook."""
+        summary = run(cfbd, paths)
+        assert summary["rebuilt"]
+        assert summary["new_games"] == 3
+        assert summary["unknown_teams"] == 1
+        assert edges(paths["graph_path"]) == {
+            ("Auburn", "Alabama"): ("Auburn def. Alabama (2024)", 5),
+            ("Alabama", "Tufts"): ("Alabama def. Tufts (2024)", 5),
+            ("Alabama", "Georgia"): ("Alabama def. Georgia", 1),
+        }
+        with open(paths["teams_path"], "rb") as f:
+            teams = pickle.load(f)
+        assert [team["name"] for team in teams] == cfbd.schools
+
+    def test_artifacts_load_in_graph_service(self, cfbd, paths):
+        """Test that the written snapshot matches the written sources."""
+        run(cfbd, paths)
+        snap = GraphSnapshot.load(paths["snapshot_path"])
+        assert snap.num_edges == 3
+        service = GraphService(
+            paths["graph_path"], paths["teams_path"], paths["snapshot_path"]
+        )
+        assert service.snapshot.fingerprint == snap.fingerprint
+        rankings = Rankings.load(paths["rankings_path"], snap.fingerprint)
+        assert rankings.reach[snap.labels.index("Auburn")] == 3
+        assert service.find_path("Auburn", "Tufts").path_names == [
+            "Auburn",
+            "Alabama",
+            "Tufts",
+        ]
+
+    def test_finished_weeks_come_from_cache(self, cfbd, paths):
+        """Test that a rerun only refetches weeks with unfinished games."""
+        run(cfbd, paths)
+        cfbd.hits.clear()
+        summary = run(cfbd, paths)
+        assert summary["new_games"] == 0
+        fetched = {
+            (params["year"], params["week"])
+            for endpoint, params in cfbd.hits
+            if endpoint == "games"
+        }
+        assert fetched == {("2025", "1"), ("2025", "2")}
+        assert not any(endpoint == "calendar" for endpoint, _ in cfbd.hits)
+
+    def test_new_results_apply_as_edge_delta(self, cfbd, paths):
+        """Test that newly finished games are added without a rebuild."""
+        run(cfbd, paths)
+        cfbd.games[4] = _game(5, 2025, 2, "Auburn", 17, "Georgia", 24)
+        summary = run(cfbd, paths)
+        assert not summary["rebuilt"]
+        assert summary["new_games"] == 1
+        assert summary["edges_added"] == 1
+        assert edges(paths["graph_path"])[("Georgia", "Auburn")] == (
+            "Georgia def. Auburn",
+            1,
+        )
+        # The delta result equals a rebuild from the ledger
+        state = load_state(paths["state_path"])
+        with open(paths["teams_path"], "rb") as f:
+            teams = pickle.load(f)
+        rebuilt = build_graph(teams, state["games"], 2025)
+        nx.write_gexf(rebuilt, paths["graph_path"].with_name("rebuilt.gexf"))
+        assert edges(paths["graph_path"]) == edges(
+            paths["graph_path"].with_name("rebuilt.gexf")
+        )
+
+    def test_game_in_progress_waits_for_final_score(self, cfbd, paths):
+        """Test that partial scores are not ingested and the final one is."""
+        # Auburn leads at half time; Georgia wins
+        cfbd.games[4] = _game(5, 2025, 2, "Auburn", 14, "Georgia", 3, completed=False)
+        run(cfbd, paths)
+        assert ("Auburn", "Georgia") not in edges(paths["graph_path"])
+        assert 5 not in {
+            game["id"] for game in load_state(paths["state_path"])["games"]
+        }
+
+        cfbd.games[4] = _game(5, 2025, 2, "Auburn", 17, "Georgia", 24)
+        summary = run(cfbd, paths)
+        assert summary["new_games"] == 1
+        found = edges(paths["graph_path"])
+        assert ("Auburn", "Georgia") not in found
+        assert found[("Georgia", "Auburn")] == ("Georgia def. Auburn", 1)
+
+    def test_season_rollover_recomputes_weights(self, cfbd, paths):
+        """Test that a new season shifts the window and relabels old games."""
+        run(cfbd, paths)
+        cfbd.weeks[2026] = [1]
+        cfbd.games.append(_game(7, 2026, 1, "Tufts", 3, "Auburn", 0))
+        summary = run(cfbd, paths, season=2026)
+        assert summary["rebuilt"]
+        assert edges(paths["graph_path"]) == {
+            ("Alabama", "Georgia"): ("Alabama def. Georgia (2025)", 5),
+            ("Tufts", "Auburn"): ("Tufts def. Auburn", 1),
+        }
+        years = {game["year"] for game in load_state(paths["state_path"])["games"]}
+        assert years == {2025, 2026}
+
+    def test_games_record_season_and_week(self, cfbd, paths):
+        """Test that each game keeps its season and week ordinal."""
+        run(cfbd, paths)
+        snap = GraphSnapshot.load(paths["snapshot_path"])
+        games = dict(zip(snap.game_labels, zip(snap.game_seasons, snap.game_weeks)))
+        assert games["Alabama def. Tufts (2024)"] == (2024, 2)
+        assert games["Alabama def. Georgia"] == (2025, 1)
+
+    def test_rematches_keep_every_game(self, cfbd, paths):
+        """Test that a pair that met twice keeps both games."""
+        cfbd.games.append(_game(8, 2025, 2, "Alabama", 3, "Auburn", 10))
+        summary = run(cfbd, paths)
+        assert (summary["edges"], summary["games"]) == (3, 4)
+        assert games(paths["graph_path"])[("Auburn", "Alabama")] == [
+            ("Auburn def. Alabama (2024)", 5),
+            ("Auburn def. Alabama", 1),
+        ]
+        snap = GraphSnapshot.load(paths["snapshot_path"])
+        assert snap.game_stats()["collapsed_games"] == 1
+
+    def test_dry_run_writes_nothing(self, cfbd, paths):
+        """Test that a dry run leaves no artifacts behind."""
+        summary = run(cfbd, paths, dry_run=True)
+        assert summary["new_games"] == 3
+        assert not paths["graph_path"].exists()
+        assert not paths["state_path"].exists()
+
+
+class TestApplyDelta:
+    """Test suite for edge deltas."""
+
+    def test_late_result_is_kept_behind_newer_game(self):
+        """Test that an older game arriving late is stored but not searched."""
+        teams = [{"id": 0, "name": "A"}, {"id": 1, "name": "B"}]
+        newer = {"id": 2, "winner_id": 0, "loser_id": 1, "year": 2025}
+        newer.update(season_type="regular", week=5, start="")
+        older = dict(newer, id=1, year=2024)
+        graph = build_graph(teams, [newer], 2025)
+        counts = apply_delta(graph, teams, [newer], [older], 2025)
+        assert counts == {"edges_added": 0, "edges_updated": 1}
+        assert [data["label"] for data in graph["0"]["1"].values()] == [
+            "A def. B (2024)",
+            "A def. B",
+        ]
+        snap = GraphSnapshot.from_networkx(graph, teams)
+        assert (snap.weights[0], snap.edge_labels[0]) == (1, "A def. B")
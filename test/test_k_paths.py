@@ -0,0 +1,68 @@
+"""Tests for k shortest loopless paths."""
+
+import itertools
+import random
+
+import networkx as nx
+import pytest
+
+from config import Config
+from k_paths import KShortestPaths
+from snapshot import GraphSnapshot, load_fresh_snapshot
+
+
+def reference_costs(snapshot, src, dst, k):
+    """Costs of the k cheapest simple paths according to NetworkX."""
+    graph, ids = snapshot.to_networkx(), list(snapshot.node_ids)
+    try:
+        paths = nx.shortest_simple_paths(graph, ids[src], ids[dst], weight="weight")
+        return [nx.path_weight(graph, p, "weight") for p in itertools.islice(paths, k)]
+    except nx.NetworkXNoPath:
+        return []
+
+
+@pytest.fixture
+def diamond_snapshot(mock_graph, mock_teams_data):
+    """The mock graph plus a second route from Georgia to Vanderbilt."""
+    mock_graph.add_edge("1", "3", weight=1, label="Georgia def. Vanderbilt")
+    return GraphSnapshot.from_networkx(mock_graph, mock_teams_data)
+
+
+class TestKShortestPaths:
+    """Test suite for KShortestPaths."""
+
+    def test_paths_cheapest_first(self, diamond_snapshot):
+        """Test that every loopless path comes back in cost order."""
+        paths, complete = KShortestPaths(diamond_snapshot).search(0, 3, 5)
+        assert complete
+        assert paths == [([0, 1, 3], 2.0), ([0, 1, 2, 3], 3.0)]
+
+    def test_blocked_nodes_and_dropped_edges(self, diamond_snapshot):
+        """Test that blocked teams and infinite weights are avoided."""
+        ksp = KShortestPaths(diamond_snapshot)
+        assert ksp.search(0, 3, 5, blocked=[2])[0] == [([0, 1, 3], 2.0)]
+        weights = list(diamond_snapshot.weights)
+        weights[diamond_snapshot.find_edge(1, 3)] = float("inf")
+        assert ksp.search(0, 3, 5, weights)[0] == [([0, 1, 2, 3], 3.0)]
+        assert ksp.search(0, 4, 5)[0] == []
+
+    def test_deadline_returns_partial_result(self, diamond_snapshot):
+        """Test that an expired budget stops after the first path."""
+        paths, complete = KShortestPaths(diamond_snapshot).search(0, 3, 5, deadline=0)
+        assert not complete
+        assert paths == [([0, 1, 3], 2.0)]
+
+    def test_matches_networkx_on_real_graph(self):
+        """Test cost parity with NetworkX's simple paths on sampled pairs."""
+        snapshot = load_fresh_snapshot(
+            Config.SNAPSHOT_PATH, Config.GRAPH_PATH, Config.TEAMS_PATH
+        )
+        if snapshot is None:
+            pytest.skip("data/graph.snap is missing or stale")
+
+        ksp, rng = KShortestPaths(snapshot), random.Random(0)
+        for _ in range(10):
+            src, dst = rng.sample(range(snapshot.num_nodes), 2)
+            paths, _ = ksp.search(src, dst, 8)
+            assert [cost for _, cost in paths] == reference_costs(snapshot, src, dst, 8)
+            assert all(len(set(nodes)) == len(nodes) for nodes, _ in paths)
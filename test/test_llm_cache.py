@@ -0,0 +1,115 @@
+"""Tests for the persistent LLM explanation cache."""
+
+from unittest.mock import patch
+
+from graph_service import GraphService
+from llm_cache import ExplanationCache
+from llm_service import LLMService
+
+
+class TestExplanationCache:
+    """Test suite for ExplanationCache."""
+
+    def test_round_trip(self, tmp_path):
+        """Test that a stored explanation is returned for the same key."""
+        cache = ExplanationCache(tmp_path / "c.sqlite3")
+        cache.put("1", "4", "m", "h", "Bulldogs win.")
+        assert cache.get("1", "4", "m", "h") == "Bulldogs win."
+        assert cache.get("4", "1", "m", "h") is None
+        assert cache.get("1", "4", "other-model", "h") is None
+
+    def test_persists_across_instances(self, tmp_path):
+        """Test that entries survive reopening the database."""
+        ExplanationCache(tmp_path / "c.sqlite3").put("1", "4", "m", "h", "text")
+        assert ExplanationCache(tmp_path / "c.sqlite3").get("1", "4", "m", "h")
+
+    def test_ttl_expires_entries(self, tmp_path):
+        """Test that entries older than the TTL are not served."""
+        cache = ExplanationCache(tmp_path / "c.sqlite3", ttl=60)
+        with patch("llm_cache.time.time", return_value=1000.0):
+            cache.put("1", "4", "m", "h", "text")
+        with patch("llm_cache.time.time", return_value=1030.0):
+            assert cache.get("1", "4", "m", "h") == "text"
+        with patch("llm_cache.time.time", return_value=1061.0):
+            assert cache.get("1", "4", "m", "h") is None
+
+    def test_max_entries_evicts_least_recently_read(self, tmp_path):
+        """Test that the size limit drops the least recently read entries."""
+        cache = ExplanationCache(tmp_path / "c.sqlite3", max_entries=2)
+        with patch("llm_cache.time.time", side_effect=[1.0, 2.0, 3.0, 4.0]):
+            cache.put("a", "b", "m", "h", "ab")
+            cache.put("c", "d", "m", "h", "cd")
+            cache.get("a", "b", "m", "h")
+            cache.put("e", "f", "m", "h", "ef")
+        assert len(cache) == 2
+        assert cache.get("c", "d", "m", "h") is None
+        assert cache.get("a", "b", "m", "h") == "ab"
+
+    def test_unwritable_path_is_a_miss(self, tmp_path):
+        """Test that database errors degrade to cache misses."""
+        cache = ExplanationCache(tmp_path / "missing-dir" / "c.sqlite3")
+        cache.put("1", "4", "m", "h", "text")
+        assert cache.get("1", "4", "m", "h") is None
+
+
+class TestLLMFallbackCaching:
+    """Test suite for explanation caching in GraphService."""
+
+    def _service(self, graph_file, teams_file, client, monkeypatch):
+        monkeypatch.setattr("config.Config.GEMINI_API_KEY", "test-key")
+        llm = LLMService("test-key", client=client)
+        with patch("graph_service.LLMService", return_value=llm):
+            return GraphService(graph_file, teams_file), llm
+
+    def test_repeat_fallback_uses_cache(
+        self, temp_graph_file, temp_teams_file, fake_genai_client, monkeypatch
+    ):
+        """Test that a second no-path query does not call the LLM again."""
+        service, _ = self._service(
+            temp_graph_file, temp_teams_file, fake_genai_client, monkeypatch
+        )
+        first = service.find_path("Georgia", "Tufts")
+        second = service.find_path("Georgia", "Tufts")
+        assert first.llm_text == second.llm_text == fake_genai_client.text
+        assert len(fake_genai_client.calls) == 1
+        assert "Jumbos" in fake_genai_client.calls[0]["contents"]
+
+    def test_cache_shared_across_services(
+        self, temp_graph_file, temp_teams_file, fake_genai_client, monkeypatch
+    ):
+        """Test that a new worker reads explanations written by another."""
+        service, _ = self._service(
+            temp_graph_file, temp_teams_file, fake_genai_client, monkeypatch
+        )
+        service.find_path("Georgia", "Tufts")
+        other, _ = self._service(
+            temp_graph_file, temp_teams_file, fake_genai_client, monkeypatch
+        )
+        assert other.find_path("Georgia", "Tufts").llm_text == fake_genai_client.text
+        assert len(fake_genai_client.calls) == 1
+
+    def test_prompt_change_invalidates(
+        self, temp_graph_file, temp_teams_file, fake_genai_client, monkeypatch
+    ):
+        """Test that changing the model or system prompt bypasses old entries."""
+        service, llm = self._service(
+            temp_graph_file, temp_teams_file, fake_genai_client, monkeypatch
+        )
+        service.find_path("Georgia", "Tufts")
+        llm.system_prompt += " Be brief."
+        service.find_path("Georgia", "Tufts")
+        llm.model = "gemini-other"
+        service.find_path("Georgia", "Tufts")
+        assert len(fake_genai_client.calls) == 3
+
+    def test_cache_disabled(
+        self, temp_graph_file, temp_teams_file, fake_genai_client, monkeypatch
+    ):
+        """Test that an empty LLM_CACHE_PATH calls the LLM every time."""
+        monkeypatch.setattr("config.Config.LLM_CACHE_PATH", "")
+        service, _ = self._service(
+            temp_graph_file, temp_teams_file, fake_genai_client, monkeypatch
+        )
+        service.find_path("Georgia", "Tufts")
+        service.find_path("Georgia", "Tufts")
+        assert len(fake_genai_client.calls) == 2
@@ -0,0 +1,196 @@
+"""Tests for the bounded, non-blocking LLM fallback."""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+import metrics
+from graph_service import LLM_BUSY_MESSAGE, LLM_TIMEOUT_MESSAGE, GraphService
+from llm_service import LLMService
+
+
+class BlockingClient:
+    """Fake genai client whose calls wait until released."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.started = threading.Semaphore(0)
+        self.calls = 0
+        self.models = self
+
+    def generate_content(self, model, config, contents):
+        self.calls += 1
+        self.started.release()
+        self.release.wait(5)
+        return type("Rsp", (), {"text": "Eventually, the Bulldog prevails."})()
+
+
+@pytest.fixture
+def blocking_client():
+    client = BlockingClient()
+    yield client
+    client.release.set()
+
+
+@pytest.fixture
+def make_service(temp_graph_file, temp_teams_file, monkeypatch):
+    monkeypatch.setattr("config.Config.GEMINI_API_KEY", "test-key")
+
+    def make(client):
+        llm = LLMService("test-key", client=client)
+        with patch("graph_service.LLMService", return_value=llm):
+            return GraphService(temp_graph_file, temp_teams_file)
+
+    return make
+
+
+class TestLLMFallbackDeadline:
+    """Test suite for fallback timeouts and concurrency caps."""
+
+    def test_timeout_returns_degraded_result(
+        self, make_service, blocking_client, monkeypatch
+    ):
+        """Test that a slow LLM call yields a retryable error, then a cache hit."""
+        monkeypatch.setattr("config.Config.LLM_TIMEOUT", 0.05)
+        service = make_service(blocking_client)
+
+        result = service.find_path("Georgia", "Tufts")
+        assert result.error == LLM_TIMEOUT_MESSAGE
+        assert result.retry_after
+
+        # The generation finishes in the background and is cached
+        blocking_client.release.set()
+        service._llm_executor.shutdown(wait=True)
+        retry = service.find_path("Georgia", "Tufts")
+        assert retry.error is None
+        assert retry.llm_text == "Eventually, the Bulldog prevails."
+
+    def test_busy_slots_return_immediately(
+        self, make_service, blocking_client, monkeypatch
+    ):
+        """Test that requests beyond the concurrency cap are not queued."""
+        monkeypatch.setattr("config.Config.LLM_TIMEOUT", 0.05)
+        monkeypatch.setattr("config.Config.LLM_MAX_CONCURRENCY", 1)
+        service = make_service(blocking_client)
+
+        assert service.find_path("Georgia", "Tufts").error == LLM_TIMEOUT_MESSAGE
+        assert blocking_client.started.acquire(timeout=1)
+        result = service.find_path("Alabama", "Tufts")
+        assert result.error == LLM_BUSY_MESSAGE
+        assert result.retry_after
+
+    def test_close_finishes_running_generation(
+        self, make_service, blocking_client, monkeypatch
+    ):
+        """Test that close waits for running generations, then refuses new ones."""
+        monkeypatch.setattr("config.Config.LLM_TIMEOUT", 0.05)
+        service = make_service(blocking_client)
+        cache = service._llm_cache
+        assert service.find_path("Georgia", "Tufts").error == LLM_TIMEOUT_MESSAGE
+
+        closer = threading.Thread(target=service.close)
+        closer.start()
+        blocking_client.release.set()
+        closer.join(5)
+        assert not closer.is_alive()
+        assert len(cache) == 1
+        cache.close()
+
+        result = service.find_path("Alabama", "Tufts")
+        assert result.error == LLM_BUSY_MESSAGE
+        assert blocking_client.calls == 1
+
+    def test_paths_unaffected_by_pending_fallback(
+        self, make_service, blocking_client, monkeypatch
+    ):
+        """Test that path queries still answer while a fallback is stuck."""
+        monkeypatch.setattr("config.Config.LLM_TIMEOUT", 0.05)
+        service = make_service(blocking_client)
+        service.find_path("Georgia", "Tufts")
+        assert service.find_path("Alabama", "Auburn").error is None
+
+    def test_api_returns_503_with_retry_after(
+        self, make_service, blocking_client, monkeypatch
+    ):
+        """Test that the API maps a degraded fallback to 503 + Retry-After."""
+        monkeypatch.setattr("config.Config.LLM_TIMEOUT", 0.05)
+        service = make_service(blocking_client)
+        with patch("app.GraphService", return_value=service):
+            from app import create_app
+
+            client = create_app().test_client()
+            rsp = client.post("/api/path", json={"from": "Georgia", "to": "Tufts"})
+        assert rsp.status_code == 503
+        assert rsp.headers["Retry-After"]
+        assert rsp.get_json()["error"] == LLM_TIMEOUT_MESSAGE
+
+
+class TestLLMFallbackBursts:
+    """Test suite for coalescing and rate-limiting bursts of fallbacks."""
+
+    def test_concurrent_requests_share_one_generation(
+        self, make_service, blocking_client, monkeypatch
+    ):
+        """Test that a burst for one pair makes a single call and shares it."""
+        monkeypatch.setattr("config.Config.LLM_TIMEOUT", 5)
+        # One token: followers must not need one of their own
+        monkeypatch.setattr("config.Config.LLM_RATE_LIMIT", 0.01)
+        monkeypatch.setattr("config.Config.LLM_RATE_BURST", 1)
+        service = make_service(blocking_client)
+        coalesced = metrics.LLM_FALLBACKS.value("coalesced")
+        results = []
+
+        def ask():
+            results.append(service.find_path("Georgia", "Tufts"))
+
+        threads = [threading.Thread(target=ask) for _ in range(8)]
+        threads[0].start()
+        assert blocking_client.started.acquire(timeout=1)
+        for thread in threads[1:]:
+            thread.start()
+        deadline = time.monotonic() + 5
+        while metrics.LLM_FALLBACKS.value("coalesced") < coalesced + 7:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        blocking_client.release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert blocking_client.calls == 1
+        assert len(results) == 8
+        assert {r.llm_text for r in results} == {"Eventually, the Bulldog prevails."}
+        assert all(r.error is None for r in results)
+        service._llm_executor.shutdown(wait=True)
+        assert service._llm_inflight == {}
+
+    def test_rate_limit_answers_distinct_pairs_at_once(
+        self, make_service, blocking_client, monkeypatch
+    ):
+        """Test that a burst of new pairs gets 503 + Retry-After, not a wait."""
+        monkeypatch.setattr("config.Config.LLM_TIMEOUT", 0.05)
+        monkeypatch.setattr("config.Config.LLM_RATE_LIMIT", 0.5)
+        monkeypatch.setattr("config.Config.LLM_RATE_BURST", 1)
+        service = make_service(blocking_client)
+        limited = metrics.LLM_FALLBACKS.value("rate_limited")
+        with patch("app.GraphService", return_value=service):
+            from app import create_app
+
+            client = create_app().test_client()
+            first = client.post("/api/path", json={"from": "Georgia", "to": "Tufts"})
+            start = time.monotonic()
+            burst = [
+                client.post("/api/path", json={"from": team, "to": "Tufts"})
+                for team in ("Alabama", "Auburn", "Vanderbilt")
+            ]
+            elapsed = time.monotonic() - start
+
+        assert first.get_json()["error"] == LLM_TIMEOUT_MESSAGE
+        for rsp in burst:
+            assert rsp.status_code == 503
+            assert rsp.get_json()["error"] == LLM_BUSY_MESSAGE
+            assert int(rsp.headers["Retry-After"]) >= 1
+        assert elapsed < 1
+        assert blocking_client.calls == 1
+        assert metrics.LLM_FALLBACKS.value("rate_limited") == limited + 3
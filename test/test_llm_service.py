@@ -0,0 +1,58 @@
+"""Tests for lazy LLM client construction and start-up imports."""
+
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import metrics
+from graph_service import GraphService
+from llm_service import LLMService
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class TestLazyStartup:
+    """Test suite for deferred imports and the background warm-up."""
+
+    def test_app_import_skips_genai_and_networkx(self):
+        """Test that importing the app leaves the heavy modules unloaded."""
+        code = (
+            "import sys, app; "
+            "print(sorted(m for m in ('google.genai', 'networkx') if m in sys.modules))"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=ROOT,
+            env=dict(os.environ, GEMINI_API_KEY="test-key", RELOAD_INTERVAL="0"),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert out.stdout.strip().splitlines()[-1] == "[]"
+
+    def test_client_built_once_on_first_use(self):
+        """Test that the genai client is only built when first needed."""
+        with patch("google.genai.Client") as client_cls:
+            llm = LLMService("test-key", timeout=2)
+            client_cls.assert_not_called()
+            assert llm.client is llm.client
+        client_cls.assert_called_once()
+        assert client_cls.call_args.kwargs["http_options"].timeout == 2000
+
+    def test_warm_up_runs_in_background(
+        self, temp_graph_file, temp_teams_file, monkeypatch
+    ):
+        """Test that GraphService.warm_up builds the client off the caller."""
+        monkeypatch.setattr("config.Config.GEMINI_API_KEY", "test-key")
+        service = GraphService(temp_graph_file, temp_teams_file)
+        warmed = metrics.WORKER_BOOT_SECONDS.count("llm")
+        with patch("google.genai.Client") as client_cls:
+            service.warm_up()
+            for thread in threading.enumerate():
+                if thread.name == "llm-warmup":
+                    thread.join(5)
+        client_cls.assert_called_once()
+        assert metrics.WORKER_BOOT_SECONDS.count("llm") == warmed + 1
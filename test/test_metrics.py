@@ -0,0 +1,133 @@
+"""Tests for the metrics registry and its instrumentation."""
+
+from unittest.mock import patch
+
+import pytest
+
+import metrics
+from graph_service import GraphService
+from metrics import Registry, StageTimer
+
+
+class TestRegistry:
+    """Test suite for Registry, Counter and Histogram."""
+
+    def test_counter_and_histogram_render(self):
+        """Test that series render in the Prometheus text format."""
+        registry = Registry()
+        hits = registry.counter("hits_total", "Hits.", {"kind": ("a", "b")})
+        latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1))
+        hits.inc("a")
+        hits.inc("a", amount=2)
+        for value in (0.05, 0.1, 0.5, 3):
+            latency.observe(value)
+
+        text = registry.render()
+        assert "# TYPE hits_total counter" in text
+        assert 'hits_total{kind="a"} 3' in text
+        assert 'hits_total{kind="b"} 0' in text
+        # Buckets are cumulative and bounds are inclusive
+        assert 'latency_seconds_bucket{le="0.1"} 2' in text
+        assert 'latency_seconds_bucket{le="1"} 3' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 4' in text
+        assert "latency_seconds_sum 3.65" in text
+        assert "latency_seconds_count 4" in text
+        assert hits.value("a") == 3
+        assert latency.count() == 4
+
+    def test_redeclare(self):
+        """Test that a repeated declaration is shared and a conflicting one fails."""
+        registry = Registry()
+        first = registry.counter("hits_total", "Hits.", {"kind": ["a"]})
+        assert registry.counter("hits_total", "Hits.", {"kind": ("a",)}) is first
+        with pytest.raises(ValueError):
+            registry.counter("hits_total", "Hits.", {"kind": ("a", "b")})
+
+    def test_series_declared_after_use(self):
+        """Test that new series extend the values without losing old ones."""
+        registry = Registry()
+        early = registry.counter("early_total", "Early.")
+        early.inc()
+        late = registry.counter("late_total", "Late.")
+        late.inc(amount=5)
+        assert (early.value(), late.value()) == (1, 5)
+
+    def test_disabled(self):
+        """Test that a disabled registry records nothing."""
+        registry = Registry(enabled=False)
+        hits = registry.counter("hits_total", "Hits.")
+        hits.inc()
+        assert hits.value() == 0
+
+    def test_directory_sums_processes(self, tmp_path):
+        """Test that every process's file counts towards the totals."""
+        workers = []
+        for pid in (101, 102):
+            with patch("metrics.os.getpid", return_value=pid):
+                registry = Registry(tmp_path)
+                hits = registry.counter("hits_total", "Hits.")
+                hits.inc(amount=pid)
+            workers.append(registry)
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "metrics-101.bin",
+            "metrics-102.bin",
+        ]
+        assert "hits_total 203" in workers[0].render()
+
+    def test_stage_timer(self):
+        """Test that laps land in their stage's series once recorded."""
+        registry = Registry()
+        stages = registry.histogram("stage_seconds", "Stages.", {"stage": ("x", "y")})
+        outcomes = registry.counter("outcomes_total", "Outcomes.", {"outcome": ("ok",)})
+        timer = StageTimer(stages)
+        timer.lap("x")
+        timer.lap("x")
+        timer.lap("y")
+        assert stages.count("x") == 0
+        timer.record(outcomes, "ok")
+        assert (stages.count("x"), stages.count("y")) == (2, 1)
+        assert outcomes.value("ok") == 1
+        timer.record()
+        assert stages.count("x") == 2
+
+
+class TestPathMetrics:
+    """Test suite for the path query instrumentation."""
+
+    def test_find_path_outcomes(self, temp_graph_file, temp_teams_file, monkeypatch):
+        """Test that queries are counted by outcome with per-stage timings."""
+        monkeypatch.setattr("config.Config.GEMINI_API_KEY", None)
+        service = GraphService(temp_graph_file, temp_teams_file)
+        queries, fallbacks = metrics.PATH_QUERIES, metrics.LLM_FALLBACKS
+        before = {
+            outcome: queries.value(outcome)
+            for outcome in ("found", "cached", "no_chain", "invalid")
+        }
+        unconfigured = fallbacks.value("unconfigured")
+        builds = metrics.PATH_STAGE_SECONDS.count("build")
+        hops = metrics.PATH_HOPS.count()
+
+        service.find_path("Alabama", "Auburn")
+        service.find_path("Alabama", "Auburn")
+        service.find_path("Alabama", "Tufts")
+        service.find_path("Alabama", "Nowhere State")
+
+        for outcome in before:
+            assert queries.value(outcome) == before[outcome] + 1
+        assert fallbacks.value("unconfigured") == unconfigured + 1
+        assert metrics.PATH_STAGE_SECONDS.count("build") == builds + 1
+        assert metrics.PATH_HOPS.count() == hops + 2
+
+    def test_llm_errors_counted(
+        self, temp_graph_file, temp_teams_file, mock_llm_service, monkeypatch
+    ):
+        """Test that a failed generation counts as an LLM error and is timed."""
+        monkeypatch.setattr("config.Config.GEMINI_API_KEY", "test-key")
+        mock_llm_service.generate_response.side_effect = Exception("API Error")
+        errors = metrics.LLM_FALLBACKS.value("error")
+        llm_calls = metrics.PATH_STAGE_SECONDS.count("llm")
+        with patch("graph_service.LLMService", return_value=mock_llm_service):
+            service = GraphService(temp_graph_file, temp_teams_file)
+            assert service.find_path("Alabama", "Tufts").error
+        assert metrics.LLM_FALLBACKS.value("error") == errors + 1
+        assert metrics.PATH_STAGE_SECONDS.count("llm") == llm_calls + 1
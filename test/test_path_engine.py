@@ -0,0 +1,112 @@
+"""Tests for shortest-path engines."""
+
+import random
+
+import pytest
+
+from config import Config
+from graph_service import GraphService
+from path_engine import (
+    BidirectionalEngine,
+    CSREngine,
+    NetworkXEngine,
+    PathEngine,
+    make_engine,
+)
+from snapshot import load_fresh_snapshot
+
+
+class TestPathEngine:
+    """Test suite for the CSR and NetworkX engines."""
+
+    def test_csr_matches_networkx_on_mock_graph(self, mock_snapshot):
+        """Test that both engines agree on every pair of the mock graph."""
+        csr, reference = CSREngine(mock_snapshot), NetworkXEngine(mock_snapshot)
+        for src in range(mock_snapshot.num_nodes):
+            for dst in range(mock_snapshot.num_nodes):
+                assert csr.shortest_path(src, dst) == reference.shortest_path(src, dst)
+            assert csr.shortest_path_tree(src) == reference.shortest_path_tree(src)
+
+    def test_incomplete_engine_cannot_be_built(self, mock_snapshot):
+        """Test that an engine missing a search fails at construction."""
+
+        class PointToPointOnly(PathEngine):
+            def shortest_path(self, src, dst):
+                return None
+
+        with pytest.raises(TypeError, match="shortest_path_tree"):
+            PointToPointOnly(mock_snapshot)
+
+    def test_csr_prefers_recent_games(self, mock_snapshot):
+        """Test that the recency weighting is respected."""
+        csr = CSREngine(mock_snapshot)
+        assert csr.shortest_path(0, 2) == [0, 1, 2]
+        assert csr.shortest_path(1, 0) == [1, 2, 0]
+        assert csr.shortest_path(0, 4) is None
+
+    def test_bidirectional_matches_csr_on_mock_graph(self, mock_snapshot):
+        """Test that the bidirectional search agrees on every mock pair."""
+        csr, bidir = CSREngine(mock_snapshot), BidirectionalEngine(mock_snapshot)
+        for src in range(mock_snapshot.num_nodes):
+            for dst in range(mock_snapshot.num_nodes):
+                assert bidir.shortest_path(src, dst) == csr.shortest_path(src, dst)
+
+    def test_bidirectional_skips_dropped_edges(self, mock_snapshot):
+        """Test that infinite weights remove edges from both directions."""
+        bidir = BidirectionalEngine(mock_snapshot)
+        weights = list(mock_snapshot.weights)
+        weights[mock_snapshot.find_edge(1, 2)] = float("inf")
+        assert bidir.shortest_path(0, 2, weights) is None
+        assert bidir.shortest_path(2, 1, weights) == [2, 0, 1]
+
+    def test_make_engine_unknown(self, mock_snapshot):
+        """Test that an unknown engine name is rejected."""
+        with pytest.raises(ValueError):
+            make_engine("bogus", mock_snapshot)
+
+    @pytest.mark.parametrize("engine", ["csr", "bidir", "networkx"])
+    def test_graph_service_engines(
+        self, temp_graph_file, temp_teams_file, monkeypatch, engine
+    ):
+        """Test that GraphService returns the same results with every engine."""
+        monkeypatch.setattr("config.Config.PATH_ENGINE", engine)
+        service = GraphService(temp_graph_file, temp_teams_file)
+        result = service.find_path("Georgia", "Alabama")
+        assert result.path_names == ["Georgia", "Auburn", "Alabama"]
+        assert "(2024)" in result.edges[1]["label"]
+
+    def test_csr_matches_networkx_on_all_team_pairs(self):
+        """Test engine parity on every pair of the real victory graph."""
+        snapshot = load_fresh_snapshot(
+            Config.SNAPSHOT_PATH, Config.GRAPH_PATH, Config.TEAMS_PATH
+        )
+        if snapshot is None:
+            pytest.skip("data/graph.snap is missing or stale")
+
+        # Full trees cover every (src, dst) pair with one search per source
+        csr, reference = CSREngine(snapshot), NetworkXEngine(snapshot)
+        for src in range(snapshot.num_nodes):
+            assert csr.shortest_path_tree(src) == reference.shortest_path_tree(src)
+
+    def test_bidirectional_costs_match_csr_on_real_graph(self):
+        """Test that bidirectional paths cost the same as CSR's on sampled pairs."""
+        snapshot = load_fresh_snapshot(
+            Config.SNAPSHOT_PATH, Config.GRAPH_PATH, Config.TEAMS_PATH
+        )
+        if snapshot is None:
+            pytest.skip("data/graph.snap is missing or stale")
+
+        def cost(path):
+            edges = [snapshot.find_edge(u, v) for u, v in zip(path, path[1:])]
+            return sum(snapshot.weights[e] for e in edges)
+
+        csr, bidir = CSREngine(snapshot), BidirectionalEngine(snapshot)
+        rng = random.Random(0)
+        for _ in range(500):
+            src, dst = rng.sample(range(snapshot.num_nodes), 2)
+            expected, path = csr.shortest_path(src, dst), bidir.shortest_path(src, dst)
+            if expected is None:
+                assert path is None
+            else:
+                assert path[0] == src and path[-1] == dst
+                assert cost(path) == cost(expected)
@@ -0,0 +1,73 @@
+"""Tests for precomputed shortest-path tables."""
+
+import pytest
+
+from graph_service import GraphService
+from path_engine import NetworkXEngine
+from path_table import PathTable, PathTableError
+
+
+@pytest.fixture
+def table(mock_snapshot):
+    return PathTable(NetworkXEngine(mock_snapshot))
+
+
+class TestPathTable:
+    """Test suite for PathTable."""
+
+    def test_matches_engine_for_all_pairs(self, mock_snapshot, table):
+        """Test that every table path equals the on-demand engine path."""
+        engine = NetworkXEngine(mock_snapshot)
+        for src in range(mock_snapshot.num_nodes):
+            for dst in range(mock_snapshot.num_nodes):
+                assert table.shortest_path(src, dst) == engine.shortest_path(src, dst)
+
+    def test_rows_are_built_lazily(self, table):
+        """Test that only queried sources get a row."""
+        assert table.rows_built == 0
+        table.shortest_path(0, 2)
+        table.shortest_path(0, 3)
+        assert table.rows_built == 1
+        table.shortest_path(1, 0)
+        assert table.rows_built == 2
+
+    def test_prefers_recent_games(self, table):
+        """Test that the recency weighting is respected."""
+        assert table.shortest_path(1, 0) == [1, 2, 0]
+        assert table.shortest_path(4, 0) is None
+
+    def test_write_and_load(self, tmp_path, mock_snapshot, table):
+        """Test that a written table loads back with identical paths."""
+        path = tmp_path / "paths.bin"
+        table.write(path, b"x" * 32)
+
+        loaded = PathTable(NetworkXEngine(mock_snapshot))
+        loaded.load(path, b"x" * 32)
+        assert loaded.rows_built == table.num_nodes
+        for src in range(table.num_nodes):
+            for dst in range(table.num_nodes):
+                assert loaded.shortest_path(src, dst) == table.shortest_path(src, dst)
+
+    def test_load_rejects_other_graph(self, tmp_path, mock_snapshot, table):
+        """Test that a table built for another graph is rejected."""
+        path = tmp_path / "paths.bin"
+        table.write(path, b"x" * 32)
+        with pytest.raises(PathTableError):
+            PathTable(NetworkXEngine(mock_snapshot)).load(path, b"y" * 32)
+
+    @pytest.mark.parametrize("mode", ["lazy", "precomputed"])
+    def test_graph_service_modes(
+        self, temp_graph_file, temp_teams_file, monkeypatch, mode, tmp_path
+    ):
+        """Test that GraphService answers identically with a path table."""
+        monkeypatch.setattr("config.Config.PATH_TABLE_PATH", tmp_path / "none.bin")
+        reference = GraphService(temp_graph_file, temp_teams_file)
+
+        monkeypatch.setattr("config.Config.PATH_TABLE_MODE", mode)
+        service = GraphService(temp_graph_file, temp_teams_file)
+        for a, b in [
+            ("Alabama", "Auburn"),
+            ("Georgia", "Alabama"),
+            ("Auburn", "Tufts"),
+        ]:
+            assert service.find_path(a, b) == reference.find_path(a, b)
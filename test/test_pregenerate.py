@@ -0,0 +1,112 @@
+"""Tests for offline LLM explanation pre-generation."""
+
+from unittest.mock import patch
+
+import pytest
+
+from graph_service import GraphService
+from llm_service import LLMService
+from path_engine import CSREngine
+from pregenerate import pregenerate, unreachable_pairs
+from rate_limit import TokenBucket
+
+
+@pytest.fixture
+def service(temp_graph_file, temp_teams_file, fake_genai_client, monkeypatch):
+    monkeypatch.setattr("config.Config.GEMINI_API_KEY", "test-key")
+    llm = LLMService("test-key", client=fake_genai_client)
+    with patch("graph_service.LLMService", return_value=llm):
+        return GraphService(temp_graph_file, temp_teams_file)
+
+
+class TestUnreachablePairs:
+    """Test suite for unreachable pair enumeration."""
+
+    def test_matches_brute_force(self, mock_graph, mock_snapshot):
+        """Test that the condensation pass finds exactly the no-path pairs."""
+        engine = CSREngine(mock_snapshot)
+        ids = list(mock_snapshot.node_ids)
+        expected = {
+            (ids[s], ids[d])
+            for s in range(len(ids))
+            for d in range(len(ids))
+            if engine.shortest_path(s, d) is None
+        }
+        pairs = list(unreachable_pairs(mock_graph))
+        assert len(pairs) == len(set(pairs))
+        assert set(pairs) == expected
+        assert ("0", "4") in expected
+        assert ("3", "0") in expected
+
+
+class TestPregenerate:
+    """Test suite for the pre-generation job."""
+
+    def test_generates_then_serves_from_cache(self, service, fake_genai_client):
+        """Test that pre-generated explanations skip the LLM at request time."""
+        pairs = list(unreachable_pairs(service.graph))
+        stats = pregenerate(service, pairs, concurrency=3, rate=1000)
+        assert stats == {
+            "pairs": len(pairs),
+            "cached": 0,
+            "generated": len(pairs),
+            "failed": 0,
+        }
+        assert len(fake_genai_client.calls) == len(pairs)
+
+        result = service.find_path("Georgia", "Tufts")
+        assert result.llm_text == fake_genai_client.text
+        assert len(fake_genai_client.calls) == len(pairs)
+
+    def test_resumes_without_regenerating(self, service, fake_genai_client):
+        """Test that a rerun only generates the pairs that are missing."""
+        pairs = list(unreachable_pairs(service.graph))
+        pregenerate(service, pairs[:4], rate=1000)
+        stats = pregenerate(service, pairs, rate=1000)
+        assert stats["cached"] == 4
+        assert stats["generated"] == len(pairs) - 4
+        assert len(fake_genai_client.calls) == len(pairs)
+
+    def test_failures_are_counted(self, service, fake_genai_client):
+        """Test that a failing pair does not stop the batch."""
+        calls = []
+
+        def flaky(model, config, contents):
+            calls.append(contents)
+            if len(calls) == 1:
+                raise RuntimeError("quota exceeded")
+            return fake_genai_client.__class__.generate_content(
+                fake_genai_client, model, config, contents
+            )
+
+        fake_genai_client.generate_content = flaky
+        stats = pregenerate(service, [("0", "4"), ("1", "4")], concurrency=1, rate=1000)
+        assert stats["failed"] == 1
+        assert stats["generated"] == 1
+        assert service.cached_explanation("0", "4") is None
+        assert service.cached_explanation("1", "4") is not None
+
+    def test_pinned_entries_ignore_ttl(self, service, monkeypatch):
+        """Test that pre-generated explanations do not expire."""
+        service._llm_cache.ttl = 60
+        with patch("llm_cache.time.time", return_value=0.0):
+            pregenerate(service, [("1", "4")], rate=1000)
+        with patch("llm_cache.time.time", return_value=10_000.0):
+            assert service.cached_explanation("1", "4") is not None
+
+
+class TestTokenBucket:
+    """Test suite for TokenBucket."""
+
+    def test_burst_then_refuse(self):
+        """Test that only ``capacity`` tokens are available at once."""
+        bucket = TokenBucket(rate=0.001, capacity=2)
+        assert bucket.try_acquire()
+        assert bucket.try_acquire()
+        assert not bucket.try_acquire()
+        assert not bucket.acquire(timeout=0.01)
+
+    def test_invalid_rate(self):
+        """Test that a non-positive rate is rejected."""
+        with pytest.raises(ValueError):
+            TokenBucket(0)
@@ -0,0 +1,66 @@
+"""Tests for precomputed team rankings."""
+
+import networkx as nx
+import pytest
+
+from rankings import DAMPING, Rankings, RankingsError, dominance_scores
+
+
+class TestRankings:
+    """Test suite for Rankings."""
+
+    def test_reach_and_chain_length(self, mock_snapshot):
+        """Test reach counts and mean hops on the mock graph."""
+        rankings = Rankings.compute(mock_snapshot)
+        # Alabama, Georgia, Auburn, Vanderbilt, Tufts
+        assert rankings.reach == [3, 3, 3, 0, 0]
+        assert rankings.avg_chain == [2.0, 1.6667, 1.3333, None, None]
+
+    def test_dominance_is_pagerank_fixed_point(self, mock_snapshot):
+        """Test that dominance satisfies PageRank on loser -> winner links."""
+        graph = mock_snapshot.to_networkx().reverse()
+        scores = dominance_scores(mock_snapshot)
+        assert sum(scores) == pytest.approx(1.0)
+        score = dict(zip(mock_snapshot.node_ids, scores))
+        n, d = len(score), DAMPING
+        dangling = sum(score[u] for u in graph if graph.out_degree(u) == 0)
+        for v in graph:
+            links = sum(score[u] / graph.out_degree(u) for u in graph.predecessors(v))
+            expected = (1 - d) / n + d * (links + dangling / n)
+            assert score[v] == pytest.approx(expected, abs=1e-9)
+
+    def test_dominance_matches_networkx(self, mock_snapshot):
+        """Test dominance against nx.pagerank, which needs SciPy."""
+        pytest.importorskip("scipy")
+        graph = mock_snapshot.to_networkx().reverse()
+        expected = nx.pagerank(graph, weight=None, max_iter=1000, tol=1e-12)
+        scores = dominance_scores(mock_snapshot)
+        for i, node in enumerate(mock_snapshot.node_ids):
+            assert scores[i] == pytest.approx(expected[node], abs=1e-6)
+
+    def test_order_puts_missing_values_last(self, mock_snapshot):
+        """Test sorting, name tie-breaks and teams without chains."""
+        rankings = Rankings.compute(mock_snapshot)
+        names = lambda key, desc: [rankings.teams[i] for i in rankings.order(key, desc)]  # noqa: E731
+        assert names("avg_chain", False) == [
+            "Auburn",
+            "Georgia",
+            "Alabama",
+            "Tufts",
+            "Vanderbilt",
+        ]
+        assert names("reach", True)[:3] == ["Alabama", "Auburn", "Georgia"]
+        assert names("team", True)[0] == "Vanderbilt"
+        with pytest.raises(ValueError):
+            rankings.order("wins", True)
+
+    def test_write_and_load(self, mock_snapshot, tmp_path):
+        """Test that a written file loads only for the same graph."""
+        path = tmp_path / "rankings.json"
+        rankings = Rankings.compute(mock_snapshot)
+        rankings.write(path)
+        assert Rankings.load(path, mock_snapshot.fingerprint) == rankings
+        with pytest.raises(RankingsError):
+            Rankings.load(path, b"\1" * 32)
+        with pytest.raises(RankingsError):
+            Rankings.load(tmp_path / "missing.json", mock_snapshot.fingerprint)
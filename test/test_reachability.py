@@ -0,0 +1,52 @@
+"""Tests for the strongly connected component reachability index."""
+
+import networkx as nx
+import pytest
+
+from config import Config
+from reachability import ReachabilityIndex
+from snapshot import load_fresh_snapshot
+
+
+def assert_matches_networkx(snapshot):
+    """Check every pair against NetworkX descendants."""
+    index, graph = ReachabilityIndex(snapshot), snapshot.to_networkx()
+    ids = list(snapshot.node_ids)
+    for src, node in enumerate(ids):
+        reachable = nx.descendants(graph, node) | {node}
+        for dst, other in enumerate(ids):
+            assert index.reachable(src, dst) == (other in reachable)
+
+
+class TestReachabilityIndex:
+    """Test suite for ReachabilityIndex."""
+
+    def test_mock_graph_pairs(self, mock_snapshot):
+        """Test that the cycle is one component and Tufts reaches nobody."""
+        index = ReachabilityIndex(mock_snapshot)
+        # Alabama, Georgia and Auburn beat each other in a cycle
+        assert len({index.component[v] for v in (0, 1, 2)}) == 1
+        assert index.num_components == 3
+        assert index.largest_component == 3
+        assert index.reachable(1, 3)
+        assert not index.reachable(3, 0)
+        assert not index.reachable(0, 4)
+        assert index.reachable(4, 4)
+        assert_matches_networkx(mock_snapshot)
+
+    def test_components_in_reverse_topological_order(self, mock_snapshot):
+        """Test that edges between components point to lower numbers."""
+        index = ReachabilityIndex(mock_snapshot)
+        offsets, targets = mock_snapshot.offsets, mock_snapshot.targets
+        for u in range(mock_snapshot.num_nodes):
+            for e in range(offsets[u], offsets[u + 1]):
+                assert index.component[targets[e]] <= index.component[u]
+
+    def test_matches_networkx_on_real_graph(self):
+        """Test the index against NetworkX on every pair of the real graph."""
+        snapshot = load_fresh_snapshot(
+            Config.SNAPSHOT_PATH, Config.GRAPH_PATH, Config.TEAMS_PATH
+        )
+        if snapshot is None:
+            pytest.skip("data/graph.snap is missing or stale")
+        assert_matches_networkx(snapshot)
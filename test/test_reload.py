@@ -0,0 +1,132 @@
+"""Tests for hot-reloading the graph in a running worker."""
+
+import os
+import threading
+import time
+
+import networkx as nx
+import pytest
+
+from graph_service import GraphService
+from reload import GraphReloader
+
+
+@pytest.fixture
+def reloader(temp_graph_file, temp_teams_file):
+    """Create a reloader over the temporary graph with no settle delay."""
+    reloader = GraphReloader(
+        lambda: GraphService(temp_graph_file, temp_teams_file),
+        temp_graph_file,
+        temp_teams_file,
+        interval=0,
+        settle=0,
+    )
+    yield reloader
+    reloader.stop()
+
+
+def add_tufts_edge(graph_path, mock_graph):
+    """Rewrite the graph with a new game and backdate it past the settle time."""
+    graph = mock_graph.copy()
+    graph.add_edge("3", "4", weight=1, label="Vanderbilt def. Tufts")
+    nx.write_gexf(graph, graph_path)
+    earlier = time.time() - 10
+    os.utime(graph_path, (earlier, earlier))
+
+
+class TestGraphReloader:
+    """Test suite for GraphReloader."""
+
+    def test_unchanged_files_do_not_reload(self, reloader):
+        """Test that a check without changes keeps the current service."""
+        service = reloader.service
+        assert not reloader.check()
+        assert reloader.service is service
+        assert reloader.reloads == 0
+
+    def test_touched_files_with_same_content_do_not_reload(
+        self, reloader, temp_graph_file
+    ):
+        """Test that a new mtime alone does not rebuild the service."""
+        service = reloader.service
+        earlier = time.time() - 10
+        os.utime(temp_graph_file, (earlier, earlier))
+        assert not reloader.check()
+        assert reloader.service is service
+
+    def test_changed_graph_swaps_service(self, reloader, temp_graph_file, mock_graph):
+        """Test that a changed graph is loaded and gets a new version."""
+        old = reloader.service
+        version = reloader.version
+        assert old.find_path("Alabama", "Tufts").error
+
+        add_tufts_edge(temp_graph_file, mock_graph)
+        assert reloader.check()
+        assert reloader.service is not old
+        assert reloader.version != version
+        assert reloader.reloads == 1
+        assert reloader.service.find_path("Alabama", "Tufts").path_names[-1] == "Tufts"
+        # A request still holding the old service finishes on the old graph
+        assert old.find_path("Alabama", "Tufts").error
+        # Already applied, so the next poll is a no-op
+        assert not reloader.check()
+
+    def test_old_service_closed_after_drain(
+        self, reloader, temp_graph_file, mock_graph
+    ):
+        """Test that the replaced service is closed once the drain period ends."""
+        reloader.drain = 0.2
+        old = reloader.service
+        closed = threading.Event()
+        old.close = closed.set
+        add_tufts_edge(temp_graph_file, mock_graph)
+        assert reloader.check()
+        assert not closed.is_set()
+        assert closed.wait(5)
+
+    def test_unsettled_files_wait(self, reloader, temp_graph_file, mock_graph):
+        """Test that files still being written are not loaded yet."""
+        reloader.settle = 60
+        add_tufts_edge(temp_graph_file, mock_graph)
+        os.utime(temp_graph_file)
+        assert not reloader.check()
+        assert reloader.reloads == 0
+
+    def test_broken_graph_keeps_old_service(self, reloader, temp_graph_file):
+        """Test that a failed load is reported and the old graph keeps serving."""
+        service = reloader.service
+        temp_graph_file.write_text("<not a graph")
+        assert not reloader.check()
+        assert reloader.service is service
+        assert reloader.last_error
+        assert reloader.status()["last_error"] == reloader.last_error
+        assert service.find_path("Alabama", "Auburn").path_names
+
+    def test_reload_warms_recent_paths(self, reloader, temp_graph_file, mock_graph):
+        """Test that recently served paths are cached on the new service."""
+        reloader.service.find_path("Alabama", "Vanderbilt")
+        add_tufts_edge(temp_graph_file, mock_graph)
+        assert reloader.check()
+        stats = reloader.service.path_cache.stats()
+        assert stats["size"] == 1
+        reloader.service.find_path("Alabama", "Vanderbilt")
+        assert reloader.service.path_cache.stats()["hits"] == 1
+
+    def test_watcher_thread_reloads(self, reloader, temp_graph_file, mock_graph):
+        """Test that the background thread picks up a change."""
+        reloader.interval = 0.01
+        reloader.start()
+        assert reloader.status()["watching"]
+        add_tufts_edge(temp_graph_file, mock_graph)
+        deadline = time.time() + 5
+        while reloader.reloads == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        assert reloader.reloads == 1
+
+    def test_status(self, reloader):
+        """Test that status describes the live graph."""
+        status = reloader.status()
+        assert status["version"] == reloader.version
+        assert (status["nodes"], status["edges"]) == (5, 4)
+        assert status["reloads"] == 0
+        assert not status["watching"]
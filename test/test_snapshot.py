@@ -0,0 +1,149 @@
+"""Tests for the binary graph snapshot."""
+
+import json
+import pickle
+
+import networkx as nx
+import pytest
+
+from graph_service import GraphService
+from snapshot import (
+    GraphSnapshot,
+    SnapshotError,
+    build_snapshot,
+    ledger_stats,
+    load_fresh_snapshot,
+    main,
+)
+
+
+class TestGraphSnapshot:
+    """Test suite for snapshot building and loading."""
+
+    def test_round_trip(self, tmp_path, temp_graph_file, temp_teams_file):
+        """Test that a written snapshot loads back with identical contents."""
+        snap_path = tmp_path / "graph.snap"
+        built = build_snapshot(temp_graph_file, temp_teams_file, snap_path)
+        loaded = GraphSnapshot.load(snap_path)
+
+        assert list(loaded.node_ids) == list(built.node_ids)
+        assert list(loaded.labels) == list(built.labels)
+        assert list(loaded.logos) == list(built.logos)
+        assert list(loaded.mascots) == list(built.mascots)
+        assert list(loaded.offsets) == list(built.offsets)
+        assert list(loaded.targets) == list(built.targets)
+        assert list(loaded.weights) == list(built.weights)
+        assert list(loaded.edge_labels) == list(built.edge_labels)
+        assert list(loaded.game_offsets) == list(built.game_offsets)
+        assert list(loaded.game_labels) == list(built.game_labels)
+        assert loaded.fingerprint == built.fingerprint
+
+    def test_to_networkx_matches_source(
+        self, tmp_path, temp_graph_file, temp_teams_file
+    ):
+        """Test that the rebuilt graph has the same nodes, edges and attributes."""
+        snap_path = tmp_path / "graph.snap"
+        build_snapshot(temp_graph_file, temp_teams_file, snap_path)
+        rebuilt = GraphSnapshot.load(snap_path).to_networkx()
+        source = nx.read_gexf(temp_graph_file)
+
+        assert dict(rebuilt.nodes(data="label")) == dict(source.nodes(data="label"))
+        for u, v, data in source.edges(data=True):
+            assert rebuilt[u][v]["weight"] == data["weight"]
+            assert rebuilt[u][v]["label"] == data["label"]
+
+    def test_preserves_missing_logo(self, tmp_path, temp_graph_file, mock_teams_data):
+        """Test that a None logo survives the round trip."""
+        mock_teams_data[4]["logo"] = None
+        teams_path = tmp_path / "teams.pkl"
+        with open(teams_path, "wb") as fp:
+            pickle.dump(mock_teams_data, fp)
+
+        snap_path = tmp_path / "graph.snap"
+        build_snapshot(temp_graph_file, teams_path, snap_path)
+        loaded = GraphSnapshot.load(snap_path)
+        assert loaded.logos[4] is None
+        assert loaded.logos[0].endswith("alabama-logo.png")
+
+    def test_multigraph_searches_lightest_game(self, tmp_path, temp_teams_file):
+        """Test that repeated games keep the lightest one on the edge."""
+        graph = nx.MultiDiGraph()
+        graph.add_nodes_from([("0", {"label": "Alabama"}), ("1", {"label": "Georgia"})])
+        graph.add_edge("0", "1", weight=1, label="Alabama def. Georgia")
+        # Listed after the newer game, as a rebuilt DiGraph would have kept it
+        graph.add_edge("0", "1", weight=6, label="Alabama def. Georgia (2024)")
+        graph_path = tmp_path / "multi.gexf"
+        nx.write_gexf(graph, graph_path)
+
+        snap_path = tmp_path / "graph.snap"
+        build_snapshot(graph_path, temp_teams_file, snap_path)
+        snap = GraphSnapshot.load(snap_path)
+        assert (snap.num_edges, snap.num_games) == (1, 2)
+        assert list(snap.weights) == [1]
+        assert list(snap.edge_labels) == ["Alabama def. Georgia"]
+        assert list(snap.game_weights) == [1, 6]
+        assert snap.game_stats()["collapsed_games"] == 1
+
+    def test_check_counts_ledger_rematches(
+        self, tmp_path, temp_graph_file, temp_teams_file, capsys
+    ):
+        """Test that --check finds repeats the one-edge-per-pair graph lost."""
+        ledger = tmp_path / "state.json"
+        assert ledger_stats(ledger) is None
+        games = [
+            {"id": 1, "winner_id": 0, "loser_id": 1},
+            {"id": 2, "winner_id": 0, "loser_id": 1},
+            {"id": 3, "winner_id": 1, "loser_id": 0},
+            {"id": 4, "winner_id": 2, "loser_id": 3},
+        ]
+        ledger.write_text(json.dumps({"version": 3, "games": games}))
+        assert ledger_stats(ledger) == {
+            "games": 4,
+            "pairs": 3,
+            "pairs_with_several_games": 1,
+            "collapsed_games": 1,
+        }
+        args = ["--graph", temp_graph_file, "--teams", temp_teams_file, "--check"]
+        main([str(arg) for arg in args] + ["--ledger", str(ledger)])
+        graph_line, ledger_line = capsys.readouterr().out.splitlines()
+        assert "0 games would be lost" in graph_line
+        assert ledger_line.startswith("Ledger: 4 games between 3 pairs; 1 pairs")
+
+    def test_load_rejects_garbage(self, tmp_path):
+        """Test that a file that is not a snapshot raises SnapshotError."""
+        bad = tmp_path / "bad.snap"
+        bad.write_bytes(b"not a snapshot at all" * 10)
+        with pytest.raises(SnapshotError):
+            GraphSnapshot.load(bad)
+
+    def test_stale_snapshot_is_ignored(
+        self, tmp_path, temp_graph_file, temp_teams_file, mock_graph
+    ):
+        """Test that a snapshot built from other sources is treated as stale."""
+        snap_path = tmp_path / "graph.snap"
+        build_snapshot(temp_graph_file, temp_teams_file, snap_path)
+        assert load_fresh_snapshot(snap_path, temp_graph_file, temp_teams_file)
+
+        mock_graph.add_edge("3", "4", weight=1, label="Vanderbilt def. Tufts")
+        nx.write_gexf(mock_graph, temp_graph_file)
+        assert load_fresh_snapshot(snap_path, temp_graph_file, temp_teams_file) is None
+
+    def test_missing_snapshot_is_ignored(
+        self, tmp_path, temp_graph_file, temp_teams_file
+    ):
+        """Test that a missing snapshot file is reported as None."""
+        missing = tmp_path / "missing.snap"
+        assert load_fresh_snapshot(missing, temp_graph_file, temp_teams_file) is None
+
+    def test_graph_service_uses_snapshot(
+        self, tmp_path, temp_graph_file, temp_teams_file
+    ):
+        """Test that GraphService serves the same paths from a snapshot."""
+        snap_path = tmp_path / "graph.snap"
+        build_snapshot(temp_graph_file, temp_teams_file, snap_path)
+
+        from_gexf = GraphService(temp_graph_file, temp_teams_file)
+        from_snap = GraphService(temp_graph_file, temp_teams_file, snap_path)
+        assert from_snap.team_names == from_gexf.team_names
+        for a, b in [("Alabama", "Auburn"), ("Georgia", "Alabama")]:
+            assert from_snap.find_path(a, b) == from_gexf.find_path(a, b)
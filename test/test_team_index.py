@@ -0,0 +1,155 @@
+"""Tests for the fuzzy team-name index."""
+
+import pytest
+
+from graph_service import GraphService
+from team_index import TeamIndex, edit_distances, load_aliases, normalize
+
+NAMES = [
+    "Alabama",
+    "Alabama State",
+    "App State",
+    "Georgia",
+    "Georgia Tech",
+    "Hawai'i",
+    "North Carolina",
+    "St. Olaf",
+    "Texas A&M",
+    "Vanderbilt",
+]
+MASCOTS = [
+    "Crimson Tide",
+    "Hornets",
+    "Mountaineers",
+    "Bulldogs",
+    "Yellow Jackets",
+    "Rainbow Warriors",
+    "Tar Heels",
+    "Oles",
+    "Aggies",
+    "Bulldogs",
+]
+
+
+@pytest.fixture
+def index():
+    """Create an index with a few aliases."""
+    aliases = {"Alabama": ["Bama"], "App State": ["Appalachian State"]}
+    return TeamIndex(NAMES, MASCOTS, aliases)
+
+
+class TestNormalize:
+    """Test suite for key normalization."""
+
+    def test_strips_case_accents_and_punctuation(self):
+        """Test that punctuation and accents do not affect keys."""
+        assert normalize("San José State") == "san jose state"
+        assert normalize("Hawai'i") == "hawaii"
+        assert normalize("Texas A&M") == "texas am"
+        assert normalize("  Wisconsin-Eau   Claire ") == "wisconsin eau claire"
+
+
+class TestEditDistances:
+    """Test suite for the bounded edit distance."""
+
+    def test_transposition_is_one_edit(self):
+        """Test that swapping adjacent letters costs one edit."""
+        assert edit_distances("gerogia", "georgia", 2) == (1, 1)
+
+    def test_prefix_distance(self):
+        """Test that a partial query is measured against the best prefix."""
+        full, prefix = edit_distances("vandr", "vanderbilt", 2)
+        assert full == 3
+        assert prefix == 1
+
+    def test_limit_caps_distance(self):
+        """Test that distances beyond the limit report limit + 1."""
+        assert edit_distances("xyz", "georgia", 1) == (2, 2)
+
+
+class TestTeamIndex:
+    """Test suite for TeamIndex search and resolve."""
+
+    def test_exact_names_and_aliases_resolve(self, index):
+        """Test that names, aliases and derived forms resolve exactly."""
+        assert index.resolve("alabama") == "Alabama"
+        assert index.resolve("Bama") == "Alabama"
+        assert index.resolve("appalachian st") == "App State"
+        assert index.resolve("Hawaii") == "Hawai'i"
+        assert index.resolve("Saint Olaf") == "St. Olaf"
+        assert index.resolve("Crimson Tide") == "Alabama"
+        assert index.resolve("Georgia Bulldogs") == "Georgia"
+
+    def test_shared_mascot_is_not_an_alias(self, index):
+        """Test that a mascot used by two teams names neither."""
+        assert index.resolve("Bulldogs") is None
+
+    def test_typos_resolve_to_closest_team(self, index):
+        """Test that near-miss spellings resolve when unambiguous."""
+        assert index.resolve("Gerogia") == "Georgia"
+        assert index.resolve("Vanderbit") == "Vanderbilt"
+        assert index.resolve("north carolna") == "North Carolina"
+
+    def test_ambiguous_or_unknown_do_not_resolve(self, index):
+        """Test that ambiguous prefixes and garbage are rejected."""
+        assert index.resolve("alab") is None
+        assert index.resolve("carolina") is None
+        assert index.resolve("xyzzy") is None
+        assert index.resolve("") is None
+
+    def test_unique_prefix_resolves(self, index):
+        """Test that a prefix naming one team resolves."""
+        assert index.resolve("vanderb") == "Vanderbilt"
+
+    def test_search_ranks_prefix_before_word_match(self, index):
+        """Test that names starting with the query rank first."""
+        results = [team for team, _ in index.search("ala")]
+        assert results[:2] == ["Alabama", "Alabama State"]
+
+    def test_search_matches_inside_names(self, index):
+        """Test that any word of a name can start a match."""
+        assert index.search("carol") == [("North Carolina", "North Carolina")]
+
+    def test_search_reports_matched_alias(self, index):
+        """Test that alias hits report the alias that matched."""
+        assert index.search("bam") == [("Alabama", "Bama")]
+
+    def test_search_falls_back_to_typos(self, index):
+        """Test that a query with no prefix match returns close names."""
+        assert index.search("vandrebilt")[0] == ("Vanderbilt", "Vanderbilt")
+
+    def test_short_queries_and_limit(self, index):
+        """Test one-letter queries and result limits."""
+        assert len(index.search("a", limit=2)) == 2
+        assert index.search("") == []
+
+    def test_unknown_alias_teams_are_ignored(self):
+        """Test that aliases for teams not in the graph are skipped."""
+        index = TeamIndex(NAMES, MASCOTS, {"Nowhere State": ["NSU"]})
+        assert index.resolve("NSU") is None
+
+    def test_shipped_aliases_load(self):
+        """Test that the shipped alias file parses into name lists."""
+        from config import Config
+
+        aliases = load_aliases(Config.TEAM_ALIASES_PATH)
+        assert aliases["Alabama"] == ["Bama"]
+        assert load_aliases(None) == {}
+
+
+class TestGraphServiceNames:
+    """Test suite for fuzzy names in GraphService."""
+
+    def test_find_path_accepts_alias_and_typo(self, temp_graph_file, temp_teams_file):
+        """Test that near-miss names resolve instead of erroring."""
+        service = GraphService(temp_graph_file, temp_teams_file)
+        result = service.find_path("Bama", "Aubrun")
+        assert result.error is None
+        assert result.path_names == ["Alabama", "Georgia", "Auburn"]
+
+    def test_search_teams_includes_logos(self, temp_graph_file, temp_teams_file):
+        """Test that search results carry the team logo."""
+        service = GraphService(temp_graph_file, temp_teams_file)
+        [result] = service.search_teams("vand")
+        assert result["team"] == "Vanderbilt"
+        assert result["logo"].endswith("vanderbilt-logo.png")